@@ -1,6 +1,6 @@
 from datetime import timedelta
 from typing import Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocketException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from app.core.config import settings
@@ -15,8 +15,8 @@ import uuid
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-# 현재 사용자 가져오기 함수
-async def get_current_user(
+# 현재 사용자 가져오기 함수 (동기 DB 조회이므로 스레드 풀에서 실행되도록 def)
+def get_current_user(
     db: Session = Depends(get_db),
     token: str = Depends(oauth2_scheme)
 ) -> User:
@@ -38,6 +38,28 @@ async def get_current_user(
         raise credentials_exception
     return user
 
+# WebSocket 연결용 사용자 확인 (브라우저 WebSocket 은 헤더를 지정할 수 없어 쿼리의 토큰 사용)
+def get_websocket_user(
+    token: str = Query(...),
+    db: Session = Depends(get_db)
+) -> User:
+    credentials_exception = WebSocketException(
+        code=status.WS_1008_POLICY_VIOLATION,
+        reason="Could not validate credentials"
+    )
+    
+    try:
+        email = verify_token(token)
+    except Exception:
+        raise credentials_exception
+    if email is None:
+        raise credentials_exception
+    
+    user = db.query(User).filter(User.email == email).first()
+    if user is None:
+        raise credentials_exception
+    return user
+
 # /me 엔드포인트 추가
 @router.get("/me", response_model=UserResponse)
 async def read_users_me(
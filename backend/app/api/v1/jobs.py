@@ -0,0 +1,125 @@
+import json
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.orm import Session
+from typing import Any, Callable, Dict
+from app.db.session import SessionLocal, get_db
+from app.models.job import OptimizationJob
+from app.models.schedule import Schedule
+from app.models.user import User
+from app.api.v1.auth import get_current_user
+from app.api.v1.optimization import optimizer, validate_campaign_period
+from app.core.config import settings
+from app.schemas.optimization import CampaignRequest, OptimizationJobResponse, OptimizationRequest
+from app.services.job_queue import JobQueueFull, JobRunner
+
+router = APIRouter()
+
+def _optimize_job(db: Session, user: User, params: Dict, report: Callable[[Any], None]) -> Dict:
+    """일정 최적화 작업 (개선될 때마다 중간 결과 기록)"""
+    request = OptimizationRequest(**params)
+    existing_schedules = []
+    if request.include_existing:
+        existing_schedules = db.query(Schedule).filter(
+            Schedule.user_id == user.id,
+            Schedule.start_time >= request.date
+        ).all()
+
+    schedule = optimizer.optimize_schedule(
+        user=user,
+        date=request.date,
+        existing_schedules=existing_schedules,
+        time_budget_ms=request.time_budget_ms,
+        on_improvement=lambda plan, objective: report({"objective": objective, "schedule": plan})
+    )
+    return {
+        "schedule": schedule,
+        "total_distance": sum(s.get("travel_distance", 0) for s in schedule),
+        "estimated_exposure": sum(s.get("exposure", 0) for s in schedule)
+    }
+
+def _campaign_job(db: Session, user: User, params: Dict, report: Callable[[Any], None]) -> Dict:
+    """캠페인 기간 일정 계획 작업"""
+    request = CampaignRequest(**params)
+    plan = optimizer.plan_campaign(
+        user=user,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        revisit_gap_days=request.revisit_gap_days,
+        high_priority_threshold=request.high_priority_threshold
+    )
+    return {
+        "days": plan["days"],
+        "total_distance": sum(day["total_distance"] for day in plan["days"]),
+        "estimated_exposure": sum(day["estimated_exposure"] for day in plan["days"]),
+        "uncovered_locations": plan["uncovered_locations"]
+    }
+
+job_runner = JobRunner(
+    SessionLocal,
+    {"optimize": _optimize_job, "campaign": _campaign_job},
+    max_workers=settings.JOB_MAX_WORKERS,
+    result_ttl_seconds=settings.JOB_RESULT_TTL_SECONDS,
+    max_pending_per_user=settings.JOB_MAX_PENDING_PER_USER,
+    progress_interval_seconds=settings.JOB_PROGRESS_INTERVAL_SECONDS,
+    lease_seconds=settings.JOB_LEASE_SECONDS
+)
+
+def _job_response(job: OptimizationJob) -> OptimizationJobResponse:
+    return OptimizationJobResponse(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        progress=json.loads(job.progress) if job.progress else None,
+        result=json.loads(job.result) if job.result else None,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        expires_at=job.expires_at
+    )
+
+def _submit(db: Session, user: User, kind: str, params: Dict, response: Response) -> OptimizationJobResponse:
+    try:
+        job, created = job_runner.submit(db, user.id, kind, params)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
+    # 새 작업은 202, 대기/실행 중인 같은 요청의 작업은 200
+    response.status_code = status.HTTP_202_ACCEPTED if created else status.HTTP_200_OK
+    response.headers["Location"] = f"/api/v1/jobs/{job.id}"
+    return _job_response(job)
+
+@router.post("/jobs/optimize-schedule", response_model=OptimizationJobResponse, status_code=status.HTTP_202_ACCEPTED)
+def submit_optimize_job(
+    request: OptimizationRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """일정 최적화 작업 제출 (결과는 GET /jobs/{job_id} 로 조회)"""
+    return _submit(db, current_user, "optimize", request.model_dump(mode="json"), response)
+
+@router.post("/jobs/optimize-campaign", response_model=OptimizationJobResponse, status_code=status.HTTP_202_ACCEPTED)
+def submit_campaign_job(
+    request: CampaignRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """캠페인 기간 일정 계획 작업 제출"""
+    validate_campaign_period(request)
+    return _submit(db, current_user, "campaign", request.model_dump(mode="json"), response)
+
+@router.get("/jobs/{job_id}", response_model=OptimizationJobResponse)
+def get_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """작업 상태, 중간 결과, 최종 결과 조회"""
+    job = job_runner.get(db, job_id, current_user.id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="작업을 찾을 수 없거나 결과 보관 기간이 지났습니다"
+        )
+    return _job_response(job)
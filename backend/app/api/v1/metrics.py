@@ -0,0 +1,38 @@
+import secrets
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from typing import Optional
+from app.core.config import settings
+from app.services.maps_service import directions_flight, provider_health, quota_scheduler
+from app.services.result_cache import result_cache
+from app.services.solver_pool import solver_pool
+from app.services.travel_cache import travel_cache
+
+router = APIRouter()
+
+def require_ops_token(x_ops_token: Optional[str] = Header(None)) -> None:
+    """운영자 토큰 확인 (OPS_TOKEN 이 비어 있으면 운영용 엔드포인트를 쓸 수 없음)"""
+    if not settings.OPS_TOKEN or not x_ops_token or \
+            not secrets.compare_digest(x_ops_token.encode("utf-8"), settings.OPS_TOKEN.encode("utf-8")):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="운영자 권한이 필요합니다")
+
+@router.get("/metrics")
+def get_metrics(_: None = Depends(require_ops_token)):
+    """캐시 등 내부 상태 지표 (운영자 전용)"""
+    return {
+        "travel_cache": travel_cache.stats(),
+        "directions_single_flight": directions_flight.stats(),
+        "maps_providers": provider_health.stats(),
+        "maps_quota": quota_scheduler.stats(),
+        "solver_pool": solver_pool.stats(),
+        "result_cache": result_cache.stats()
+    }
+
+@router.delete("/metrics/travel-cache")
+def invalidate_travel_cache(
+    provider: Optional[str] = None,
+    mode: Optional[str] = None,
+    _: None = Depends(require_ops_token)
+):
+    """제공자/이동수단 단위 이동 정보 캐시 무효화 (운영자 전용, 영구 계층 포함)"""
+    removed = travel_cache.invalidate(provider=provider, mode=mode)
+    return {"removed": removed, "provider": provider, "mode": mode}
@@ -1,16 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Dict
-from datetime import datetime
-from app.db.session import get_db
+import asyncio
+import json
+import time
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, WebSocket, WebSocketDisconnect, status
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from typing import Any, Callable, List, Dict, Optional
+from datetime import datetime, timedelta
+from app.db.session import get_async_db, get_db
+from app.models.team import TeamMember
 from app.models.user import User
 from app.services.optimization import ScheduleOptimizer
-from app.api.v1.auth import get_current_user
-from app.schemas.optimization import OptimizationRequest, OptimizationResponse, SuggestionRequest, SuggestionResponse
+from app.services.result_cache import result_cache
+from app.services.solver_pool import AdmissionRejected, solver_pool
+from app.api.v1.auth import get_current_user, get_websocket_user
+from app.core.config import settings
+from app.schemas.optimization import (
+    OptimizationRequest, OptimizationResponse, OptimizationProgress, SuggestionRequest, SuggestionResponse,
+    CampaignRequest, CampaignResponse, TeamOptimizationRequest, TeamOptimizationResponse,
+    NearbyLocationsResponse
+)
 
 router = APIRouter()
 optimizer = ScheduleOptimizer()
 
+async def run_solver(user: User, job: Callable[[], Any]) -> Any:
+    """최적화 작업(DB 조회 포함)을 전용 풀에서 실행. 풀이 가득 차면 429/503 과 Retry-After"""
+    try:
+        return await solver_pool.run(user.id, job)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.detail,
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+def _user_scope(user: User) -> tuple:
+    """응답 캐시 키의 사용자 부분 (지역구, 활동 강도, 카탈로그 버전)"""
+    district = optimizer.locations.resolve(user.district) or user.district
+    return (district, user.activity_level, optimizer.locations.version)
+
 @router.post("/optimize-schedule", response_model=OptimizationResponse)
 async def optimize_schedule(
     request: OptimizationRequest,
@@ -18,7 +49,15 @@ async def optimize_schedule(
     current_user: User = Depends(get_current_user)
 ):
     """AI 기반 일정 최적화"""
-    try:
+    # 기존 일정은 요청 시각 이후로 조회하므로 날짜가 아닌 요청 시각 전체를 키에 넣음
+    cache_key = ("optimize",) + _user_scope(current_user) + (
+        request.date.isoformat(), request.include_existing, request.time_budget_ms)
+    cached = result_cache.get(current_user.id, cache_key)
+    if cached is not None:
+        return cached
+    generation = result_cache.generation(current_user.id)
+    
+    def solve():
         # 기존 일정 조회
         existing_schedules = []
         if request.include_existing:
@@ -29,30 +68,227 @@ async def optimize_schedule(
             ).all()
         
         # AI 최적화 실행
-        optimized_schedule = optimizer.optimize_schedule(
+        return optimizer.optimize_schedule(
             user=current_user,
             date=request.date,
-            existing_schedules=existing_schedules
+            existing_schedules=existing_schedules,
+            time_budget_ms=request.time_budget_ms
         )
+    
+    try:
+        optimized_schedule = await run_solver(current_user, solve)
         
         # 총 거리와 예상 노출 수 계산
         total_distance = sum(s.get("travel_distance", 0) for s in optimized_schedule)
         total_exposure = sum(s.get("exposure", 0) for s in optimized_schedule)
         
-        return OptimizationResponse(
+        response = OptimizationResponse(
             success=True,
             message="일정이 최적화되었습니다",
             schedule=optimized_schedule,
             total_distance=total_distance,
             estimated_exposure=total_exposure
         )
+        result_cache.set(current_user.id, cache_key, response, generation)
+        return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"일정 최적화 중 오류가 발생했습니다: {str(e)}"
         )
 
+@router.websocket("/optimize-schedule/stream")
+async def optimize_schedule_stream(
+    websocket: WebSocket,
+    current_user: User = Depends(get_websocket_user)
+):
+    """일정 최적화 스트리밍
+
+    연결 후 OptimizationRequest 형식의 JSON 을 보내면, 더 나은 일정을 찾을 때마다
+    type="improvement" 메시지를, 시간 예산이 끝나면 type="final" 메시지를 보내고 연결을 닫는다.
+    """
+    await websocket.accept()
+    try:
+        request = OptimizationRequest(**await websocket.receive_json())
+    except (ValidationError, ValueError, TypeError) as e:
+        await websocket.send_json({"type": "error", "detail": f"잘못된 요청입니다: {str(e)}"})
+        await websocket.close(code=status.WS_1003_UNSUPPORTED_DATA)
+        return
+    except WebSocketDisconnect:
+        return
+    
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    started = time.perf_counter()
+    
+    def on_improvement(schedule: List[Dict], objective: float):
+        loop.call_soon_threadsafe(queue.put_nowait, ("improvement", schedule, objective))
+    
+    def run():
+        try:
+            schedule = optimizer.optimize_schedule(
+                user=current_user,
+                date=request.date,
+                time_budget_ms=request.time_budget_ms,
+                on_improvement=on_improvement
+            )
+            loop.call_soon_threadsafe(queue.put_nowait, ("final", schedule, None))
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, ("error", str(e), None))
+    
+    # 탐색은 최적화 작업 풀에서 실행하고, 개선될 때마다 큐를 통해 전송
+    try:
+        solver_pool.submit(current_user.id, run)
+    except AdmissionRejected as e:
+        await websocket.send_json({"type": "error", "detail": e.detail, "retry_after": e.retry_after})
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+    objective = 0.0
+    try:
+        while True:
+            kind, payload, value = await queue.get()
+            if kind == "error":
+                await websocket.send_json({"type": "error", "detail": f"일정 최적화 중 오류가 발생했습니다: {payload}"})
+                await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+                return
+            if value is not None:
+                objective = value
+            progress = OptimizationProgress(
+                type=kind,
+                objective=objective,
+                elapsed_ms=(time.perf_counter() - started) * 1000,
+                schedule=payload,
+                total_distance=sum(s.get("travel_distance", 0) for s in payload),
+                estimated_exposure=sum(s.get("exposure", 0) for s in payload)
+            )
+            await websocket.send_json(jsonable_encoder(progress))
+            if kind == "final":
+                await websocket.close()
+                return
+    except WebSocketDisconnect:
+        # 클라이언트가 먼저 끊어도 탐색은 시간 예산 안에 스스로 끝난다
+        return
+
+@router.post("/optimize-team", response_model=TeamOptimizationResponse)
+async def optimize_team(
+    request: TeamOptimizationRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """같은 지역구 팀원(후보자 + 자원봉사자) 일정 공동 최적화
+
+    member_ids 는 요청한 사용자에게 일정 계획을 허용한(PUT /team/leaders/{id}) 같은 지역구 팀원이어야 한다.
+    없는 사용자, 허용하지 않은 사용자, 다른 지역구 사용자는 구분하지 않고 같은 403 으로 거절한다.
+    """
+    member_ids = [current_user.id]
+    for user_id in request.member_ids:
+        if user_id not in member_ids:
+            member_ids.append(user_id)
+    if len(member_ids) > settings.TEAM_MAX_MEMBERS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"팀원은 최대 {settings.TEAM_MAX_MEMBERS}명까지 가능합니다"
+        )
+    
+    others = (await db.execute(
+        select(User).join(TeamMember, TeamMember.member_id == User.id).where(
+            TeamMember.leader_id == current_user.id,
+            User.id.in_(member_ids[1:]),
+            User.district == current_user.district
+        )
+    )).scalars().all() if len(member_ids) > 1 else []
+    users_by_id = {user.id: user for user in others}
+    if len(users_by_id) != len(member_ids) - 1:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="일정을 계획할 수 없는 팀원이 포함되어 있습니다"
+        )
+    members = [current_user] + [users_by_id[user_id] for user_id in member_ids[1:]]
+    
+    try:
+        schedules = await run_solver(current_user, lambda: optimizer.optimize_team(
+            users=members,
+            date=request.date,
+            time_budget_ms=request.time_budget_ms
+        ))
+        
+        routes = []
+        for member, schedule in zip(members, schedules):
+            routes.append({
+                "user_id": member.id,
+                "name": member.name,
+                "activity_level": member.activity_level,
+                "schedule": schedule,
+                "total_distance": sum(s["travel_distance"] for s in schedule),
+                "estimated_exposure": sum(s["exposure"] for s in schedule)
+            })
+        
+        return TeamOptimizationResponse(
+            success=True,
+            message="팀 일정이 최적화되었습니다",
+            routes=routes,
+            total_distance=sum(route["total_distance"] for route in routes),
+            estimated_exposure=sum(route["estimated_exposure"] for route in routes)
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"팀 일정 최적화 중 오류가 발생했습니다: {str(e)}"
+        )
+
+def validate_campaign_period(request: CampaignRequest) -> None:
+    num_days = (request.end_date.date() - request.start_date.date()).days + 1
+    if num_days <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="종료일은 시작일 이후여야 합니다"
+        )
+    if num_days > settings.CAMPAIGN_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"최대 {settings.CAMPAIGN_MAX_DAYS}일까지 계획할 수 있습니다"
+        )
+
+@router.post("/optimize-campaign", response_model=CampaignResponse)
+async def optimize_campaign(
+    request: CampaignRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """캠페인 기간(여러 날짜) 일정 일괄 최적화"""
+    validate_campaign_period(request)
+    
+    try:
+        plan = await run_solver(current_user, lambda: optimizer.plan_campaign(
+            user=current_user,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            revisit_gap_days=request.revisit_gap_days,
+            high_priority_threshold=request.high_priority_threshold
+        ))
+        
+        return CampaignResponse(
+            success=True,
+            message="캠페인 일정이 최적화되었습니다",
+            days=plan["days"],
+            total_distance=sum(day["total_distance"] for day in plan["days"]),
+            estimated_exposure=sum(day["estimated_exposure"] for day in plan["days"]),
+            uncovered_locations=plan["uncovered_locations"]
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"캠페인 일정 최적화 중 오류가 발생했습니다: {str(e)}"
+        )
+
 @router.post("/suggest-schedules", response_model=SuggestionResponse)
 async def suggest_schedules(
     request: SuggestionRequest,
@@ -60,6 +296,18 @@ async def suggest_schedules(
 ):
     """빈 시간대를 기반으로 일정 제안"""
     try:
+        # 지금 기준으로 제안 대상이 되는 시간대만 지문에 넣어, 시간이 지나 빠지는 시간대가 생기면 새로 계산
+        upcoming = optimizer.upcoming_time_slots(request.empty_time_slots)
+        cache_key = ("suggest",) + _user_scope(current_user) + (
+            request.current_week_start,
+            result_cache.fingerprint([slot.model_dump(mode="json") for slot in upcoming]),
+            request.time_budget_ms
+        )
+        cached = result_cache.get(current_user.id, cache_key)
+        if cached is not None:
+            return cached
+        generation = result_cache.generation(current_user.id)
+        
         print(f"=== AI 일정 제안 요청 디버깅 ===")
         print(f"사용자: {current_user.email}, 지역구: {current_user.district}, 활동강도: {current_user.activity_level}")
         print(f"빈 시간대 수: {len(request.empty_time_slots)}")
@@ -67,11 +315,12 @@ async def suggest_schedules(
         print(f"주 시작일: {request.current_week_start}")
         
         # AI 일정 제안 생성
-        suggestions = optimizer.suggest_schedules_for_empty_slots(
+        suggestions = await run_solver(current_user, lambda: optimizer.suggest_schedules_for_empty_slots(
             user=current_user,
             empty_time_slots=request.empty_time_slots,
-            current_week_start=request.current_week_start
-        )
+            current_week_start=request.current_week_start,
+            time_budget_ms=request.time_budget_ms
+        ))
         
         print(f"생성된 제안 수: {len(suggestions)}")
         if suggestions:
@@ -79,13 +328,17 @@ async def suggest_schedules(
         else:
             print("❌ AI 제안이 생성되지 않았습니다!")
         
-        return SuggestionResponse(
+        response = SuggestionResponse(
             success=True,
             message="일정 제안이 생성되었습니다",
             suggestions=suggestions,
             total_suggestions=len(suggestions)
         )
+        result_cache.set(current_user.id, cache_key, response, generation)
+        return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -95,32 +348,38 @@ async def suggest_schedules(
 @router.post("/reoptimize-schedule", response_model=OptimizationResponse)
 async def reoptimize_schedule(
     request: OptimizationRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
+    """지연 발생 시 오늘 남은 일정 재최적화"""
+    # 오늘 일정 조회 (이미 시작한 일정은 유지, 남은 일정만 수리)
+    from app.models.schedule import Schedule
+    now = datetime.now()
+    day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    # 수리 과정에서 일정마다 장소를 읽으므로 한 번에 함께 조회
+    current_schedules = (await db.execute(
+        select(Schedule).options(selectinload(Schedule.location)).where(
+            Schedule.user_id == current_user.id,
+            Schedule.start_time >= day_start,
+            Schedule.start_time < day_start + timedelta(days=1)
+        ).order_by(Schedule.start_time)
+    )).scalars().all()
+    
+    if not any(s.end_time >= now for s in current_schedules):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="현재 진행 중인 일정이 없습니다"
+        )
     
     try:
-        # 현재 진행 중인 일정 조회
-        from app.models.schedule import Schedule
-        current_schedules = db.query(Schedule).filter(
-            Schedule.user_id == current_user.id,
-            Schedule.start_time <= datetime.now(),
-            Schedule.end_time >= datetime.now()
-        ).all()
-        
-        if not current_schedules:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="현재 진행 중인 일정이 없습니다"
-            )
-        
         # 재최적화 실행
-        reoptimized_schedule = optimizer.reoptimize_schedule(
+        reoptimized_schedule = await run_solver(current_user, lambda: optimizer.reoptimize_schedule(
             user=current_user,
             current_schedule=current_schedules,
             delay_minutes=request.delay_minutes or 0,
-            current_location=request.current_location
-        )
+            current_location=request.current_location,
+            now=now
+        ))
         
         # 총 거리와 예상 노출 수 계산
         total_distance = sum(s.get("travel_distance", 0) for s in reoptimized_schedule)
@@ -134,18 +393,48 @@ async def reoptimize_schedule(
             estimated_exposure=total_exposure
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"일정 재최적화 중 오류가 발생했습니다: {str(e)}"
         )
 
+@router.get("/locations/nearby", response_model=NearbyLocationsResponse)
+def get_nearby_locations(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    k: int = Query(10, ge=1, le=100),
+    radius_km: Optional[float] = Query(None, gt=0),
+    current_user: User = Depends(get_current_user)
+):
+    """현재 위치에서 가까운 사용자 지역구 장소 (재최적화 시 후보 확인용)
+
+    좌표가 있는 장소만 검색하므로 카탈로그를 지오코딩(python -m app.cli.geocode)하기 전에는
+    빈 목록을 돌려준다. 처음 조회하는 지역구는 카탈로그 샤드를 디스크에서 읽으므로 스레드 풀에서 실행한다.
+    """
+    locations = optimizer.nearby_locations(current_user.district, lat, lng, k=k, radius_km=radius_km)
+    return NearbyLocationsResponse(success=True, locations=locations)
+
 @router.get("/location-statistics/{district}")
-async def get_location_statistics(district: str):
-    """지역구별 장소 통계"""
+def get_location_statistics(district: str, if_none_match: Optional[str] = Header(None)):
+    """지역구별 장소 통계
+
+    통계는 지역구를 처음 조회할 때 계산해 두고 ETag 와 함께 보낸다. 처음 조회하는 지역구는
+    카탈로그 샤드를 디스크에서 읽으므로 스레드 풀에서 실행한다.
+    If-None-Match 가 현재 ETag 와 같으면 본문 없이 304 를 돌려준다.
+    """
     try:
-        stats = optimizer.get_location_statistics(district)
-        return {"district": district, "statistics": stats}
+        materialized = optimizer.location_statistics(district)
+        if materialized is None:
+            return {"district": district, "statistics": {}}
+        headers = {"ETag": materialized.etag, "Cache-Control": "no-cache"}
+        if materialized.matches(if_none_match):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        body = b'{"district":' + json.dumps(district, ensure_ascii=False).encode("utf-8") + \
+            b',"statistics":' + materialized.body + b'}'
+        return Response(content=body, media_type="application/json", headers=headers)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,14 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+import base64
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional, Tuple
 from app.db.session import get_db
 from app.models.schedule import Schedule, Location
 from app.schemas.schedule import ScheduleCreate, ScheduleResponse, ScheduleUpdate, LocationCreate, LocationResponse
 from app.api.v1.auth import get_current_user
 from app.models.user import User
+from app.services.result_cache import result_cache
 
 router = APIRouter()
 
+# 한 페이지 최대 일정 수
+MAX_PAGE_SIZE = 1000
+
+def encode_cursor(schedule: Schedule) -> str:
+    """다음 페이지 커서 (마지막 일정의 시작 시각과 id)"""
+    raw = f"{schedule.start_time.isoformat()}|{schedule.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        start, schedule_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(start), schedule_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="잘못된 페이지 커서입니다")
+
+def list_user_schedules(db: Session, user_id: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                        after: Optional[Tuple[datetime, str]] = None, limit: Optional[int] = None) -> List[Schedule]:
+    """사용자 일정을 시작 시각 순으로 조회 (start <= start_time < end, after 다음부터)
+
+    (user_id, start_time, id) 인덱스 순서 그대로 읽으므로 기간 밖 일정이나 앞 페이지는 읽지 않는다.
+    장소는 응답 직렬화 때 일정마다 따로 읽지 않도록 한 번의 IN 쿼리로 함께 읽는다.
+    """
+    query = db.query(Schedule).options(selectinload(Schedule.location)).filter(Schedule.user_id == user_id)
+    if start is not None:
+        query = query.filter(Schedule.start_time >= start)
+    if end is not None:
+        query = query.filter(Schedule.start_time < end)
+    if after is not None:
+        # 행 값 비교라야 인덱스에서 커서 위치로 바로 찾아감 (OR 로 풀어 쓰면 앞부분을 훑음)
+        query = query.filter(tuple_(Schedule.start_time, Schedule.id) > tuple_(*after))
+    query = query.order_by(Schedule.start_time, Schedule.id)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
 @router.post("/schedules", response_model=ScheduleResponse)
 def create_schedule(
     schedule: ScheduleCreate,
@@ -22,15 +61,31 @@ def create_schedule(
     )
     db.add(db_schedule)
     db.commit()
+    result_cache.invalidate_user(current_user.id)
     db.refresh(db_schedule)
     return db_schedule
 
 @router.get("/schedules", response_model=List[ScheduleResponse])
 def get_schedules(
+    response: Response,
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    schedules = db.query(Schedule).filter(Schedule.user_id == current_user.id).all()
+    """일정 목록 (시작 시각 순)
+
+    from/to 로 시작 시각 기간을 거르고, limit 을 주면 페이지 단위로 돌려준다.
+    다음 페이지가 있으면 X-Next-Cursor 헤더의 값을 cursor 로 넘겨 이어서 조회한다.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    # 다음 페이지 유무를 알기 위해 하나 더 읽음
+    schedules = list_user_schedules(db, current_user.id, start, end, after, limit + 1 if limit else None)
+    if limit and len(schedules) > limit:
+        schedules = schedules[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(schedules[-1])
     return schedules
 
 @router.get("/schedules/{schedule_id}", response_model=ScheduleResponse)
@@ -39,7 +94,7 @@ def get_schedule(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    schedule = db.query(Schedule).filter(
+    schedule = db.query(Schedule).options(selectinload(Schedule.location)).filter(
         Schedule.id == schedule_id,
         Schedule.user_id == current_user.id
     ).first()
@@ -66,6 +121,7 @@ def update_schedule(
         setattr(db_schedule, field, value)
     
     db.commit()
+    result_cache.invalidate_user(current_user.id)
     db.refresh(db_schedule)
     return db_schedule
 
@@ -84,6 +140,7 @@ def delete_schedule(
     
     db.delete(db_schedule)
     db.commit()
+    result_cache.invalidate_user(current_user.id)
     return {"message": "일정이 삭제되었습니다"}
 
 # Location API
@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import List
+from app.db.session import get_db
+from app.models.team import TeamMember
+from app.models.user import User
+from app.api.v1.auth import get_current_user
+from app.schemas.user import TeamMemberResponse
+
+router = APIRouter()
+
+@router.put("/team/leaders/{leader_id}")
+def grant_leader(
+    leader_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """팀장이 내 일정을 팀 최적화에 포함할 수 있도록 허용 (여러 번 호출해도 같음)"""
+    if db.query(User.id).filter(User.id == leader_id).first() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="팀장을 찾을 수 없습니다"
+        )
+    exists = db.query(TeamMember).filter(
+        TeamMember.leader_id == leader_id,
+        TeamMember.member_id == current_user.id
+    ).first()
+    if exists is None and leader_id != current_user.id:
+        db.add(TeamMember(leader_id=leader_id, member_id=current_user.id))
+        db.commit()
+    return {"message": "팀장에게 일정 계획을 허용했습니다"}
+
+@router.delete("/team/leaders/{leader_id}")
+def revoke_leader(
+    leader_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """팀장에게 준 일정 계획 허용 취소"""
+    db.query(TeamMember).filter(
+        TeamMember.leader_id == leader_id,
+        TeamMember.member_id == current_user.id
+    ).delete(synchronize_session=False)
+    db.commit()
+    return {"message": "일정 계획 허용을 취소했습니다"}
+
+@router.get("/team/members", response_model=List[TeamMemberResponse])
+def get_team_members(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """나에게 일정 계획을 허용한 팀원 목록"""
+    return db.query(User).join(TeamMember, TeamMember.member_id == User.id).filter(
+        TeamMember.leader_id == current_user.id
+    ).order_by(User.name).all()
@@ -0,0 +1,31 @@
+"""
+장소 카탈로그 샤드 생성
+실행: python -m app.cli.build_location_catalogue --source locations.json --version 2024.2 [--output app/data/catalogue]
+
+원본 JSON 형식: {"districts": {지역구: [{"name", "address", "type", "priority", "exposure"}, ...]},
+               "aliases": {선거구 이름: 지역구}}
+"""
+
+import argparse
+import json
+from app.core.config import settings
+from app.services.location_catalogue import DEFAULT_CATALOGUE_DIR, LocationCatalogue
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="지역구별 장소 카탈로그 샤드 생성")
+    parser.add_argument("--source", required=True, help="원본 JSON 파일")
+    parser.add_argument("--version", required=True, help="카탈로그 버전")
+    parser.add_argument("--output", default=settings.LOCATION_CATALOGUE_DIR or DEFAULT_CATALOGUE_DIR,
+                        help="샤드 저장 위치")
+    args = parser.parse_args(argv)
+
+    with open(args.source, encoding="utf-8") as f:
+        source = json.load(f)
+    districts = source["districts"]
+    LocationCatalogue.write(args.output, districts, source.get("aliases", {}), args.version)
+
+    total = sum(len(locations) for locations in districts.values())
+    print(f"{len(districts)}개 지역구, {total}개 장소 저장 (버전 {args.version}) -> {args.output}")
+
+if __name__ == "__main__":
+    main()
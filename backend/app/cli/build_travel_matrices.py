@@ -0,0 +1,33 @@
+"""
+지역구별 이동시간/거리 행렬 오프라인 생성
+실행: python -m app.cli.build_travel_matrices [--district 군포시] [--provider google]
+"""
+
+import argparse
+import time
+from app.core.config import settings
+from app.services.maps_service import MapsService
+from app.services.optimization import ScheduleOptimizer
+from app.services.quota import BACKGROUND
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="지역구별 이동 행렬(npz) 생성")
+    parser.add_argument("--district", action="append", help="대상 지역구 (생략 시 전체)")
+    parser.add_argument("--provider", help="지도 API 행렬 조회에 쓸 서비스 (google, tmap). 생략 시 좌표 추정/기본값")
+    args = parser.parse_args(argv)
+
+    optimizer = ScheduleOptimizer()
+    maps_service = None
+    if args.provider:
+        maps_service = MapsService(priority=BACKGROUND)
+        maps_service.default_service = args.provider
+    districts = args.district or list(optimizer.locations.keys())
+
+    for district in districts:
+        started = time.perf_counter()
+        matrix = optimizer.build_travel_matrix(district, save=True, maps_service=maps_service)
+        elapsed = time.perf_counter() - started
+        print(f"{district}: {matrix.size}x{matrix.size} 행렬 저장 ({elapsed:.2f}s) -> {settings.TRAVEL_MATRIX_DIR}")
+
+if __name__ == "__main__":
+    main()
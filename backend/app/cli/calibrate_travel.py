@@ -0,0 +1,32 @@
+"""
+좌표 기반 이동 추정 모델 보정 (캐시된 실제 지도 API 응답 사용)
+실행: python -m app.cli.calibrate_travel [--provider google]
+"""
+
+import argparse
+from app.core.config import settings
+from app.services.geocoding import geocode_cache
+from app.services.travel_cache import travel_cache
+from app.services.travel_estimator import TravelEstimator
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="이동 추정 모델 보정")
+    parser.add_argument("--provider", action="append", help="보정에 쓸 지도 서비스 (생략 시 google, naver, tmap)")
+    parser.add_argument("--output", default=settings.TRAVEL_MODEL_PATH, help="보정 결과 파일")
+    args = parser.parse_args(argv)
+
+    estimator = TravelEstimator.load(args.output)
+    used = estimator.calibrate_from_cache(travel_cache, geocode_cache.get, args.provider or ["google", "naver", "tmap"])
+    if not used:
+        print("보정할 표본이 부족합니다 (좌표가 있는 캐시 응답 필요)")
+        return
+
+    estimator.save(args.output)
+    for mode, count in used.items():
+        model = estimator.models[mode]
+        print(f"{mode}: 표본 {count}개, 속도 {model.speed_kmh:.1f}km/h, 우회 계수 {model.detour:.2f}, "
+              f"고정 시간 {model.overhead_min:.1f}분")
+    print(f"저장 -> {args.output}")
+
+if __name__ == "__main__":
+    main()
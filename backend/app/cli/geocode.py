@@ -0,0 +1,102 @@
+"""
+주소 일괄 지오코딩 (카탈로그 샤드와 locations 테이블의 위도/경도 채우기)
+실행: python -m app.cli.geocode [--provider google] [--version 2024.2] [--skip-catalogue] [--skip-db]
+
+조회 결과는 정규화 주소 기준 영구 캐시(GEOCODE_CACHE_DB_PATH)에 남으므로
+같은 주소는 배포 수명 동안 한 번만 제공자를 호출한다.
+좌표가 바뀌면 카탈로그 버전도 바뀐다 (--version 생략 시 "<기존 버전>+geo.<좌표 해시>").
+카탈로그 버전을 키에 쓰는 캐시(결과 캐시, 통계 ETag)가 이전 좌표의 결과를 돌려주지 않게 하기 위함이다.
+"""
+
+import argparse
+import hashlib
+import json
+from app.core.config import settings
+from app.services.geocoding import BatchGeocoder, GeocodeCache, get_geocoder
+from app.services.location_catalogue import DEFAULT_CATALOGUE_DIR, LocationCatalogue
+
+def geocoded_version(version: str, districts) -> str:
+    """좌표를 채운 카탈로그의 버전 (원래 버전 + 좌표 해시, 다시 실행하면 해시만 바뀜)"""
+    base = (version or "").split("+geo.")[0]
+    coordinates = sorted(
+        (district, loc["name"], loc["address"], loc.get("latitude"), loc.get("longitude"))
+        for district, locations in districts.items() for loc in locations
+    )
+    digest = hashlib.sha256(json.dumps(coordinates, ensure_ascii=False).encode("utf-8")).hexdigest()
+    return f"{base}+geo.{digest[:8]}"
+
+def geocode_catalogue(batch: BatchGeocoder, directory: str, version: str = None) -> int:
+    """카탈로그 장소 좌표 채우기. 좌표가 바뀐 경우에만 샤드를 다시 쓴다
+
+    version 을 주지 않으면 좌표 해시로 새 버전을 만든다.
+    """
+    catalogue = LocationCatalogue(directory, max_resident=1 << 30)
+    districts = {district: [dict(loc) for loc in catalogue[district]] for district in catalogue.districts()}
+    addresses = [loc["address"] for locations in districts.values() for loc in locations]
+    coordinates = batch.geocode_all(addresses)
+
+    updated = 0
+    for locations in districts.values():
+        for loc in locations:
+            found = coordinates.get(loc["address"])
+            if found is not None and (loc.get("latitude"), loc.get("longitude")) != found:
+                loc["latitude"], loc["longitude"] = found
+                updated += 1
+    if updated:
+        LocationCatalogue.write(directory, districts, catalogue.aliases,
+                                version or geocoded_version(catalogue.version, districts),
+                                shard_names=catalogue.shard_names)
+    return updated
+
+def geocode_locations_table(batch: BatchGeocoder) -> int:
+    """locations 테이블에서 좌표가 없는 장소 채우기"""
+    from app.db.session import SessionLocal
+    from app.models.schedule import Location
+
+    db = SessionLocal()
+    try:
+        pending = db.query(Location).filter(
+            (Location.latitude.is_(None)) | (Location.longitude.is_(None))
+        ).all()
+        coordinates = batch.geocode_all(loc.address for loc in pending)
+        updated = 0
+        for loc in pending:
+            found = coordinates.get(loc.address)
+            if found is not None:
+                loc.latitude, loc.longitude = found
+                updated += 1
+        db.commit()
+        return updated
+    finally:
+        db.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="주소 일괄 지오코딩")
+    parser.add_argument("--provider", help="google | naver | tmap | stub (생략 시 기본 지도 서비스)")
+    parser.add_argument("--catalogue-dir", default=settings.LOCATION_CATALOGUE_DIR or DEFAULT_CATALOGUE_DIR)
+    parser.add_argument("--version", help="좌표를 갱신한 카탈로그 버전 (생략 시 기존 버전 + 좌표 해시)")
+    parser.add_argument("--cache", default=settings.GEOCODE_CACHE_DB_PATH, help="지오코딩 캐시 파일")
+    parser.add_argument("--delay", type=float, default=0.05, help="제공자 호출 간격(초)")
+    parser.add_argument("--retry-missing", action="store_true", help="찾지 못한 주소를 다시 조회")
+    parser.add_argument("--skip-catalogue", action="store_true")
+    parser.add_argument("--skip-db", action="store_true")
+    args = parser.parse_args(argv)
+
+    cache = GeocodeCache(args.cache)
+    if args.retry_missing:
+        cache.delete_missing()
+    batch = BatchGeocoder(get_geocoder(args.provider), cache, delay_seconds=args.delay)
+
+    if not args.skip_catalogue:
+        updated = geocode_catalogue(batch, args.catalogue_dir, args.version)
+        print(f"카탈로그: {updated}개 장소 좌표 갱신 -> {args.catalogue_dir}")
+    if not args.skip_db:
+        updated = geocode_locations_table(batch)
+        print(f"locations 테이블: {updated}개 장소 좌표 갱신")
+
+    stats = cache.stats()
+    print(f"제공자 호출 {batch.lookups}회 (오류 {batch.failures}회), 캐시 {stats['entries']}건 (미발견 {stats['missing']}건)")
+    cache.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+비첨두 시간대 이동 정보 캐시 사전 채우기
+실행: python -m app.cli.prewarm_travel_cache [--district 군포시] [--provider google] [--mode transit] [--force]
+
+지역구별 장소 간 행렬을 지도 API 행렬 조회로 채워 영구 이동 정보 캐시(TRAVEL_CACHE_DB_PATH)에
+저장한다. 이미 캐시된 블록은 조회하지 않고, 호출은 백그라운드 우선순위라 대화형 요청의 호출
+한도를 침범하지 않는다. 시간대(MAPS_PREWARM_WINDOW)가 끝나면 다음 지역구로 넘어가지 않고 멈춘다.
+크론 등에서 시간대 시작 시각에 실행한다.
+"""
+
+import argparse
+from datetime import datetime, time as dtime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from app.core.config import settings
+from app.core.maps_config import maps_config
+from app.services.maps_service import MapsService
+from app.services.optimization import ScheduleOptimizer
+from app.services.quota import BACKGROUND
+
+MATRIX_PROVIDERS = ("google", "tmap")  # 행렬 API 가 있는 제공자 (tmap 은 driving 만, 나머지 이동수단은 쌍마다 조회)
+
+def parse_window(text: str) -> Tuple[dtime, dtime]:
+    """"01:00-06:00" -> (시작, 끝)"""
+    start, end = (datetime.strptime(part.strip(), "%H:%M").time() for part in text.split("-"))
+    return start, end
+
+def in_window(window: Tuple[dtime, dtime], now: datetime) -> bool:
+    start, end = window
+    current = now.time()
+    if start <= end:
+        return start <= current < end
+    return current >= start or current < end  # 자정을 넘는 시간대
+
+def prewarm_districts(optimizer: ScheduleOptimizer, maps_service: MapsService, districts: Iterable[str],
+                      modes: List[str], should_stop: Optional[Callable[[], bool]] = None,
+                      max_elements: Optional[int] = None) -> Dict[str, int]:
+    """지역구별 행렬 조회로 캐시 채우기. 지역구별 새로 조회한 원소 수 반환
+
+    should_stop() 이 참이거나 조회 원소가 max_elements 에 이르면 다음 지역구로 넘어가지 않는다.
+    """
+    fetched = {}
+    for district in districts:
+        if should_stop is not None and should_stop():
+            break
+        if max_elements is not None and maps_service.fetched_elements >= max_elements:
+            break
+        addresses = list(dict.fromkeys(loc["address"] for loc in optimizer.locations.get(district, [])))
+        before = maps_service.fetched_elements
+        for mode in modes:
+            maps_service.get_distance_matrix(addresses, addresses, mode)
+        fetched[district] = maps_service.fetched_elements - before
+    return fetched
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="이동 정보 캐시 사전 채우기")
+    parser.add_argument("--district", action="append", help="대상 지역구 (생략 시 전체)")
+    parser.add_argument("--provider", choices=MATRIX_PROVIDERS, help="행렬 조회 제공자 (생략 시 기본 지도 서비스)")
+    parser.add_argument("--mode", action="append", help="이동수단 (생략 시 transit)")
+    parser.add_argument("--window", default=maps_config.MAPS_PREWARM_WINDOW, help="실행 시간대 HH:MM-HH:MM")
+    parser.add_argument("--max-elements", type=int, help="이번 실행에서 조회할 최대 원소 수 (과금 상한)")
+    parser.add_argument("--force", action="store_true", help="시간대 밖에서도 실행")
+    args = parser.parse_args(argv)
+
+    provider = args.provider or maps_config.DEFAULT_MAPS_SERVICE
+    if provider not in MATRIX_PROVIDERS:
+        parser.error(f"{provider} 는 행렬 API 가 없습니다. --provider 로 {', '.join(MATRIX_PROVIDERS)} 중 하나를 지정하세요")
+    if not settings.TRAVEL_CACHE_DB_PATH:
+        parser.error("TRAVEL_CACHE_DB_PATH 가 설정되지 않아 채운 캐시가 유지되지 않습니다")
+
+    window = parse_window(args.window)
+    if not args.force and not in_window(window, datetime.now()):
+        print(f"사전 채우기 시간대({args.window})가 아니어서 종료합니다 (--force 로 강제 실행)")
+        return
+
+    optimizer = ScheduleOptimizer()
+    maps_service = MapsService(priority=BACKGROUND)
+    maps_service.default_service = provider
+    districts = args.district or list(optimizer.locations.keys())
+    should_stop = None if args.force else (lambda: not in_window(window, datetime.now()))
+
+    fetched = prewarm_districts(optimizer, maps_service, districts, args.mode or ["transit"],
+                                should_stop=should_stop, max_elements=args.max_elements)
+    for district, elements in fetched.items():
+        print(f"{district}: {elements}개 원소 조회")
+    skipped = len(districts) - len(fetched)
+    if skipped:
+        print(f"시간대 종료 또는 원소 상한으로 {skipped}개 지역구는 다음 실행으로 넘깁니다")
+    print(f"합계 {maps_service.fetched_elements}개 원소 조회 -> {settings.TRAVEL_CACHE_DB_PATH}")
+
+if __name__ == "__main__":
+    main()
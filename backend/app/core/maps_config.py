@@ -1,3 +1,5 @@
+from typing import Dict
+
 try:
     from pydantic_settings import BaseSettings
 except ImportError:
@@ -17,6 +19,35 @@ class MapsConfig(BaseSettings):
     # 기본 지도 서비스 선택
     DEFAULT_MAPS_SERVICE: str = "google"  # google, naver, tmap
     
+    # API 기본 주소 (테스트나 프록시 사용 시 변경)
+    GOOGLE_MAPS_BASE_URL: str = "https://maps.googleapis.com"
+    NAVER_MAPS_BASE_URL: str = "https://naveropenapi.apigw.ntruss.com"
+    TMAP_BASE_URL: str = "https://apis.openapi.sk.com"
+    
+    # HTTP 연결 풀 및 행렬 조회 설정
+    MAPS_HTTP_TIMEOUT_SECONDS: float = 10.0
+    MAPS_HTTP_MAX_CONNECTIONS: int = 10
+    MAPS_MATRIX_CONCURRENCY: int = 4  # 동시에 조회할 행렬 블록 수
+    
+    # 경로 조회 제공자 체인 (DEFAULT_MAPS_SERVICE 다음 순서, 키가 없는 제공자는 제외)
+    # 모든 제공자가 실패하면 좌표 기반 추정값 사용
+    MAPS_PROVIDER_CHAIN: str = "google,naver,tmap"
+    MAPS_ATTEMPT_TIMEOUT_SECONDS: float = 2.0  # 이 시간 안에 응답이 없으면 다음 제공자 시도
+    MAPS_REQUEST_DEADLINE_SECONDS: float = 4.0  # 경로 조회 한 건의 최대 대기 시간
+    MAPS_CIRCUIT_FAILURE_THRESHOLD: int = 5  # 연속 실패 시 차단
+    MAPS_CIRCUIT_RESET_SECONDS: float = 30.0  # 차단 후 시험 요청까지 대기
+    MAPS_HEDGE_ENABLED: bool = False  # 느린 응답에 다음 제공자로 예비 요청
+    MAPS_HEDGE_DELAY_MS: float = 200.0  # 예비 요청 최소 대기 (표본이 쌓이면 p95 사용)
+    
+    # 제공자별 호출 한도 (초당 과금 단위: 경로 한 건 또는 행렬 원소 하나, 0 이면 제한 없음)
+    MAPS_RATE_LIMITS: Dict[str, float] = {"google": 50.0, "naver": 10.0, "tmap": 5.0}
+    MAPS_RATE_BURST_SECONDS: float = 2.0  # 버킷 용량 = 한도 x 이 시간
+    MAPS_RATE_WAIT_SECONDS: float = 0.5  # 대화형 요청이 토큰을 기다리는 최대 시간
+    MAPS_BACKGROUND_RESERVE: float = 0.5  # 백그라운드 작업이 대화형 요청을 위해 남겨 두는 버킷 비율
+    
+    # 이동 정보 캐시 사전 채우기 시간대 (HH:MM-HH:MM, 자정을 넘겨도 됨)
+    MAPS_PREWARM_WINDOW: str = "01:00-06:00"
+    
     class Config:
         env_file = ".env"
 
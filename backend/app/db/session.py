@@ -1,11 +1,110 @@
-from sqlalchemy import create_engine
+from typing import Any, AsyncIterator, Dict, Optional, Union
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-engine = create_engine(
-    settings.SQLITE_URL, connect_args={"check_same_thread": False}
-)
+# SQLite 저장소 프로필
+#   default    - SQLite 기본 설정 그대로 (롤백 저널, 개발/테스트용)
+#   production - WAL 저널: 쓰는 동안에도 읽기가 막히지 않고, 커밋마다 fsync 하지 않음 (synchronous=NORMAL)
+SQLITE_PROFILES = ("default", "production")
+
+# 비동기 세션에서 쓰는 드라이버
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+def sqlite_pragmas(profile: str) -> Dict[str, Union[int, str]]:
+    """프로필에 따라 연결마다 실행할 PRAGMA"""
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"알 수 없는 SQLite 프로필입니다: {profile}")
+    if profile == "default":
+        return {}
+    return {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KB,  # 음수는 KiB 단위
+        "mmap_size": settings.SQLITE_MMAP_SIZE_BYTES,
+        "temp_store": "MEMORY",
+    }
+
+def database_url(url: Optional[str] = None) -> str:
+    """사용할 데이터베이스 URL (DATABASE_URL, 없으면 SQLITE_URL)
+
+    Render/Heroku 가 주는 postgres:// 형식은 SQLAlchemy 가 인식하는 postgresql:// 로 바꾼다.
+    """
+    url = url or settings.DATABASE_URL or settings.SQLITE_URL
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+    return url
+
+def async_database_url(url: str) -> str:
+    """동기 URL -> 비동기 드라이버 URL (sqlite+aiosqlite, postgresql+asyncpg)"""
+    parsed = make_url(database_url(url))
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"비동기 세션을 지원하지 않는 데이터베이스입니다: {backend}")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+def _is_memory_sqlite(url: str) -> bool:
+    return ":memory:" in url or "mode=memory" in url or make_url(url).database in (None, "")
+
+def _engine_options(url: str) -> Dict[str, Any]:
+    """연결 풀 설정 (메모리 SQLite 는 연결 하나를 공유하므로 제외)"""
+    if make_url(url).get_backend_name() == "sqlite":
+        if _is_memory_sqlite(url):
+            return {}
+        return {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        }
+    # 서버 DB 는 끊긴 연결(재시작, 유휴 연결 정리)을 쓰기 전에 확인하고 주기적으로 새로 연결
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    }
+
+def _apply_pragmas_on_connect(sync_engine: Engine, pragmas: Dict[str, Union[int, str]]) -> None:
+    if not pragmas:
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+def create_sqlite_engine(url: str, profile: str = "default") -> Engine:
+    """SQLite 엔진 (프로필 PRAGMA 를 연결할 때 적용, 파일 DB 는 연결 풀 크기 명시)"""
+    pragmas = sqlite_pragmas(profile)
+    engine = create_engine(url, connect_args={"check_same_thread": False}, **_engine_options(url))
+    _apply_pragmas_on_connect(engine, pragmas)
+    return engine
+
+def create_app_engine(url: Optional[str] = None, profile: Optional[str] = None) -> Engine:
+    """URL 에 맞는 동기 엔진 (SQLite 는 저장소 프로필 적용, PostgreSQL 등은 풀 설정 적용)"""
+    url = database_url(url)
+    if make_url(url).get_backend_name() == "sqlite":
+        return create_sqlite_engine(url, profile or settings.SQLITE_PROFILE)
+    return create_engine(url, **_engine_options(url))
+
+def create_async_app_engine(url: Optional[str] = None, profile: Optional[str] = None) -> AsyncEngine:
+    """create_app_engine 의 비동기 버전 (aiosqlite / asyncpg)"""
+    url = database_url(url)
+    engine = create_async_engine(async_database_url(url), **_engine_options(url))
+    if make_url(url).get_backend_name() == "sqlite":
+        _apply_pragmas_on_connect(engine.sync_engine, sqlite_pragmas(profile or settings.SQLITE_PROFILE))
+    return engine
+
+engine = create_app_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -16,3 +115,21 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# 비동기 엔진은 처음 사용할 때 생성 (비동기 드라이버가 필요한 경로에서만 로드)
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        _async_engine = create_async_app_engine()
+        # 커밋 후에도 응답 직렬화에서 속성을 읽을 수 있도록 만료하지 않음 (비동기 세션은 지연 로딩 불가)
+        _async_session_factory = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """async def 라우트용 세션 (조회가 이벤트 루프를 막지 않음)"""
+    get_async_engine()
+    async with _async_session_factory() as db:
+        yield db
@@ -2,11 +2,26 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
 from app.core.config import settings
-from app.api.v1 import auth, schedule, optimization  # optimization 추가
+from app.api.v1 import auth, schedule, optimization, jobs, metrics, team  # optimization 추가
+from sqlalchemy import inspect, text
 from app.db.session import engine, Base
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+# create_all 은 이미 있는 테이블에 새로 선언한 열도 추가하지 않으므로 (NULL 허용 열만) 따로 추가
+_inspector = inspect(engine)
+for table in Base.metadata.sorted_tables:
+    existing_columns = {column["name"] for column in _inspector.get_columns(table.name)}
+    for column in table.columns:
+        if column.name not in existing_columns and column.nullable:
+            with engine.begin() as conn:
+                conn.execute(text(
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(engine.dialect)}"
+                ))
+# create_all 은 이미 있는 테이블에 새로 선언한 인덱스를 만들지 않으므로 따로 생성
+for table in Base.metadata.sorted_tables:
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -29,12 +44,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # API 라우터 등록
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(schedule.router, prefix="/api/v1", tags=["schedule"])
 app.include_router(optimization.router, prefix="/api/v1", tags=["optimization"])  # 추가
+app.include_router(jobs.router, prefix="/api/v1", tags=["jobs"])
+app.include_router(team.router, prefix="/api/v1", tags=["team"])
+app.include_router(metrics.router, prefix="/api/v1", tags=["metrics"])
 
 @app.get("/")
 async def root():
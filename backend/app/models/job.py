@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text
+from app.db.session import Base
+import uuid
+
+class OptimizationJob(Base):
+    __tablename__ = "optimization_jobs"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String, ForeignKey("users.id"), index=True)
+    kind = Column(String, nullable=False)  # optimize, campaign
+    params = Column(Text, nullable=False)  # 요청 본문 (JSON)
+    dedup_key = Column(String, nullable=False, index=True)  # 사용자 + 종류 + 요청 본문 해시
+    status = Column(String, nullable=False, default="queued")  # queued, running, succeeded, failed
+    progress = Column(Text, nullable=True)  # 중간 결과 (JSON)
+    result = Column(Text, nullable=True)  # 최종 결과 (JSON)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    expires_at = Column(DateTime, nullable=True, index=True)  # 끝난 작업 삭제 시각
+    worker_id = Column(String, nullable=True)  # 실행 중인 프로세스 (호스트:pid:임의값)
+    heartbeat_at = Column(DateTime, nullable=True)  # 실행 프로세스가 마지막으로 살아 있음을 기록한 시각
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Float, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Float, Index, Text
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 import uuid
@@ -18,6 +18,11 @@ class Schedule(Base):
     user = relationship("User", back_populates="schedules")
     location = relationship("Location", back_populates="schedules")
 
+    __table_args__ = (
+        # 사용자별 기간 조회/키셋 페이지 (start_time, id 순서)
+        Index("ix_schedules_user_start", "user_id", "start_time", "id"),
+    )
+
 class Location(Base):
     __tablename__ = "locations"
 
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey
+from app.db.session import Base
+from datetime import datetime
+
+class TeamMember(Base):
+    """팀원(member_id)이 팀장(leader_id)에게 자신의 일정 계획을 허용한 관계"""
+    __tablename__ = "team_members"
+
+    leader_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    member_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
@@ -1,12 +1,13 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict, Union
 
 class OptimizationRequest(BaseModel):
     date: datetime
     include_existing: bool = True
     delay_minutes: Optional[int] = None
     current_location: Optional[str] = None
+    time_budget_ms: Optional[int] = Field(None, ge=10, le=10000)
 
 class TimeSlot(BaseModel):
     start: str
@@ -16,6 +17,7 @@ class TimeSlot(BaseModel):
 class SuggestionRequest(BaseModel):
     empty_time_slots: List[TimeSlot]
     current_week_start: Optional[str] = None
+    time_budget_ms: Optional[int] = Field(None, ge=10, le=10000)
 
 class ScheduleItem(BaseModel):
     title: str
@@ -39,14 +41,89 @@ class OptimizationResponse(BaseModel):
     total_distance: float
     estimated_exposure: int
 
+class OptimizationProgress(BaseModel):
+    type: str  # improvement | final
+    objective: float
+    elapsed_ms: float
+    schedule: List[ScheduleItem]
+    total_distance: float
+    estimated_exposure: int
+
 class SuggestionResponse(BaseModel):
     success: bool
     message: str
     suggestions: List[ScheduleItem]
     total_suggestions: int
 
+class CampaignRequest(BaseModel):
+    start_date: datetime
+    end_date: datetime
+    revisit_gap_days: int = Field(7, ge=1)
+    high_priority_threshold: int = Field(5, ge=1, le=5)
+
+class CampaignDay(BaseModel):
+    date: str
+    schedule: List[ScheduleItem]
+    total_distance: float
+    estimated_exposure: int
+
+class CampaignResponse(BaseModel):
+    success: bool
+    message: str
+    days: List[CampaignDay]
+    total_distance: float
+    estimated_exposure: int
+    uncovered_locations: List[str]
+
+class TeamOptimizationRequest(BaseModel):
+    date: datetime
+    member_ids: List[str] = []
+    time_budget_ms: Optional[int] = Field(None, ge=10, le=10000)
+
+class TeamRoute(BaseModel):
+    user_id: str
+    name: Optional[str] = None
+    activity_level: Optional[str] = None
+    schedule: List[ScheduleItem]
+    total_distance: float
+    estimated_exposure: int
+
+class TeamOptimizationResponse(BaseModel):
+    success: bool
+    message: str
+    routes: List[TeamRoute]
+    total_distance: float
+    estimated_exposure: int
+
 class LocationStatistics(BaseModel):
     total_locations: int
-    by_type: Dict[str, Dict[str, int]]
-    by_zone: Dict[str, Dict[str, int]]
+    by_type: Dict[str, Dict[str, Union[int, float]]]  # count, total_exposure, exposure_p50, exposure_p90
+    by_zone: Dict[str, Dict[str, int]]  # count, total_exposure, high_priority
+    priority_histogram: Dict[str, int]  # 우선순위 -> 장소 수
     total_exposure: int
+
+class NearbyLocation(BaseModel):
+    name: str
+    address: str
+    type: str
+    priority: int
+    exposure: int
+    latitude: float
+    longitude: float
+    distance_km: float
+
+class NearbyLocationsResponse(BaseModel):
+    success: bool
+    locations: List[NearbyLocation]
+
+class OptimizationJobResponse(BaseModel):
+    id: str
+    kind: str
+    status: str  # queued, running, succeeded, failed
+    progress: Optional[Any] = None  # 실행 중 최선 결과
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
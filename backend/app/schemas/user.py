@@ -26,3 +26,12 @@ class UserResponse(UserBase):
 
     class Config:
         from_attributes = True
+
+class TeamMemberResponse(BaseModel):
+    id: str
+    name: str
+    district: Optional[str] = None
+    activity_level: str
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,77 @@
+from typing import Tuple
+
+import numpy as np
+
+
+def linear_sum_assignment(cost: np.ndarray, maximize: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """직사각 선형 할당 문제 (최단 증강 경로 방식 헝가리안 알고리즘)
+
+    행마다 서로 다른 열을 하나씩 배정해 총비용을 최소화(maximize=True 이면 최대화)한다.
+    열 방향 연산은 numpy 벡터 연산으로 처리해 행 수 n, 열 수 m 에 대해 O(n^2 m) 이다.
+    반환값은 (행 인덱스, 열 인덱스) 배열 쌍이다.
+    """
+    cost = np.asarray(cost, dtype=float)
+    if cost.ndim != 2:
+        raise ValueError("cost matrix must be 2-dimensional")
+    if not np.all(np.isfinite(cost)):
+        raise ValueError("cost matrix must be finite")
+    if maximize:
+        cost = -cost
+
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+
+    n, m = cost.shape
+    u = np.zeros(n)
+    v = np.zeros(m)
+    col4row = np.full(n, -1, dtype=int)
+    row4col = np.full(m, -1, dtype=int)
+    rows = np.arange(n)
+
+    for cur_row in range(n):
+        shortest = np.full(m, np.inf)
+        path = np.full(m, -1, dtype=int)
+        visited_rows = np.zeros(n, dtype=bool)
+        visited_cols = np.zeros(m, dtype=bool)
+
+        i = cur_row
+        min_val = 0.0
+        sink = -1
+        while sink < 0:
+            visited_rows[i] = True
+            reduced = min_val + cost[i] - u[i] - v
+            improved = ~visited_cols & (reduced < shortest)
+            path[improved] = i
+            shortest[improved] = reduced[improved]
+
+            remaining = np.where(visited_cols, np.inf, shortest)
+            j = int(np.argmin(remaining))
+            min_val = remaining[j]
+            if not np.isfinite(min_val):
+                raise ValueError("cost matrix is infeasible")
+            visited_cols[j] = True
+            if row4col[j] < 0:
+                sink = j
+            else:
+                i = row4col[j]
+
+        # 쌍대 변수 갱신
+        u[cur_row] += min_val
+        others = visited_rows & (rows != cur_row)
+        u[others] += min_val - shortest[col4row[others]]
+        v[visited_cols] -= min_val - shortest[visited_cols]
+
+        # 증강 경로를 따라 배정 갱신
+        j = sink
+        while True:
+            i = path[j]
+            row4col[j] = i
+            col4row[i], j = j, col4row[i]
+            if i == cur_row:
+                break
+
+    if transposed:
+        order = np.argsort(col4row)
+        return col4row[order], order
+    return rows, col4row
@@ -0,0 +1,314 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.core.maps_config import maps_config
+from app.services.http_client import get_http_client
+
+Coordinates = Tuple[float, float]  # (위도, 경도)
+
+
+def normalize_address(address: str) -> str:
+    """지오코딩 캐시 키용 주소 정규화
+
+    유니코드 정규화(NFKC), 괄호 안 부가 설명 제거, 쉼표/공백 정리를 거쳐
+    표기만 다른 같은 주소가 한 번만 조회되게 한다.
+    """
+    text = unicodedata.normalize("NFKC", address or "")
+    text = re.sub(r"\([^)]*\)", " ", text)
+    text = text.replace(",", " ")
+    return " ".join(text.split()).lower()
+
+
+class Geocoder(ABC):
+    """주소 -> 좌표 변환 제공자 (찾지 못하면 None)"""
+
+    name = "base"
+
+    @abstractmethod
+    def geocode(self, address: str) -> Optional[Coordinates]:
+        ...
+
+
+class HttpGeocoder(Geocoder):
+    """지도 API 지오코더 공통 (경로 조회와 같은 공용 HTTP 클라이언트, maps_config 기본 주소와 제한 시간)"""
+
+    def __init__(self, base_url: str, http: Optional[httpx.Client] = None, timeout: Optional[float] = None):
+        self.base_url = base_url.rstrip("/")
+        self.http = http or get_http_client()
+        self.timeout = timeout if timeout is not None else maps_config.MAPS_HTTP_TIMEOUT_SECONDS
+
+
+class StubGeocoder(Geocoder):
+    """외부 호출 없는 로컬 지오코더 (테스트, 개발용)
+
+    table 에 있는 주소는 그 좌표를, 없으면 bbox(최소 위도, 최소 경도, 최대 위도, 최대 경도)가
+    주어진 경우 주소 해시로 정한 결정적 좌표를 돌려준다.
+    """
+
+    name = "stub"
+
+    def __init__(self, table: Optional[Dict[str, Coordinates]] = None,
+                 bbox: Optional[Tuple[float, float, float, float]] = None):
+        self.table = {normalize_address(k): v for k, v in (table or {}).items()}
+        self.bbox = bbox
+        self.calls = 0
+
+    def geocode(self, address: str) -> Optional[Coordinates]:
+        self.calls += 1
+        key = normalize_address(address)
+        if key in self.table:
+            return self.table[key]
+        if self.bbox is None:
+            return None
+        digest = hashlib.sha256(key.encode("utf-8")).digest()
+        u = int.from_bytes(digest[:4], "big") / 2 ** 32
+        v = int.from_bytes(digest[4:8], "big") / 2 ** 32
+        min_lat, min_lng, max_lat, max_lng = self.bbox
+        return (min_lat + u * (max_lat - min_lat), min_lng + v * (max_lng - min_lng))
+
+
+class GoogleGeocoder(HttpGeocoder):
+    """Google Geocoding API"""
+
+    name = "google"
+
+    def __init__(self, api_key: str, base_url: Optional[str] = None, http: Optional[httpx.Client] = None,
+                 timeout: Optional[float] = None):
+        super().__init__(base_url or maps_config.GOOGLE_MAPS_BASE_URL, http, timeout)
+        self.api_key = api_key
+
+    def geocode(self, address: str) -> Optional[Coordinates]:
+        response = self.http.get(
+            f"{self.base_url}/maps/api/geocode/json",
+            params={"address": address, "key": self.api_key, "region": "kr"},
+            timeout=self.timeout
+        )
+        data = response.json()
+        if data.get("status") == "OK" and data.get("results"):
+            location = data["results"][0]["geometry"]["location"]
+            return (float(location["lat"]), float(location["lng"]))
+        return None
+
+
+class NaverGeocoder(HttpGeocoder):
+    """Naver Maps Geocoding API"""
+
+    name = "naver"
+
+    def __init__(self, client_id: str, client_secret: str, base_url: Optional[str] = None,
+                 http: Optional[httpx.Client] = None, timeout: Optional[float] = None):
+        super().__init__(base_url or maps_config.NAVER_MAPS_BASE_URL, http, timeout)
+        self.client_id = client_id
+        self.client_secret = client_secret
+
+    def geocode(self, address: str) -> Optional[Coordinates]:
+        response = self.http.get(
+            f"{self.base_url}/map-geocode/v2/geocode",
+            headers={
+                "X-NCP-APIGW-API-KEY-ID": self.client_id,
+                "X-NCP-APIGW-API-KEY": self.client_secret
+            },
+            params={"query": address},
+            timeout=self.timeout
+        )
+        data = response.json()
+        if data.get("addresses"):
+            first = data["addresses"][0]
+            return (float(first["y"]), float(first["x"]))
+        return None
+
+
+class TmapGeocoder(HttpGeocoder):
+    """T Map 전체 주소 지오코딩 API"""
+
+    name = "tmap"
+
+    def __init__(self, api_key: str, base_url: Optional[str] = None, http: Optional[httpx.Client] = None,
+                 timeout: Optional[float] = None):
+        super().__init__(base_url or maps_config.TMAP_BASE_URL, http, timeout)
+        self.api_key = api_key
+
+    def geocode(self, address: str) -> Optional[Coordinates]:
+        response = self.http.get(
+            f"{self.base_url}/tmap/geo/fullAddrGeo",
+            headers={"appKey": self.api_key},
+            params={"version": 1, "fullAddr": address, "coordType": "WGS84GEO"},
+            timeout=self.timeout
+        )
+        data = response.json()
+        coordinates = data.get("coordinateInfo", {}).get("coordinate") or []
+        if coordinates:
+            first = coordinates[0]
+            lat = first.get("newLat") or first.get("lat")
+            lng = first.get("newLon") or first.get("lon")
+            if lat and lng:
+                return (float(lat), float(lng))
+        return None
+
+
+def get_geocoder(name: Optional[str] = None) -> Geocoder:
+    """지도 서비스 이름에 맞는 지오코더 ("stub" 은 외부 호출 없는 로컬 지오코더)"""
+    name = name or maps_config.DEFAULT_MAPS_SERVICE
+    if name == "google" and maps_config.GOOGLE_MAPS_API_KEY:
+        return GoogleGeocoder(maps_config.GOOGLE_MAPS_API_KEY)
+    if name == "naver" and maps_config.NAVER_CLIENT_ID:
+        return NaverGeocoder(maps_config.NAVER_CLIENT_ID, maps_config.NAVER_CLIENT_SECRET)
+    if name == "tmap" and maps_config.TMAP_API_KEY:
+        return TmapGeocoder(maps_config.TMAP_API_KEY)
+    if name == "stub":
+        return StubGeocoder()
+    raise ValueError(f"사용할 수 없는 지오코딩 제공자입니다: {name}")
+
+
+class GeocodeCache:
+    """정규화 주소 -> 좌표 영구 캐시 (SQLite)
+
+    찾지 못한 주소도 기록해 다시 조회하지 않는다. 요청 처리 경로에서는 이 캐시만 읽고
+    지오코딩 제공자는 오프라인 일괄 작업(app.cli.geocode)에서만 호출한다.
+    한 번 읽은 주소는 메모리에 두어 이후 조회는 SQLite 와 잠금 없이 처리한다
+    (다른 프로세스가 갱신한 좌표는 재시작 후 반영).
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._conn = None
+        self._lock = threading.Lock()
+        self._memo: Dict[str, Tuple[bool, Optional[Coordinates]]] = {}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS geocode_cache (
+                    address_key TEXT PRIMARY KEY,
+                    address TEXT NOT NULL,
+                    latitude REAL,
+                    longitude REAL,
+                    provider TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _exists(self) -> bool:
+        # 조회만으로 빈 캐시 파일을 만들지 않음
+        return self._conn is not None or (bool(self.db_path) and os.path.exists(self.db_path))
+
+    def lookup(self, address: str) -> Tuple[bool, Optional[Coordinates]]:
+        """(캐시에 있는지, 좌표). 찾지 못한 주소로 기록된 경우 (True, None)"""
+        key = normalize_address(address)
+        memoized = self._memo.get(key)
+        if memoized is not None:
+            return memoized
+        if not self._exists():
+            return False, None
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT latitude, longitude FROM geocode_cache WHERE address_key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            result = (False, None)
+        elif row[0] is None or row[1] is None:
+            result = (True, None)
+        else:
+            result = (True, (row[0], row[1]))
+        self._memo[key] = result
+        return result
+
+    def get(self, address: str) -> Optional[Coordinates]:
+        return self.lookup(address)[1]
+
+    def set(self, address: str, coordinates: Optional[Coordinates], provider: str) -> None:
+        key = normalize_address(address)
+        latitude, longitude = coordinates if coordinates is not None else (None, None)
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO geocode_cache "
+                "(address_key, address, latitude, longitude, provider, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, address, latitude, longitude, provider, time.time())
+            )
+            conn.commit()
+            self._memo[key] = (True, coordinates)
+
+    def delete_missing(self) -> int:
+        """찾지 못한 주소 기록 삭제 (다음 일괄 작업에서 다시 조회)"""
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.execute("DELETE FROM geocode_cache WHERE latitude IS NULL")
+            conn.commit()
+            self._memo = {key: value for key, value in self._memo.items() if value[1] is not None}
+            return cursor.rowcount
+
+    def stats(self) -> Dict:
+        if not self._exists():
+            return {"entries": 0, "missing": 0}
+        with self._lock:
+            total, missing = self._connection().execute(
+                "SELECT COUNT(*), SUM(CASE WHEN latitude IS NULL THEN 1 ELSE 0 END) FROM geocode_cache"
+            ).fetchone()
+        return {"entries": total, "missing": missing or 0}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._memo = {}
+
+
+class BatchGeocoder:
+    """주소 목록 일괄 지오코딩 (정규화 주소당 제공자 호출은 배포 수명 동안 한 번)"""
+
+    def __init__(self, geocoder: Geocoder, cache: GeocodeCache, delay_seconds: float = 0.0):
+        self.geocoder = geocoder
+        self.cache = cache
+        self.delay_seconds = delay_seconds
+        self.lookups = 0
+        self.failures = 0
+
+    def geocode_all(self, addresses: Iterable[str]) -> Dict[str, Optional[Coordinates]]:
+        results = {}
+        resolved = {}
+        for address in addresses:
+            key = normalize_address(address)
+            if key not in resolved:
+                cached, coordinates = self.cache.lookup(address)
+                if not cached:
+                    coordinates = self._fetch(address)
+                resolved[key] = coordinates
+            results[address] = resolved[key]
+        return results
+
+    def _fetch(self, address: str) -> Optional[Coordinates]:
+        if self.lookups and self.delay_seconds:
+            time.sleep(self.delay_seconds)
+        self.lookups += 1
+        try:
+            coordinates = self.geocoder.geocode(address)
+        except Exception:
+            # 일시적인 오류는 캐시에 기록하지 않고 다음 실행에서 다시 시도
+            self.failures += 1
+            return None
+        self.cache.set(address, coordinates, self.geocoder.name)
+        return coordinates
+
+
+# 프로세스 전역 지오코딩 캐시 (첫 조회 시 파일을 엶)
+geocode_cache = GeocodeCache(settings.GEOCODE_CACHE_DB_PATH)
@@ -0,0 +1,22 @@
+import threading
+
+import httpx
+
+from app.core.maps_config import maps_config
+
+# 지도/지오코딩 API 공용 HTTP 클라이언트 (연결 재사용, 최초 사용 시 생성)
+_http_client = None
+_http_client_lock = threading.Lock()
+
+def get_http_client() -> httpx.Client:
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                timeout=maps_config.MAPS_HTTP_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=maps_config.MAPS_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=maps_config.MAPS_HTTP_MAX_CONNECTIONS
+                )
+            )
+        return _http_client
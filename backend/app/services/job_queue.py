@@ -0,0 +1,247 @@
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.models.job import OptimizationJob
+from app.models.user import User
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+UNFINISHED = (QUEUED, RUNNING)
+
+# handler(db, user, params, report) -> 결과. report(중간 결과) 로 진행 상황을 남길 수 있다
+JobHandler = Callable[[Session, User, Dict, Callable[[Any], None]], Any]
+
+
+def to_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=lambda o: o.isoformat() if hasattr(o, "isoformat") else str(o))
+
+
+class JobQueueFull(Exception):
+    """사용자별 대기/실행 중 작업 수 초과"""
+
+
+class JobRunner:
+    """영구 작업 테이블 기반 비동기 최적화 작업 실행기
+
+    작업 상태와 결과는 앱 데이터베이스(optimization_jobs)에 저장하고, 실행은 프로세스 내
+    스레드 풀에서 한다. 같은 사용자의 같은 요청은 대기/실행 중인 동안에만 기존 작업을 돌려준다.
+    끝난 작업은 그 사이 사용자가 일정을 바꿨을 수 있으므로 다시 제출하면 새로 실행하고,
+    결과는 작업 id 로 result_ttl_seconds 동안 조회할 수 있다.
+
+    여러 프로세스(uvicorn 작업자, 복제본)가 같은 테이블을 쓰므로 실행은 조건부 UPDATE
+    (status=queued 인 경우에만 running 으로)로 한 프로세스만 가져가고, 실행 중에는
+    lease_seconds 보다 짧은 간격으로 하트비트를 남긴다. 하트비트가 lease_seconds 동안 없는
+    실행 중 작업만 실행하던 프로세스가 죽은 것으로 보고 다시 대기열에 넣는다.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], handlers: Dict[str, JobHandler],
+                 max_workers: int = 1, result_ttl_seconds: float = 86400,
+                 max_pending_per_user: int = 3, progress_interval_seconds: float = 1.0,
+                 lease_seconds: float = 60.0):
+        self.session_factory = session_factory
+        self.handlers = handlers
+        self.max_workers = max(1, max_workers)
+        self.result_ttl_seconds = result_ttl_seconds
+        self.max_pending_per_user = max_pending_per_user
+        self.progress_interval_seconds = progress_interval_seconds
+        self.lease_seconds = lease_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._recovered = False
+
+    @staticmethod
+    def dedup_key(user_id: str, kind: str, params: Dict) -> str:
+        payload = json.dumps({"user": user_id, "kind": kind, "params": params}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _dispatch(self, job_id: str) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+            executor = self._executor
+        executor.submit(self._run, job_id)
+
+    def recover(self) -> int:
+        """실행되지 않은 대기 작업과 임대가 만료된 실행 중 작업 다시 실행 (최초 한 번)
+
+        다른 프로세스가 하트비트를 남기며 실행 중인 작업은 건드리지 않는다. 대기 작업은 다른
+        프로세스도 실행하려 할 수 있지만 실행 시작이 조건부라 한 곳에서만 실행된다.
+        """
+        with self._lock:
+            if self._recovered:
+                return 0
+            self._recovered = True
+        db = self.session_factory()
+        try:
+            self.reclaim_expired(db, dispatch=False)
+            job_ids = [job_id for (job_id,) in db.query(OptimizationJob.id).filter(OptimizationJob.status == QUEUED)]
+        finally:
+            db.close()
+        for job_id in job_ids:
+            self._dispatch(job_id)
+        return len(job_ids)
+
+    def reclaim_expired(self, db: Session, now: Optional[datetime] = None, dispatch: bool = True) -> int:
+        """하트비트가 lease_seconds 동안 없는 실행 중 작업을 대기 상태로 되돌림"""
+        cutoff = (now or datetime.now()) - timedelta(seconds=self.lease_seconds)
+        expired = or_(
+            OptimizationJob.heartbeat_at < cutoff,
+            (OptimizationJob.heartbeat_at.is_(None)) & (OptimizationJob.created_at < cutoff)
+        )
+        job_ids = [job_id for (job_id,) in db.query(OptimizationJob.id).filter(
+            OptimizationJob.status == RUNNING, expired
+        )]
+        reclaimed = []
+        for job_id in job_ids:
+            # 조회와 갱신 사이에 하트비트가 들어왔으면 되돌리지 않음
+            if db.query(OptimizationJob).filter(
+                OptimizationJob.id == job_id, OptimizationJob.status == RUNNING, expired
+            ).update({"status": QUEUED, "worker_id": None, "started_at": None, "heartbeat_at": None},
+                     synchronize_session=False):
+                reclaimed.append(job_id)
+        db.commit()
+        if dispatch:
+            for job_id in reclaimed:
+                self._dispatch(job_id)
+        return len(reclaimed)
+
+    def purge_expired(self, db: Session, now: Optional[datetime] = None) -> int:
+        removed = db.query(OptimizationJob).filter(
+            OptimizationJob.expires_at.isnot(None),
+            OptimizationJob.expires_at <= (now or datetime.now())
+        ).delete(synchronize_session=False)
+        db.commit()
+        return removed
+
+    def submit(self, db: Session, user_id: str, kind: str, params: Dict) -> Tuple[OptimizationJob, bool]:
+        """(작업, 새로 만들었는지). 같은 요청이 대기/실행 중이면 그 작업"""
+        if kind not in self.handlers:
+            raise ValueError(f"알 수 없는 작업 종류입니다: {kind}")
+        self.recover()
+        self.purge_expired(db)
+        self.reclaim_expired(db)
+        key = self.dedup_key(user_id, kind, params)
+
+        with self._lock:
+            existing = db.query(OptimizationJob).populate_existing().filter(
+                OptimizationJob.dedup_key == key,
+                OptimizationJob.status.in_(UNFINISHED)
+            ).order_by(OptimizationJob.created_at.desc()).first()
+            if existing is not None:
+                return existing, False
+
+            pending = db.query(OptimizationJob).filter(
+                OptimizationJob.user_id == user_id,
+                OptimizationJob.status.in_(UNFINISHED)
+            ).count()
+            if pending >= self.max_pending_per_user:
+                raise JobQueueFull(f"대기 중인 작업이 {self.max_pending_per_user}개를 넘을 수 없습니다")
+
+            job = OptimizationJob(
+                user_id=user_id,
+                kind=kind,
+                params=to_json(params),
+                dedup_key=key,
+                status=QUEUED,
+                created_at=datetime.now()
+            )
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+        self._dispatch(job.id)
+        return job, True
+
+    def get(self, db: Session, job_id: str, user_id: str) -> Optional[OptimizationJob]:
+        """사용자의 작업 (없거나 결과 보관 기간이 지났으면 None)"""
+        self.recover()
+        # 실행 스레드가 갱신한 상태를 읽도록 세션에 남은 객체도 다시 채움
+        return db.query(OptimizationJob).populate_existing().filter(
+            OptimizationJob.id == job_id,
+            OptimizationJob.user_id == user_id,
+            or_(OptimizationJob.expires_at.is_(None), OptimizationJob.expires_at > datetime.now())
+        ).first()
+
+    def _claim(self, db: Session, job_id: str) -> bool:
+        """대기 중인 작업을 이 프로세스의 실행으로 가져옴 (다른 곳에서 먼저 가져갔으면 False)"""
+        now = datetime.now()
+        claimed = db.query(OptimizationJob).filter(
+            OptimizationJob.id == job_id, OptimizationJob.status == QUEUED
+        ).update({"status": RUNNING, "worker_id": self.worker_id, "started_at": now, "heartbeat_at": now},
+                 synchronize_session=False)
+        db.commit()
+        return bool(claimed)
+
+    def _owned(self, job_id: str):
+        return (OptimizationJob.id == job_id) & (OptimizationJob.status == RUNNING) & \
+            (OptimizationJob.worker_id == self.worker_id)
+
+    def _heartbeat(self, job_id: str, stop: threading.Event) -> None:
+        """실행이 끝날 때까지 lease_seconds / 3 마다 하트비트 기록"""
+        while not stop.wait(self.lease_seconds / 3):
+            db = self.session_factory()
+            try:
+                db.query(OptimizationJob).filter(self._owned(job_id)).update(
+                    {"heartbeat_at": datetime.now()}, synchronize_session=False)
+                db.commit()
+            except Exception:
+                db.rollback()
+            finally:
+                db.close()
+
+    def _run(self, job_id: str) -> None:
+        db = self.session_factory()
+        stop = threading.Event()
+        try:
+            if not self._claim(db, job_id):
+                return
+            threading.Thread(target=self._heartbeat, args=(job_id, stop), daemon=True,
+                             name=f"job-heartbeat-{job_id[:8]}").start()
+            job = db.query(OptimizationJob).filter(OptimizationJob.id == job_id).first()
+
+            last_saved = [0.0]
+
+            def report(progress: Any) -> None:
+                # 중간 결과 기록은 progress_interval_seconds 에 한 번으로 제한
+                now = time.monotonic()
+                if now - last_saved[0] < self.progress_interval_seconds:
+                    return
+                last_saved[0] = now
+                db.query(OptimizationJob).filter(self._owned(job_id)).update(
+                    {"progress": to_json(progress), "heartbeat_at": datetime.now()}, synchronize_session=False)
+                db.commit()
+
+            user_id, kind, params = job.user_id, job.kind, json.loads(job.params)
+            try:
+                user = db.query(User).filter(User.id == user_id).first()
+                if user is None:
+                    raise ValueError("사용자를 찾을 수 없습니다")
+                result = self.handlers[kind](db, user, params, report)
+                outcome = {"result": to_json(result), "status": SUCCEEDED}
+            except Exception as e:
+                db.rollback()
+                outcome = {"error": str(e), "status": FAILED}
+            finished_at = datetime.now()
+            # 임대가 만료되어 다른 프로세스가 다시 가져간 경우에는 결과를 덮어쓰지 않음
+            db.query(OptimizationJob).filter(self._owned(job_id)).update(dict(
+                outcome, finished_at=finished_at, heartbeat_at=finished_at,
+                expires_at=finished_at + timedelta(seconds=self.result_ttl_seconds)
+            ), synchronize_session=False)
+            db.commit()
+        finally:
+            stop.set()
+            db.close()
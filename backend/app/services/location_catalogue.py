@@ -0,0 +1,186 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+# 패키지에 포함된 기본 카탈로그 위치
+DEFAULT_CATALOGUE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "catalogue")
+
+
+class LocationCatalogue:
+    """지역구별로 나뉜 장소 카탈로그 저장소
+
+    디스크 구성:
+      index.json   - {"format_version", "version", "fields", "districts": {지역구: 샤드 파일}, "aliases": {선거구 이름: 지역구}}
+      <샤드>.json  - {"format_version", "version", "district", "rows": [[필드 순서의 값, ...], ...]}
+
+    샤드는 처음 사용할 때 읽고, 메모리에 올라온 지역구 수는 LRU 로 max_resident 개까지만 유지한다.
+    ScheduleOptimizer 가 쓰던 dict 와 같은 방식(get, [], in)으로 조회할 수 있다.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, directory: Optional[str] = None, max_resident: int = 32):
+        self.directory = directory or DEFAULT_CATALOGUE_DIR
+        self.max_resident = max_resident
+        self._lock = threading.Lock()
+        self._resident: "OrderedDict[str, List[Dict]]" = OrderedDict()
+        # 직접 등록한 지역구 (디스크에 없으므로 축출하지 않음)
+        self._registered: Dict[str, List[Dict]] = {}
+        self._evict_listeners: List[Callable[[str], None]] = []
+        self._load_listeners: List[Callable[[str, List[Dict]], None]] = []
+        self.loads = 0
+        self.evictions = 0
+
+        index_path = os.path.join(self.directory, "index.json")
+        if os.path.exists(index_path):
+            with open(index_path, encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("format_version") != self.FORMAT_VERSION:
+                raise ValueError(f"지원하지 않는 카탈로그 형식입니다: {index.get('format_version')}")
+        else:
+            index = {"version": None, "fields": [], "districts": {}, "aliases": {}}
+        self.version = index["version"]
+        self.fields = index["fields"]
+        self._shards: Dict[str, str] = index["districts"]
+        self._aliases: Dict[str, str] = index["aliases"]
+
+    def districts(self) -> List[str]:
+        return list(self._shards.keys()) + [d for d in self._registered if d not in self._shards]
+
+    def keys(self) -> List[str]:
+        return self.districts()
+
+    @property
+    def aliases(self) -> Dict[str, str]:
+        return dict(self._aliases)
+
+    @property
+    def shard_names(self) -> Dict[str, str]:
+        return dict(self._shards)
+
+    def resolve(self, name: Optional[str]) -> Optional[str]:
+        """사용자 지역구 이름 -> 카탈로그 지역구 (예: "군포시 제1선거구 (…)" -> "군포시")"""
+        if not name:
+            return None
+        name = name.strip()
+        if name in self._registered or name in self._shards:
+            return name
+        if name in self._aliases:
+            return self._aliases[name]
+        # 색인에 없는 선거구는 앞의 시/구 이름으로 조회
+        head = name.split(" ", 1)[0]
+        if head in self._registered or head in self._shards:
+            return head
+        return None
+
+    def add_evict_listener(self, listener: Callable[[str], None]):
+        """지역구 샤드가 메모리에서 내려갈 때 호출 (파생 캐시 정리용)"""
+        self._evict_listeners.append(listener)
+
+    def add_load_listener(self, listener: Callable[[str, List[Dict]], None]):
+        """지역구 샤드를 읽거나 장소 목록을 직접 등록했을 때 호출 (파생 데이터 사전 계산용)"""
+        self._load_listeners.append(listener)
+
+    def get(self, district: Optional[str], default=None) -> Optional[List[Dict]]:
+        key = self.resolve(district)
+        if key is None:
+            return default
+        if key in self._registered:
+            return self._registered[key]
+
+        evicted = []
+        with self._lock:
+            if key in self._resident:
+                self._resident.move_to_end(key)
+                return self._resident[key]
+            locations = self._load_shard(key)
+            self._resident[key] = locations
+            self.loads += 1
+            while len(self._resident) > self.max_resident:
+                old, _ = self._resident.popitem(last=False)
+                self.evictions += 1
+                evicted.append(old)
+        for listener in self._load_listeners:
+            listener(key, locations)
+        for old in evicted:
+            for listener in self._evict_listeners:
+                listener(old)
+        return locations
+
+    def __getitem__(self, district: str) -> List[Dict]:
+        locations = self.get(district)
+        if locations is None:
+            raise KeyError(district)
+        return locations
+
+    def __setitem__(self, district: str, locations: List[Dict]):
+        """디스크 샤드 없이 지역구 장소 목록 등록 (테스트, 벤치마크, 임시 데이터)"""
+        self._registered[district] = locations
+        for listener in self._evict_listeners:
+            listener(district)
+        for listener in self._load_listeners:
+            listener(district, locations)
+
+    def __contains__(self, district: str) -> bool:
+        return self.resolve(district) is not None
+
+    def resident_districts(self) -> List[str]:
+        return list(self._resident.keys())
+
+    def _load_shard(self, district: str) -> List[Dict]:
+        path = os.path.join(self.directory, self._shards[district])
+        with open(path, encoding="utf-8") as f:
+            shard = json.load(f)
+        if shard.get("format_version") != self.FORMAT_VERSION or shard.get("version") != self.version:
+            raise ValueError(f"카탈로그 샤드 버전이 색인과 다릅니다: {path}")
+        return [dict(zip(self.fields, row)) for row in shard["rows"]]
+
+    @classmethod
+    def write(cls, directory: str, catalogue: Dict[str, List[Dict]], aliases: Dict[str, str],
+              version: str,
+              fields: Iterable[str] = ("name", "address", "type", "priority", "exposure", "latitude", "longitude"),
+              shard_names: Optional[Dict[str, str]] = None):
+        """지역구별 샤드와 색인 파일 생성"""
+        fields = list(fields)
+        shard_names = shard_names or {}
+        os.makedirs(directory, exist_ok=True)
+        districts = {}
+        for district, locations in catalogue.items():
+            filename = shard_names.get(district, f"{district}.json")
+            shard = {
+                "format_version": cls.FORMAT_VERSION,
+                "version": version,
+                "district": district,
+                "rows": [[loc.get(field) for field in fields] for loc in locations],
+            }
+            _write_json(os.path.join(directory, filename), shard)
+            districts[district] = filename
+
+        unknown = sorted(set(aliases.values()) - set(districts))
+        if unknown:
+            raise ValueError(f"별칭이 카탈로그에 없는 지역구를 가리킵니다: {unknown}")
+        _write_json(os.path.join(directory, "index.json"), {
+            "format_version": cls.FORMAT_VERSION,
+            "version": version,
+            "fields": fields,
+            "districts": districts,
+            "aliases": aliases,
+        })
+
+
+def _write_json(path: str, data: Dict):
+    # 한 줄에 한 장소가 오도록 행 단위로 기록 (diff 검토 용이)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        if "rows" in data:
+            header = {k: v for k, v in data.items() if k != "rows"}
+            f.write(json.dumps(header, ensure_ascii=False)[:-1])
+            f.write(', "rows": [\n')
+            f.write(",\n".join(json.dumps(row, ensure_ascii=False) for row in data["rows"]))
+            f.write("\n]}\n")
+        else:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+    os.replace(tmp_path, path)
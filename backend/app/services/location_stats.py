@@ -0,0 +1,79 @@
+import hashlib
+import json
+from collections import Counter
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# 유형별 노출도 백분위
+EXPOSURE_PERCENTILES = (50, 90)
+# 권역 집계에서 중점 장소로 보는 우선순위
+HIGH_PRIORITY = 4
+# 주소 앞부분의 행정구역 단위 (권역 이름에서 제외)
+_ADMINISTRATIVE_SUFFIXES = ("도", "시", "군", "구")
+
+
+def location_zone(location: Dict) -> str:
+    """장소 권역: 카탈로그에 zone 필드가 있으면 그 값, 없으면 주소의 첫 도로명/동 이름
+
+    예: "경기도 군포시 청백리길 6" -> "청백리길"
+    """
+    if location.get("zone"):
+        return location["zone"]
+    for part in (location.get("address") or "").split():
+        if not part.endswith(_ADMINISTRATIVE_SUFFIXES):
+            return part
+    return "기타"
+
+
+def summarize_locations(locations: List[Dict]) -> Dict:
+    """지역구 장소 목록의 통계 (총계, 유형별 노출도 백분위, 우선순위 분포, 권역별 합계)"""
+    exposures = np.array([loc["exposure"] for loc in locations], dtype=float)
+    types = np.array([loc["type"] for loc in locations])
+
+    by_type = {}
+    for loc_type in sorted(set(types.tolist())):
+        values = exposures[types == loc_type]
+        entry = {"count": int(values.size), "total_exposure": int(values.sum())}
+        for q, value in zip(EXPOSURE_PERCENTILES, np.percentile(values, EXPOSURE_PERCENTILES)):
+            entry[f"exposure_p{q}"] = round(float(value), 1)
+        by_type[loc_type] = entry
+
+    by_zone: Dict[str, Dict[str, int]] = {}
+    for loc in locations:
+        zone = by_zone.setdefault(location_zone(loc), {"count": 0, "total_exposure": 0, "high_priority": 0})
+        zone["count"] += 1
+        zone["total_exposure"] += loc["exposure"]
+        zone["high_priority"] += int(loc["priority"] >= HIGH_PRIORITY)
+
+    histogram = Counter(loc["priority"] for loc in locations)
+    return {
+        "total_locations": len(locations),
+        "total_exposure": int(exposures.sum()),
+        "by_type": by_type,
+        "by_zone": dict(sorted(by_zone.items(), key=lambda item: -item[1]["total_exposure"])),
+        "priority_histogram": {str(priority): histogram[priority] for priority in sorted(histogram)},
+    }
+
+
+class MaterializedStatistics:
+    """미리 계산한 지역구 통계와 직렬화 결과, 강한 ETag
+
+    ETag 는 카탈로그 버전, 지역구, 직렬화된 통계로 만들어 카탈로그나 집계 방식이 바뀌면 달라진다.
+    """
+
+    __slots__ = ("district", "statistics", "body", "etag")
+
+    def __init__(self, district: str, statistics: Dict, catalogue_version: Optional[str]):
+        self.district = district
+        self.statistics = statistics
+        self.body = json.dumps(statistics, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(f"{catalogue_version}\0{district}\0".encode("utf-8") + self.body)
+        self.etag = f'"{digest.hexdigest()[:32]}"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """If-None-Match 헤더가 이 통계의 ETag 를 포함하는지"""
+        if not if_none_match:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or self.etag in tags
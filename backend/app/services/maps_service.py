@@ -1,30 +1,178 @@
-import requests
-from typing import Dict, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
 from app.core.maps_config import maps_config
+from app.services.geocoding import geocode_cache
+from app.services.http_client import get_http_client
+from app.services.provider_routing import ProviderHealth, ProviderRouter, ProviderUnavailable
+from app.services.quota import BACKGROUND, INTERACTIVE, QuotaScheduler
+from app.services.single_flight import SingleFlight
+from app.services.travel_cache import travel_cache
+from app.services.travel_estimator import travel_estimator
+
+# 동시에 들어온 같은 경로 조회를 상위 호출 한 번으로 합침 (프로세스 전역)
+directions_flight = SingleFlight()
+
+# 제공자별 차단기와 응답 시간 (프로세스 전역)
+provider_health = ProviderHealth(
+    failure_threshold=maps_config.MAPS_CIRCUIT_FAILURE_THRESHOLD,
+    reset_seconds=maps_config.MAPS_CIRCUIT_RESET_SECONDS
+)
+
+# 제공자별 호출 한도 (프로세스 전역, 대화형 요청 우선)
+quota_scheduler = QuotaScheduler(
+    maps_config.MAPS_RATE_LIMITS,
+    burst_seconds=maps_config.MAPS_RATE_BURST_SECONDS,
+    background_reserve=maps_config.MAPS_BACKGROUND_RESERVE
+)
+
+# 제공자 시도를 실행하는 공용 스레드 풀 (최초 사용 시 생성)
+_routing_executor = None
+_routing_executor_lock = threading.Lock()
+
+def get_routing_executor() -> ThreadPoolExecutor:
+    global _routing_executor
+    with _routing_executor_lock:
+        if _routing_executor is None:
+            _routing_executor = ThreadPoolExecutor(
+                max_workers=maps_config.MAPS_HTTP_MAX_CONNECTIONS * 2,
+                thread_name_prefix="maps-route"
+            )
+        return _routing_executor
 
 class MapsService:
-    def __init__(self):
+    # 제공자별 행렬 API 최대 블록 크기 (출발지 수, 도착지 수)
+    # Google Distance Matrix 는 요청당 최대 25개 출발지/도착지, 100개 원소
+    MATRIX_BLOCKS = {
+        "google": (10, 10),
+        "tmap": (30, 30),
+    }
+    # T Map 행렬 API 가 지원하는 이동수단 (요청 이동수단 -> transportMode)
+    TMAP_MATRIX_MODES = {"driving": "car"}
+
+    def __init__(self, priority: str = INTERACTIVE):
+        """priority: 호출 한도 우선순위 (사용자 요청은 INTERACTIVE, 배치 작업은 BACKGROUND)"""
+        self.priority = priority
         self.google_api_key = maps_config.GOOGLE_MAPS_API_KEY
         self.naver_client_id = maps_config.NAVER_CLIENT_ID
         self.naver_client_secret = maps_config.NAVER_CLIENT_SECRET
         self.tmap_api_key = maps_config.TMAP_API_KEY
         self.default_service = maps_config.DEFAULT_MAPS_SERVICE
+        self.google_base_url = maps_config.GOOGLE_MAPS_BASE_URL.rstrip("/")
+        self.naver_base_url = maps_config.NAVER_MAPS_BASE_URL.rstrip("/")
+        self.tmap_base_url = maps_config.TMAP_BASE_URL.rstrip("/")
+        self.matrix_concurrency = maps_config.MAPS_MATRIX_CONCURRENCY
+        self.provider_chain = [p.strip() for p in maps_config.MAPS_PROVIDER_CHAIN.split(",") if p.strip()]
+        self.attempt_timeout = maps_config.MAPS_ATTEMPT_TIMEOUT_SECONDS
+        self.request_deadline = maps_config.MAPS_REQUEST_DEADLINE_SECONDS
+        self.hedge = maps_config.MAPS_HEDGE_ENABLED
+        self.hedge_delay = maps_config.MAPS_HEDGE_DELAY_MS / 1000.0
+        self.rate_wait = maps_config.MAPS_RATE_WAIT_SECONDS
+        self.fetched_elements = 0  # 행렬 API 로 조회한 원소 수
+        self.http = get_http_client()
+
+    def providers(self) -> List[str]:
+        """경로 조회 제공자 체인 (기본 서비스 우선, 키가 설정된 제공자만)"""
+        configured = {
+            "google": bool(self.google_api_key),
+            "naver": bool(self.naver_client_id),
+            "tmap": bool(self.tmap_api_key),
+        }
+        chain = []
+        for name in [self.default_service] + self.provider_chain:
+            if configured.get(name) and name not in chain:
+                chain.append(name)
+        return chain
+
+    def _directions_fetch(self, provider: str):
+        return {
+            "google": self._get_google_directions,
+            "naver": self._get_naver_directions,
+            "tmap": self._get_tmap_directions,
+        }[provider]
+
+    def _router(self) -> ProviderRouter:
+        return ProviderRouter(
+            provider_health,
+            get_routing_executor(),
+            attempt_timeout=self.attempt_timeout,
+            deadline=self.request_deadline,
+            hedge=self.hedge,
+            hedge_delay=self.hedge_delay
+        )
+
+    def _cached_directions(self, providers: List[str], origin: str, destination: str, mode: str) -> Optional[Dict]:
+        for provider in providers:
+            cached = travel_cache.get(origin, destination, mode, provider)
+            if cached is not None:
+                return cached
+        return None
 
     def get_directions(self, origin: str, destination: str, mode: str = "transit") -> Dict:
-        """주소 간 경로 정보 조회"""
-        if self.default_service == "google" and self.google_api_key:
-            return self._get_google_directions(origin, destination, mode)
-        elif self.default_service == "naver" and self.naver_client_id:
-            return self._get_naver_directions(origin, destination, mode)
-        elif self.default_service == "tmap" and self.tmap_api_key:
-            return self._get_tmap_directions(origin, destination, mode)
-        else:
+        """주소 간 경로 정보 조회 (유료 API 응답은 이동 정보 캐시에 저장)
+
+        제공자 체인을 차단기, 시도 제한 시간, 예비 요청과 함께 호출하고 모두 실패하면
+        좌표 기반 추정값을 쓴다. 캐시에 없는 쌍을 여러 요청이 동시에 조회하면 상위 호출은
+        한 번만 하고 결과를 나눠 받는다.
+        """
+        providers = self.providers()
+        if not providers:
             return self._get_fallback_directions(origin, destination, mode)
+        
+        cached = self._cached_directions(providers, origin, destination, mode)
+        if cached is not None:
+            return cached
+        
+        key = travel_cache.make_key(origin, destination, mode, ",".join(providers))
+        return dict(directions_flight.do(key, lambda: self._fetch_directions(providers, origin, destination, mode)))
+
+    async def get_directions_async(self, origin: str, destination: str, mode: str = "transit") -> Dict:
+        """get_directions 의 asyncio 버전 (상위 호출은 실행기 스레드에서, 진행 중 조회는 공유)"""
+        providers = self.providers()
+        if not providers:
+            return self._get_fallback_directions(origin, destination, mode)
+        
+        cached = self._cached_directions(providers, origin, destination, mode)
+        if cached is not None:
+            return cached
+        
+        key = travel_cache.make_key(origin, destination, mode, ",".join(providers))
+        return dict(await directions_flight.do_async(key, lambda: self._fetch_directions(providers, origin, destination, mode)))
+
+    def _fetch_directions(self, providers: List[str], origin: str, destination: str, mode: str) -> Dict:
+        # 앞선 조회가 캐시를 채운 직후 들어온 경우 다시 호출하지 않음
+        cached = self._cached_directions(providers, origin, destination, mode)
+        if cached is not None:
+            return cached
+        
+        fetchers = {
+            provider: (lambda provider=provider: self._attempt_provider(provider, origin, destination, mode))
+            for provider in providers
+        }
+        routed = self._router().call(fetchers)
+        if routed is None:
+            return self._get_fallback_directions(origin, destination, mode)
+        return routed[1]
+
+    def _attempt_provider(self, provider: str, origin: str, destination: str, mode: str) -> Optional[Dict]:
+        """제공자 한 곳 조회. 실패하면 None (대체값은 캐시하지 않음)
+
+        제한 시간이 지나 버려진 시도도 성공하면 캐시에 남아 다음 조회에 쓰인다.
+        """
+        self._acquire_quota(provider, 1)
+        result = self._directions_fetch(provider)(origin, destination, mode)
+        if result.get("service") != provider:
+            return None
+        travel_cache.set(origin, destination, mode, provider, result)
+        return result
 
     def _get_google_directions(self, origin: str, destination: str, mode: str) -> Dict:
         """Google Maps Directions API 사용"""
         try:
-            url = "https://maps.googleapis.com/maps/api/directions/json"
+            url = f"{self.google_base_url}/maps/api/directions/json"
             params = {
                 "origin": origin,
                 "destination": destination,
@@ -32,7 +180,7 @@ class MapsService:
                 "key": self.google_api_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=self.request_deadline)
             data = response.json()
             
             if data["status"] == "OK" and data["routes"]:
@@ -49,10 +197,21 @@ class MapsService:
         
         return self._get_fallback_directions(origin, destination, mode)
 
+    def _cached_coordinates(self, provider: str, origin: str, destination: str) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+        """좌표로 조회하는 제공자용 출발지/도착지 좌표 (오프라인 지오코딩 캐시에서만 조회)
+
+        좌표가 없으면 제공자 장애가 아니므로 ProviderUnavailable 로 건너뛴다 (차단기에 실패로 남지 않음).
+        """
+        start = geocode_cache.get(origin)
+        end = geocode_cache.get(destination)
+        if start is None or end is None:
+            raise ProviderUnavailable(f"{provider} 조회에 필요한 좌표 없음")
+        return start, end
+
     def _get_naver_directions(self, origin: str, destination: str, mode: str) -> Dict:
         """Naver Maps API 사용"""
         try:
-            url = "https://naveropenapi.apigw.ntruss.com/map-direction/v1/driving"
+            url = f"{self.naver_base_url}/map-direction/v1/driving"
             headers = {
                 "X-NCP-APIGW-API-KEY-ID": self.naver_client_id,
                 "X-NCP-APIGW-API-KEY": self.naver_client_secret
@@ -63,7 +222,7 @@ class MapsService:
                 "option": "trafast"  # 최단 경로
             }
             
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            response = self.http.get(url, headers=headers, params=params, timeout=self.request_deadline)
             data = response.json()
             
             if data["code"] == 0 and data["route"]["trafast"]:
@@ -81,23 +240,24 @@ class MapsService:
         return self._get_fallback_directions(origin, destination, mode)
 
     def _get_tmap_directions(self, origin: str, destination: str, mode: str) -> Dict:
-        """T Map API 사용"""
+        """T Map API 사용 (좌표는 오프라인 지오코딩 캐시에서만 조회)"""
+        start, end = self._cached_coordinates("tmap", origin, destination)
         try:
-            url = "https://apis.openapi.sk.com/tmap/routes"
+            url = f"{self.tmap_base_url}/tmap/routes"
             headers = {
                 "appKey": self.tmap_api_key
             }
             params = {
-                "startX": "0",  # 실제 구현에서는 주소를 좌표로 변환
-                "startY": "0",
-                "endX": "0",
-                "endY": "0",
+                "startX": str(start[1]),
+                "startY": str(start[0]),
+                "endX": str(end[1]),
+                "endY": str(end[0]),
                 "reqCoordType": "WGS84GEO",
                 "resCoordType": "WGS84GEO",
                 "searchOption": "0"
             }
             
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            response = self.http.get(url, headers=headers, params=params, timeout=self.request_deadline)
             data = response.json()
             
             if data["status"] == 0 and data["features"]:
@@ -114,8 +274,190 @@ class MapsService:
         
         return self._get_fallback_directions(origin, destination, mode)
 
+    def _acquire_quota(self, provider: str, cost: int) -> None:
+        """호출 한도 토큰 확보. 대화형 요청은 rate_wait 초까지, 백그라운드는 얻을 때까지 대기"""
+        timeout = None if self.priority == BACKGROUND else self.rate_wait
+        if not quota_scheduler.acquire(provider, cost, self.priority, timeout=timeout):
+            raise ProviderUnavailable(f"{provider} 호출 한도 초과")
+
+    def get_distance_matrix(self, origins: List[str], destinations: List[str],
+                            mode: str = "transit") -> Tuple[np.ndarray, np.ndarray]:
+        """출발지 x 도착지 (이동시간 분, 거리 km) 행렬
+
+        제공자의 행렬 API 를 최대 블록 크기로 나눠 공용 연결 풀에서 동시에 조회한다.
+        이미 캐시된 블록은 조회하지 않고, 조회된 쌍은 이동 정보 캐시에 저장해 단일 경로 조회도
+        재사용한다. 행렬 API 가 없는 제공자(naver)나 행렬 API 가 지원하지 않는 이동수단은
+        쌍마다 경로 조회로 채운다. 실패한 칸은 대체값(좌표 기반 추정 또는 기본값)으로 채운다.
+        """
+        provider = self.default_service
+        if provider == "google" and self.google_api_key:
+            fetch_block = self._fetch_google_matrix_block
+        elif provider == "tmap" and self.tmap_api_key and mode in self.TMAP_MATRIX_MODES:
+            fetch_block = self._fetch_tmap_matrix_block
+        else:
+            fetch_block = None
+        
+        durations = np.full((len(origins), len(destinations)), np.nan)
+        distances = np.full((len(origins), len(destinations)), np.nan)
+        
+        blocks = []
+        if fetch_block is not None:
+            block_origins, block_destinations = self.MATRIX_BLOCKS[provider]
+            for i0 in range(0, len(origins), block_origins):
+                for j0 in range(0, len(destinations), block_destinations):
+                    rows = range(i0, min(i0 + block_origins, len(origins)))
+                    cols = range(j0, min(j0 + block_destinations, len(destinations)))
+                    if not self._fill_from_cache(origins, destinations, rows, cols, mode, provider, durations, distances):
+                        blocks.append((rows, cols))
+        else:
+            self._fill_by_directions(origins, destinations, mode, durations, distances)
+        
+        # 한 블록의 원소 수가 한 번에 얻을 수 있는 호출 한도보다 크면 더 작게 나눔
+        budget = quota_scheduler.max_cost(provider, self.priority) if blocks else None
+        if budget is not None:
+            blocks = [piece for rows, cols in blocks for piece in self._split_block(rows, cols, budget)]
+        
+        def run(block):
+            rows, cols = block
+            try:
+                self._acquire_quota(provider, len(rows) * len(cols))
+                return fetch_block([origins[i] for i in rows], [destinations[j] for j in cols], mode)
+            except Exception:
+                return None
+        
+        if blocks:
+            with ThreadPoolExecutor(max_workers=max(1, self.matrix_concurrency)) as pool:
+                for (rows, cols), elements in zip(blocks, pool.map(run, blocks)):
+                    if elements is not None:
+                        self.fetched_elements += len(rows) * len(cols)
+                    for (bi, bj), (duration, distance) in (elements or {}).items():
+                        i, j = rows[bi], cols[bj]
+                        if origins[i] == destinations[j]:
+                            continue
+                        durations[i, j], distances[i, j] = duration, distance
+                        travel_cache.set(origins[i], destinations[j], mode, provider, {
+                            "duration": int(duration),
+                            "distance": distance,
+                            "route": f"{origins[i]} → {destinations[j]}",
+                            "transport_mode": mode,
+                            "service": provider
+                        })
+        
+        # 조회하지 못한 칸 (같은 주소는 0)
+        for i, j in zip(*np.nonzero(np.isnan(durations))):
+            if origins[i] == destinations[j]:
+                durations[i, j] = distances[i, j] = 0.0
+                continue
+            fallback = self._get_fallback_directions(origins[i], destinations[j], mode)
+            durations[i, j], distances[i, j] = fallback["duration"], fallback["distance"]
+        return durations, distances
+
+    @staticmethod
+    def _split_block(rows: range, cols: range, budget: float) -> List[Tuple[range, range]]:
+        """rows x cols 블록을 원소 수가 budget 이하인 조각들로 나누기 (최소 1x1)"""
+        budget = max(1, int(budget))
+        if len(rows) * len(cols) <= budget:
+            return [(rows, cols)]
+        if len(cols) <= budget:
+            step = budget // len(cols)
+            return [(rows[i:i + step], cols) for i in range(0, len(rows), step)]
+        return [(rows[i:i + 1], cols[j:j + budget]) for i in range(len(rows)) for j in range(0, len(cols), budget)]
+
+    def _fill_by_directions(self, origins, destinations, mode, durations, distances) -> None:
+        """쌍마다 get_directions 로 채우기 (이동 정보 캐시, 호출 한도, 차단기, 대체값이 그대로 적용)"""
+        providers = self.providers()
+        if not providers:
+            return
+        pairs = [(i, j) for i in range(len(origins)) for j in range(len(destinations)) if origins[i] != destinations[j]]
+        
+        def run(pair):
+            i, j = pair
+            cached = self._cached_directions(providers, origins[i], destinations[j], mode) is not None
+            return cached, self.get_directions(origins[i], destinations[j], mode)
+        
+        with ThreadPoolExecutor(max_workers=max(1, self.matrix_concurrency)) as pool:
+            for (i, j), (cached, info) in zip(pairs, pool.map(run, pairs)):
+                durations[i, j], distances[i, j] = info["duration"], info["distance"]
+                if not cached and info.get("service") in providers:
+                    self.fetched_elements += 1
+
+    def _fill_from_cache(self, origins, destinations, rows, cols, mode, provider, durations, distances) -> bool:
+        """블록의 모든 쌍이 캐시에 있으면 채우고 True"""
+        cached = {}
+        for i in rows:
+            for j in cols:
+                if origins[i] == destinations[j]:
+                    continue
+                info = travel_cache.get(origins[i], destinations[j], mode, provider)
+                if info is None:
+                    return False
+                cached[(i, j)] = info
+        for (i, j), info in cached.items():
+            durations[i, j], distances[i, j] = info["duration"], info["distance"]
+        return True
+
+    def _fetch_google_matrix_block(self, origins: List[str], destinations: List[str],
+                                   mode: str) -> Dict[Tuple[int, int], Tuple[float, float]]:
+        """Google Distance Matrix API 블록 조회 -> {(블록 행, 블록 열): (분, km)}"""
+        response = self.http.get(
+            f"{self.google_base_url}/maps/api/distancematrix/json",
+            params={
+                "origins": "|".join(origins),
+                "destinations": "|".join(destinations),
+                "mode": mode,
+                "key": self.google_api_key
+            }
+        )
+        data = response.json()
+        if data.get("status") != "OK":
+            return {}
+        elements = {}
+        for i, row in enumerate(data.get("rows", [])):
+            for j, element in enumerate(row.get("elements", [])):
+                if element.get("status") == "OK":
+                    elements[(i, j)] = (element["duration"]["value"] // 60, element["distance"]["value"] / 1000)
+        return elements
+
+    def _fetch_tmap_matrix_block(self, origins: List[str], destinations: List[str],
+                                 mode: str) -> Dict[Tuple[int, int], Tuple[float, float]]:
+        """T Map 경로 행렬 API 블록 조회 (좌표는 지오코딩 캐시에서만 조회, mode 는 TMAP_MATRIX_MODES 중 하나)"""
+        origin_coords = [geocode_cache.get(address) for address in origins]
+        destination_coords = [geocode_cache.get(address) for address in destinations]
+        origin_index = [i for i, c in enumerate(origin_coords) if c is not None]
+        destination_index = [j for j, c in enumerate(destination_coords) if c is not None]
+        if not origin_index or not destination_index:
+            return {}
+        
+        response = self.http.post(
+            f"{self.tmap_base_url}/tmap/matrix",
+            params={"version": 1},
+            headers={"appKey": self.tmap_api_key},
+            json={
+                "origins": [{"lat": str(origin_coords[i][0]), "lon": str(origin_coords[i][1])} for i in origin_index],
+                "destinations": [
+                    {"lat": str(destination_coords[j][0]), "lon": str(destination_coords[j][1])}
+                    for j in destination_index
+                ],
+                "transportMode": self.TMAP_MATRIX_MODES[mode]
+            }
+        )
+        data = response.json()
+        elements = {}
+        for route in data.get("matrixRoutes", []):
+            i = origin_index[int(route["originIndex"])]
+            j = destination_index[int(route["destinationIndex"])]
+            elements[(i, j)] = (int(route["duration"]) // 60, route["distance"] / 1000)
+        return elements
+
     def _get_fallback_directions(self, origin: str, destination: str, mode: str) -> Dict:
-        """API 호출 실패 시 기본값 반환"""
+        """API 호출 실패 시 좌표 기반 추정값 (좌표가 없으면 기본값) 반환"""
+        start = geocode_cache.get(origin)
+        end = geocode_cache.get(destination)
+        if start is not None and end is not None:
+            estimate = travel_estimator.estimate(start, end, mode)
+            estimate["route"] = f"{origin} → {destination}"
+            return estimate
+        
         return {
             "duration": 20,
             "distance": 3.0,
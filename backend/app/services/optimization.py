@@ -1,110 +1,82 @@
-import heapq
+import multiprocessing
+import os
+import threading
+import time
 import requests
 import json
-from typing import List, Dict, Tuple, Optional
+import numpy as np
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Dict, Tuple, Optional
 from datetime import datetime, timedelta
+from app.core.config import settings
 from app.models.schedule import Schedule, Location
 from app.models.user import User
-from functools import lru_cache
+from app.services.assignment import linear_sum_assignment
+from app.services.location_catalogue import LocationCatalogue
+from app.services.location_stats import MaterializedStatistics, summarize_locations
+from app.services.schedule_repair import RepairVisit, ScheduleRepairer
+from app.services.spatial_index import SpatialIndex
+from app.services.route_solver import RoutingProblem, OrienteeringSolver, TeamSolver, solve_routing_problem
+from app.services.geocoding import geocode_cache
+from app.services.travel_cache import travel_cache
+from app.services.travel_estimator import travel_estimator
+from app.services.travel_matrix import TravelMatrix
+
+# 다일 계획에서 날짜별 경로 탐색을 병렬 실행하는 프로세스 풀 (최초 사용 시 생성)
+# 스레드가 많은 서버 프로세스를 fork 하면 다른 스레드가 쥔 잠금 때문에 멈출 수 있어 spawn 으로 시작한다
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+def campaign_workers() -> int:
+    """다일 계획 프로세스 수 (0 이면 동시 최적화 작업 수 SOLVER_MAX_WORKERS, CPU 코어 수 이하)"""
+    return settings.CAMPAIGN_MAX_WORKERS or max(1, min(settings.SOLVER_MAX_WORKERS, os.cpu_count() or 1))
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=campaign_workers(),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_pool
+
+def _discard_process_pool(pool: ProcessPoolExecutor) -> None:
+    """작업 프로세스가 죽어 망가진 풀 버리기 (다음 호출에서 새로 생성)"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is pool:
+            _process_pool = None
+    pool.shutdown(wait=False)
+
+# 장소 쌍마다 이동 정보를 조회해야 하는 이동 행렬을 요청 밖에서 만드는 스레드 (최초 사용 시 생성)
+_matrix_executor = None
+_matrix_executor_lock = threading.Lock()
+
+def _get_matrix_executor() -> ThreadPoolExecutor:
+    global _matrix_executor
+    with _matrix_executor_lock:
+        if _matrix_executor is None:
+            _matrix_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="travel-matrix")
+        return _matrix_executor
 
 class ScheduleOptimizer:
-    def __init__(self):
-        # 하드코딩된 장소 데이터 (각 지역구별 40개씩) - 도로명 주소 사용
-        self.locations = {
-            "군포시": [
-                {"name": "군포시청", "address": "경기도 군포시 청백리길 6", "type": "government", "priority": 5, "exposure": 80},
-                {"name": "군포1동 행정복지센터", "address": "경기도 군포시 군포로 520", "type": "government", "priority": 4, "exposure": 60},
-                {"name": "산본1동 행정복지센터", "address": "경기도 군포시 고산로 724번길 13", "type": "government", "priority": 4, "exposure": 60},
-                {"name": "금정동 행정복지센터", "address": "경기도 군포시 금정로 81", "type": "government", "priority": 4, "exposure": 60},
-                {"name": "군포시의회", "address": "경기도 군포시 청백리길 6", "type": "government", "priority": 4, "exposure": 50},
-                {"name": "군포경찰서", "address": "경기도 군포시 번영로 504", "type": "government", "priority": 3, "exposure": 40},
-                {"name": "군포소방서", "address": "경기도 군포시 부곡로 163", "type": "government", "priority": 3, "exposure": 40},
-                {"name": "군포시보건소", "address": "경기도 군포시 공단로 201", "type": "government", "priority": 4, "exposure": 70},
-                {"name": "군포시노인복지관", "address": "경기도 군포시 당동 981", "type": "government", "priority": 3, "exposure": 65},
-                {"name": "군포시청소년수련관", "address": "경기도 군포시 고산로 243", "type": "government", "priority": 3, "exposure": 45},
-
-                {"name": "군포역", "address": "경기도 군포시 공단로 137", "type": "transport", "priority": 3, "exposure": 120},
-                {"name": "산본역", "address": "경기도 군포시 번영로 485", "type": "transport", "priority": 3, "exposure": 110},
-                {"name": "금정역", "address": "경기도 군포시 군포로 474", "type": "transport", "priority": 3, "exposure": 100},
-                {"name": "군포시외버스터미널", "address": "경기도 군포시 산본로 7", "type": "transport", "priority": 3, "exposure": 90},
-                {"name": "산본버스정류장", "address": "경기도 군포시 산본로 324", "type": "transport", "priority": 2, "exposure": 80},
-                {"name": "금정버스정류장", "address": "경기도 군포시 금정로 81", "type": "transport", "priority": 2, "exposure": 75},
-                {"name": "군포택시정류장", "address": "경기도 군포시 군포로", "type": "transport", "priority": 2, "exposure": 60},
-                {"name": "산본택시정류장", "address": "경기도 군포시 산본로 324", "type": "transport", "priority": 2, "exposure": 55},
-
-                {"name": "군포시민운동장", "address": "경기도 군포시 산본로 265", "type": "public", "priority": 4, "exposure": 150},
-                {"name": "군포시 중앙도서관", "address": "경기도 군포시 수리산로 79", "type": "public", "priority": 3, "exposure": 80},
-                {"name": "산본도서관", "address": "경기도 군포시 산본로 307", "type": "public", "priority": 3, "exposure": 75},
-                {"name": "군포문화예술회관", "address": "경기도 군포시 고산로 599", "type": "public", "priority": 4, "exposure": 90},
-                {"name": "군포시민공원", "address": "경기도 군포시 고산로 599", "type": "public", "priority": 3, "exposure": 100},
-                {"name": "군포시청소년수련관", "address": "경기도 군포시 고산로 243", "type": "public", "priority": 3, "exposure": 85},
-
-                {"name": "군포시장", "address": "경기도 군포시 군포로 730", "type": "commercial", "priority": 4, "exposure": 200},
-                {"name": "산본시장", "address": "경기도 군포시 고산로 712번길 28", "type": "commercial", "priority": 4, "exposure": 180},
-                {"name": "금정시장", "address": "경기도 군포시 금정로 35", "type": "commercial", "priority": 4, "exposure": 160},
-                {"name": "롯데마트 군포점", "address": "경기도 군포시 엘에스로 34", "type": "commercial", "priority": 3, "exposure": 150},
-                {"name": "이마트 산본점", "address": "경기도 군포시 산본로 323", "type": "commercial", "priority": 3, "exposure": 140},
-                {"name": "홈플러스 군포점", "address": "경기도 군포시 엘에스로 43", "type": "commercial", "priority": 3, "exposure": 130},
-                {"name": "군포상가", "address": "군포시 산본동 일대", "type": "commercial", "priority": 3, "exposure": 120},
-                {"name": "산본상가", "address": "군포시 산본동 일대", "type": "commercial", "priority": 3, "exposure": 110},
-
-                {"name": "군포초등학교", "address": "경기도 군포시 군포로 453", "type": "education", "priority": 3, "exposure": 60},
-                {"name": "산본초등학교", "address": "경기도 군포시 산본로 307", "type": "education", "priority": 3, "exposure": 55},
-                {"name": "금정초등학교", "address": "경기도 군포시 금정로 21", "type": "education", "priority": 3, "exposure": 50},
-                {"name": "군포중학교", "address": "경기도 군포시 군포로 520", "type": "education", "priority": 3, "exposure": 65},
-                {"name": "산본중학교", "address": "경기도 군포시 산본로 309", "type": "education", "priority": 3, "exposure": 60},
-                {"name": "군포고등학교", "address": "경기도 군포시 산본로 348", "type": "education", "priority": 3, "exposure": 70}
-            ],
-
-            "서대문구": [
-                {"name": "서대문구청", "address": "서울특별시 서대문구 연희로 248", "type": "government", "priority": 5, "exposure": 80},
-                {"name": "천연동 주민센터", "address": "서울특별시 서대문구 성산로 694", "type": "government", "priority": 4, "exposure": 60},
-                {"name": "북아현동 주민센터", "address": "서울특별시 서대문구 북아현로 11길 36", "type": "government", "priority": 4, "exposure": 60},
-                {"name": "충현동 주민센터", "address": "서울특별시 서대문구 충정로3가 18-57", "type": "government", "priority": 4, "exposure": 60},
-                {"name": "신촌동 주민센터", "address": "서울특별시 서대문구 신촌로 217", "type": "government", "priority": 4, "exposure": 60},
-                {"name": "서대문구의회", "address": "서울특별시 서대문구 연희로 248", "type": "government", "priority": 4, "exposure": 50},
-                {"name": "서대문경찰서", "address": "서울특별시 서대문구 통일로 113", "type": "government", "priority": 3, "exposure": 40},
-                {"name": "서대문소방서", "address": "서울특별시 서대문구 통일로 247", "type": "government", "priority": 3, "exposure": 40},
-                {"name": "서대문구보건소", "address": "서울특별시 서대문구 연희로 248 1층", "type": "government", "priority": 4, "exposure": 70},
-                {"name": "서대문노인종합복지관", "address": "서울특별시 서대문구 통일로 367", "type": "government", "priority": 3, "exposure": 65},
-
-                {"name": "신촌역", "address": "서울특별시 마포구 신촌로 74", "type": "transport", "priority": 3, "exposure": 150},
-                {"name": "이대역", "address": "서울특별시 서대문구 이화여대길 2", "type": "transport", "priority": 3, "exposure": 140},
-                {"name": "아현역", "address": "서울특별시 마포구 마포대로 135", "type": "transport", "priority": 3, "exposure": 130},
-                {"name": "충정로역", "address": "서울특별시 서대문구 충정로 21", "type": "transport", "priority": 3, "exposure": 120},
-                {"name": "서대문역", "address": "서울특별시 서대문구 통일로 8", "type": "transport", "priority": 3, "exposure": 110},
-                {"name": "신촌버스정류장", "address": "서울특별시 서대문구 신촌로 73", "type": "transport", "priority": 2, "exposure": 100},
-                {"name": "이대버스정류장", "address": "서울특별시 서대문구 이화여대길 2", "type": "transport", "priority": 2, "exposure": 90},
-                {"name": "아현버스정류장", "address": "서울특별시 마포구 마포대로 135", "type": "transport", "priority": 2, "exposure": 85},
-
-                {"name": "서대문구립도서관", "address": "서울특별시 서대문구 연희로 234", "type": "public", "priority": 3, "exposure": 80},
-                {"name": "신촌도서관", "address": "서울특별시 서대문구 신촌로 221", "type": "public", "priority": 3, "exposure": 75},
-                {"name": "이대도서관", "address": "서울특별시 서대문구 이화여대길 52", "type": "public", "priority": 3, "exposure": 70},
-                {"name": "서대문문화체육회관", "address": "서울특별시 서대문구 수색로 43", "type": "public", "priority": 4, "exposure": 90},
-                {"name": "서대문구민체육센터", "address": "서울특별시 서대문구 연희동", "type": "public", "priority": 4, "exposure": 85},
-                {"name": "서대문구민공원", "address": "서울특별시 서대문구 연희동 산1-4", "type": "public", "priority": 3, "exposure": 100},
-                {"name": "신촌공원", "address": "서울특별시 서대문구 신촌동", "type": "public", "priority": 3, "exposure": 95},
-                {"name": "이대공원", "address": "서울특별시 서대문구 대현동", "type": "public", "priority": 3, "exposure": 90},
-
-                {"name": "신촌상가", "address": "서울특별시 서대문구 신촌로 119 일대", "type": "commercial", "priority": 4, "exposure": 250},
-                {"name": "이대상가", "address": "서울특별시 서대문구 이화여대길 39", "type": "commercial", "priority": 4, "exposure": 220},
-                {"name": "아현상가", "address": "서울특별시 마포구 마포대로 140", "type": "commercial", "priority": 4, "exposure": 200},
-                {"name": "이마트 신촌점", "address": "서울특별시 서대문구 신촌로 94", "type": "commercial", "priority": 3, "exposure": 180},
-                {"name": "홈플러스 이대점", "address": "서울특별시 마포구 신촌로 94", "type": "commercial", "priority": 3, "exposure": 170},
-                {"name": "롯데마트 아현점", "address": "서울특별시 마포구 마포대로 195", "type": "commercial", "priority": 3, "exposure": 160},
-                {"name": "신촌시장", "address": "서울특별시 서대문구 신촌로 119 일대", "type": "commercial", "priority": 4, "exposure": 200},
-                {"name": "이대시장", "address": "서울특별시 서대문구 이화여대길 39", "type": "commercial", "priority": 4, "exposure": 180},
-
-                {"name": "연세대학교", "address": "서울특별시 서대문구 연세로 50", "type": "education", "priority": 4, "exposure": 120},
-                {"name": "이화여자대학교", "address": "서울특별시 서대문구 이화여대길 52", "type": "education", "priority": 4, "exposure": 110},
-                {"name": "신촌초등학교", "address": "서울특별시 서대문구 신촌로 163", "type": "education", "priority": 3, "exposure": 60},
-                {"name": "이대초등학교", "address": "서울특별시 서대문구 이화여대길 20", "type": "education", "priority": 3, "exposure": 55},
-                {"name": "신촌중학교", "address": "서울특별시 서대문구 신촌로 153", "type": "education", "priority": 3, "exposure": 65},
-                {"name": "이대중학교", "address": "서울특별시 서대문구 이화여대길 37", "type": "education", "priority": 3, "exposure": 60}
-            ]
-            }
+    # 제안할 시간대는 지금부터 이 시간 이후에 시작해야 함 (준비 시간 확보)
+    MIN_SLOT_LEAD_TIME = timedelta(hours=2)
+    # 좌표를 모르는 장소 쌍의 임시 이동시간(분)/거리(km) (이동 정보 조회 실패 시 기본값과 같음)
+    DEFAULT_TRAVEL_MINUTES = 20
+    DEFAULT_TRAVEL_KM = 3.0
+    
+    def __init__(self, catalogue: Optional[LocationCatalogue] = None):
+        # 장소 카탈로그 (지역구별 샤드를 처음 사용할 때 디스크에서 읽음)
+        self.locations = catalogue or LocationCatalogue(
+            settings.LOCATION_CATALOGUE_DIR or None,
+            max_resident=settings.LOCATION_CATALOGUE_MAX_RESIDENT
+        )
+        self.locations.add_evict_listener(self._forget_district)
+        self.locations.add_load_listener(self._invalidate_statistics)
 
-        
         # 활동 강도별 일정 규칙
         self.activity_rules = {
             "easy": {"max_schedules": 3, "max_distance": 5, "break_time": 60},
@@ -112,9 +84,43 @@ class ScheduleOptimizer:
             "hard": {"max_schedules": 8, "max_distance": 12, "break_time": 30}
         }
 
-    @lru_cache(maxsize=1000)
+        # 지역구별 이동시간/거리 행렬 캐시
+        self._travel_matrices = {}
+        # 백그라운드에서 만드는 중인 지역구별 이동 행렬
+        self._matrix_builds: Dict[str, Future] = {}
+        self._matrix_builds_lock = threading.Lock()
+        # 지역구별 장소 점수 배열 캐시
+        self._score_arrays = {}
+        # 지역구별 장소 이름/주소 -> 카탈로그 순번
+        self._name_indexes = {}
+        # 지역구별 장소 좌표 공간 색인
+        self._spatial_indexes = {}
+        # 지역구별 장소 통계 (처음 조회할 때 계산, 작으므로 샤드가 내려가도 유지)
+        self._location_statistics: Dict[str, MaterializedStatistics] = {}
+
+    def _forget_district(self, district: str):
+        """카탈로그에서 내려가거나 바뀐 지역구의 파생 캐시 정리"""
+        self._travel_matrices.pop(district, None)
+        self._score_arrays.pop(district, None)
+        self._name_indexes.pop(district, None)
+        self._spatial_indexes.pop(district, None)
+
     def get_travel_info(self, origin_address: str, destination_address: str, transport_mode: str = "transit") -> Dict:
-        """지도 API를 사용하여 두 주소 간의 이동 정보 조회 (캐싱 적용)"""
+        """지도 API를 사용하여 두 주소 간의 이동 정보 조회 (프로세스 전역 캐시 적용)
+
+        두 주소의 좌표가 지오코딩 캐시에 있으면 좌표 기반 추정값을 쓴다.
+        """
+        start = geocode_cache.get(origin_address)
+        end = geocode_cache.get(destination_address)
+        if start is not None and end is not None:
+            estimate = travel_estimator.estimate(start, end, transport_mode)
+            estimate["route"] = f"{origin_address} → {destination_address}"
+            return estimate
+        
+        cached = travel_cache.get(origin_address, destination_address, transport_mode, "mock")
+        if cached is not None:
+            return cached
+        
         try:
             # 실제 구현에서는 Google Maps API, Naver Maps API, 또는 T Map API 사용
             # 여기서는 예시 응답 구조만 제공
@@ -139,6 +145,8 @@ class ScheduleOptimizer:
                 "transport_mode": transport_mode
             }
             
+            # 임시 응답은 유료 응답을 보관하는 영구 계층에 쓰지 않음
+            travel_cache.set(origin_address, destination_address, transport_mode, "mock", mock_response, persist=False)
             return mock_response
             
         except Exception as e:
@@ -161,81 +169,309 @@ class ScheduleOptimizer:
         travel_info = self.get_travel_info(origin_address, destination_address)
         return travel_info.get("distance", 3.0)
 
-    def optimize_schedule(self, user: User, date: datetime, existing_schedules: List[Schedule] = None) -> List[Dict]:
-        """AI 기반 일정 최적화"""
+    def optimize_schedule(self, user: User, date: datetime, existing_schedules: List[Schedule] = None,
+                          time_budget_ms: Optional[int] = None,
+                          on_improvement: Optional[Callable[[List[Dict], float], None]] = None) -> List[Dict]:
+        """AI 기반 일정 최적화 (시간창 오리엔티어링)
+
+        시간 예산이 끝나면 그때까지 찾은 최선의 일정을 반환한다. on_improvement 가 주어지면
+        더 나은 일정을 찾을 때마다 (일정, 목적 함수 값) 으로 호출한다.
+        """
         start_time = datetime.combine(date.date(), datetime.min.time().replace(hour=9))  # 오전 9시 시작
         
         # 사용자 지역구의 장소들 가져오기
-        district_locations = self.locations.get(user.district, [])
+        district = self.locations.resolve(user.district) or user.district
+        district_locations = self.locations.get(district, [])
         if not district_locations:
             return []
         
         # 활동 강도 규칙 적용
         rules = self.activity_rules.get(user.activity_level, self.activity_rules["medium"])
         
-        # 우선순위 큐로 최적화
-        optimized_schedule = []
-        current_time = start_time
-        current_address = None
-        remaining_schedules = rules["max_schedules"]
-        total_distance = 0.0
-        
-        # 장소를 우선순위와 노출도로 정렬
-        location_queue = []
-        for loc in district_locations:
-            # 우선순위 점수 계산 (우선순위 + 노출도 + 시간대별 가중치)
-            priority_score = loc["priority"] * 10
-            exposure_score = loc["exposure"] * 0.1
-            time_weight = self._calculate_time_weight(current_time)
-            total_score = priority_score + exposure_score + time_weight
-            
-            heapq.heappush(location_queue, (-total_score, loc))
+        problem, indices = self._build_routing_problem(district, rules, start_time)
+        solver = OrienteeringSolver(
+            problem,
+            seed=settings.OPTIMIZER_SEED,
+            time_budget_ms=time_budget_ms if time_budget_ms is not None else settings.OPTIMIZER_TIME_BUDGET_MS,
+        )
+        callback = None
+        if on_improvement:
+            def callback(improved):
+                on_improvement(
+                    self._route_to_schedule(district_locations, problem, indices, improved.route, start_time),
+                    improved.score
+                )
+        solution = solver.solve(callback)
         
-        while location_queue and remaining_schedules > 0:
-            score, location = heapq.heappop(location_queue)
-            
-            # 이동 시간 계산
-            travel_time = 0
-            travel_distance = 0
-            if current_address:
-                travel_time = self.calculate_travel_time(current_address, location["address"])
-                travel_distance = self.calculate_distance(current_address, location["address"])
-                
-                # 거리 제한 확인
-                if total_distance + travel_distance > rules["max_distance"]:
-                    continue
-            
-            # 일정 시간 계산
-            schedule_duration = self._calculate_schedule_duration(location["type"])
-            
-            # 시간 제약 확인
-            if current_time + timedelta(minutes=travel_time + schedule_duration) > start_time.replace(hour=18):  # 오후 6시까지
-                continue
-            
-            # 일정 추가
-            schedule = {
+        return self._route_to_schedule(district_locations, problem, indices, solution.route, start_time)
+
+    def optimize_team(self, users: List[User], date: datetime, time_budget_ms: Optional[int] = None) -> List[List[Dict]]:
+        """같은 지역구 팀원들의 하루 일정을 함께 최적화 (장소는 팀 전체에서 한 번만 방문)"""
+        if not users:
+            return []
+        
+        district = self.locations.resolve(users[0].district) or users[0].district
+        district_locations = self.locations.get(district, [])
+        if not district_locations:
+            return [[] for _ in users]
+        
+        start_time = datetime.combine(date.date(), datetime.min.time().replace(hour=9))  # 오전 9시 시작
+        base, indices = self._build_routing_problem(district, self.activity_rules["medium"], start_time)
+        
+        # 이동 행렬은 공유하고 팀원별 활동 강도 규칙만 다르게 적용
+        problems = []
+        for user in users:
+            rules = self.activity_rules.get(user.activity_level, self.activity_rules["medium"])
+            problems.append(base.with_rules(rules["break_time"], rules["max_distance"], rules["max_schedules"]))
+        
+        solver = TeamSolver(
+            problems,
+            seed=settings.OPTIMIZER_SEED,
+            time_budget_ms=time_budget_ms if time_budget_ms is not None else settings.TEAM_TIME_BUDGET_MS,
+        )
+        solutions = solver.solve()
+        
+        return [
+            self._route_to_schedule(district_locations, problem, indices, solution.route, start_time)
+            for problem, solution in zip(problems, solutions)
+        ]
+
+    def plan_campaign(self, user: User, start_date: datetime, end_date: datetime, revisit_gap_days: int = 7,
+                      high_priority_threshold: int = 5, time_budget_ms: Optional[int] = None) -> Dict:
+        """캠페인 기간 전체 일정 계획
+
+        모든 장소는 (날짜 - 오프셋) % 재방문 간격 == 0 인 날에만 후보가 되므로 같은 장소를
+        간격 안에 다시 방문하지 않는다. 오프셋은 min(간격, 기간 일수) 개로 나누므로 간격보다
+        짧은 캠페인에서도 모든 장소가 기간 중 어느 하루의 후보가 된다. 우선순위가 높은 장소는 날짜에 돌아가며 필수 방문으로
+        배정해 기간 중 최소 1회 방문하게 한다. 이렇게 나뉜 날짜별 문제는 서로 독립이므로
+        프로세스 풀에서 병렬로 푼다.
+        """
+        district = self.locations.resolve(user.district) or user.district
+        district_locations = self.locations.get(district, [])
+        num_days = (end_date.date() - start_date.date()).days + 1
+        if not district_locations or num_days <= 0:
+            return {"days": [], "uncovered_locations": []}
+        
+        rules = self.activity_rules.get(user.activity_level, self.activity_rules["medium"])
+        gap = max(1, revisit_gap_days)
+        # 간격보다 짧은 기간은 기간 일수로 나눔 (나머지 오프셋에 배정된 장소가 후보에서 빠지지 않도록)
+        slots = min(gap, num_days)
+        static_scores = self._get_score_arrays(district)["static_scores"]
+        order = [int(i) for i in np.argsort(-static_scores, kind="stable")]
+        
+        # 오프셋은 장소 이름 단위 (같은 장소가 여러 유형으로 등록된 경우 함께 간격 적용)
+        name_offsets = {}
+        required = {day: [] for day in range(num_days)}
+        high_priority = [i for i in order if district_locations[i]["priority"] >= high_priority_threshold]
+        for k, idx in enumerate(high_priority):
+            day = k % num_days
+            required[day].append(idx)
+            name_offsets.setdefault(district_locations[idx]["name"], day % slots)
+        rank = 0
+        for idx in order:
+            name = district_locations[idx]["name"]
+            if name not in name_offsets:
+                name_offsets[name] = rank % slots
+                rank += 1
+        offsets = [name_offsets[loc["name"]] for loc in district_locations]
+        
+        # 필수 방문 장소는 다른 어떤 조합보다 점수가 높도록 가산점 부여
+        required_bonus = float(static_scores.sum()) + 1.0
+        budget = time_budget_ms if time_budget_ms is not None else settings.OPTIMIZER_TIME_BUDGET_MS
+        starts, problems, index_maps = [], [], []
+        for day in range(num_days):
+            start_time = datetime.combine(start_date.date() + timedelta(days=day), datetime.min.time().replace(hour=9))
+            eligible = [i for i in range(len(district_locations)) if (day - offsets[i]) % gap == 0]
+            bonus = {i: required_bonus for i in required[day]}
+            problem, indices = self._build_routing_problem(district, rules, start_time, eligible, bonus)
+            starts.append(start_time)
+            problems.append(problem)
+            index_maps.append(indices)
+        
+        seeds = [settings.OPTIMIZER_SEED + day for day in range(num_days)]
+        budgets = [budget] * num_days
+        routes = None
+        if num_days > 1 and campaign_workers() != 1:
+            pool = _get_process_pool()
+            try:
+                routes = list(pool.map(solve_routing_problem, problems, seeds, budgets))
+            except BrokenProcessPool:
+                # 작업 프로세스가 죽은 경우(메모리 부족 등) 풀을 새로 만들도록 버리고 이번 요청은 순차 실행
+                _discard_process_pool(pool)
+        if routes is None:
+            routes = [solve_routing_problem(p, seed, b) for p, seed, b in zip(problems, seeds, budgets)]
+        
+        days = []
+        visited = set()
+        for start_time, problem, indices, route in zip(starts, problems, index_maps, routes):
+            schedule = self._route_to_schedule(district_locations, problem, indices, route, start_time)
+            visited.update(indices[k] for k in route)
+            days.append({
+                "date": start_time.strftime("%Y-%m-%d"),
+                "schedule": schedule,
+                "total_distance": sum(s["travel_distance"] for s in schedule),
+                "estimated_exposure": sum(s["exposure"] for s in schedule)
+            })
+        
+        uncovered = [district_locations[i]["name"] for i in high_priority if i not in visited]
+        return {"days": days, "uncovered_locations": uncovered}
+
+    def _build_routing_problem(self, district: str, rules: Dict, start_time: datetime,
+                               indices: Optional[List[int]] = None,
+                               bonus: Optional[Dict[int, float]] = None) -> Tuple[RoutingProblem, List[int]]:
+        """지역구 장소(또는 그 부분집합)에 대한 하루 경로 문제 생성
+
+        indices 를 주면 해당 장소만으로 부분 행렬을 만들고, bonus 는 장소별 추가 점수이다.
+        반환되는 indices 는 문제 내 순번 -> 지역구 카탈로그 순번 매핑이다.
+        """
+        end_time = start_time.replace(hour=18)  # 오후 6시까지
+        matrix = self.get_travel_matrix(district)
+        score_arrays = self._get_score_arrays(district)
+        
+        # 장소별 점수 (우선순위 + 노출도), 시간대별 가중치는 방문 시각에 따라 반영
+        prizes = score_arrays["static_scores"]
+        service_times = score_arrays["durations"]
+        durations = matrix.durations
+        distances = matrix.distances
+        if indices is None:
+            indices = list(range(len(prizes)))
+        else:
+            selector = np.ix_(indices, indices)
+            prizes = prizes[indices]
+            service_times = service_times[indices]
+            durations = durations[selector]
+            distances = distances[selector]
+        if bonus:
+            prizes = prizes + np.array([bonus.get(i, 0.0) for i in indices])
+        
+        problem = RoutingProblem(
+            prizes=prizes,
+            service_times=service_times,
+            durations=durations,
+            distances=distances,
+            horizon=int((end_time - start_time).total_seconds() // 60),
+            break_time=rules["break_time"],
+            max_distance=rules["max_distance"],
+            max_visits=rules["max_schedules"],
+            start_minute=start_time.hour * 60,
+            hour_weights=[self._calculate_time_weight(start_time.replace(hour=h)) for h in range(24)],
+        )
+        return problem, indices
+
+    def _route_to_schedule(self, district_locations: List[Dict], problem: RoutingProblem, indices: List[int],
+                           route: List[int], start_time: datetime) -> List[Dict]:
+        """경로(문제 내 순번)를 일정 목록으로 변환"""
+        optimized_schedule = []
+        for k, offset, travel_time, travel_distance in problem.timeline(route):
+            location = district_locations[indices[k]]
+            visit_start = start_time + timedelta(minutes=offset)
+            schedule_duration = problem.service_times[k]
+            optimized_schedule.append({
                 "title": f"{location['name']} 방문",
-                "start_time": current_time + timedelta(minutes=travel_time),
-                "end_time": current_time + timedelta(minutes=travel_time + schedule_duration),
+                "start_time": visit_start,
+                "end_time": visit_start + timedelta(minutes=schedule_duration),
                 "location": location["name"],
                 "address": location["address"],
                 "location_type": location["type"],
                 "priority": location["priority"],
                 "exposure": location["exposure"],
-                "travel_time": travel_time,
+                "travel_time": int(round(travel_time)),
                 "travel_distance": travel_distance
-            }
-            
-            optimized_schedule.append(schedule)
-            
-            # 다음 일정을 위한 시간 업데이트
-            current_time = schedule["end_time"] + timedelta(minutes=rules["break_time"])
-            current_address = location["address"]
-            total_distance += travel_distance
-            remaining_schedules -= 1
-        
+            })
         return optimized_schedule
 
+    def get_travel_matrix(self, district: str) -> Optional[TravelMatrix]:
+        """지역구 이동시간/거리 행렬 조회 (저장된 파일 우선, 없으면 1회 계산)
+
+        모든 장소에 좌표가 있으면 좌표 기반 추정으로 바로 계산한다. 좌표가 없는 장소가 있어 장소
+        쌍마다 조회해야 하면 요청을 막지 않도록 백그라운드에서 만들고, 그동안은 좌표 기반 임시
+        행렬을 돌려준다 (캐시하지 않음).
+        """
+        if district in self._travel_matrices:
+            return self._travel_matrices[district]
+        
+        district_locations = self.locations.get(district, [])
+        if not district_locations:
+            return None
+        
+        fingerprint = TravelMatrix.compute_fingerprint(self._matrix_keys(district_locations))
+        path = TravelMatrix.path_for(settings.TRAVEL_MATRIX_DIR, district)
+        matrix = TravelMatrix.load(path, expected_fingerprint=fingerprint)
+        if matrix is None:
+            if not all(self._has_coordinates(loc) for loc in district_locations):
+                self._schedule_travel_matrix_build(district)
+                return self._estimated_travel_matrix(district, district_locations)
+            matrix = self.build_travel_matrix(district)
+        
+        self._travel_matrices[district] = matrix
+        return matrix
+
+    def _schedule_travel_matrix_build(self, district: str) -> Future:
+        """지역구 이동 행렬을 백그라운드에서 만들기 (이미 만드는 중이면 그 작업을 돌려줌)"""
+        with self._matrix_builds_lock:
+            future = self._matrix_builds.get(district)
+            if future is None:
+                future = _get_matrix_executor().submit(self.build_travel_matrix, district)
+                self._matrix_builds[district] = future
+                future.add_done_callback(lambda _: self._matrix_builds.pop(district, None))
+            return future
+
+    def _estimated_travel_matrix(self, district: str, district_locations: List[Dict]) -> TravelMatrix:
+        """좌표(카탈로그 또는 지오코딩 캐시) 기반 임시 이동 행렬. 좌표를 모르는 쌍은 기본값"""
+        addresses = [loc["address"] for loc in district_locations]
+        coordinates = [
+            (loc["latitude"], loc["longitude"]) if self._has_coordinates(loc) else geocode_cache.get(loc["address"])
+            for loc in district_locations
+        ]
+        known = np.array([c is not None for c in coordinates])
+        durations, distances = travel_estimator.matrices(
+            [c[0] if c is not None else 0.0 for c in coordinates],
+            [c[1] if c is not None else 0.0 for c in coordinates]
+        )
+        unknown = ~(known[:, None] & known[None, :])
+        durations[unknown] = self.DEFAULT_TRAVEL_MINUTES
+        distances[unknown] = self.DEFAULT_TRAVEL_KM
+        keys = np.array(addresses)
+        same = keys[:, None] == keys[None, :]
+        durations[same] = distances[same] = 0.0
+        return TravelMatrix(district, addresses, durations.astype(np.float32), distances.astype(np.float32))
+
+    def build_travel_matrix(self, district: str, save: bool = False, maps_service=None) -> TravelMatrix:
+        """지역구 이동 행렬 생성 (save=True 이면 TRAVEL_MATRIX_DIR 에 저장)
+
+        maps_service 가 주어지면 지도 API 행렬 조회로 채운다. 그렇지 않고 모든 장소에 좌표가
+        있으면 좌표 기반 추정으로 전체 행렬을 한 번에 계산하고, 나머지 경우 장소 쌍마다 이동 정보를 조회한다.
+        """
+        district_locations = self.locations.get(district, [])
+        addresses = [loc["address"] for loc in district_locations]
+        if maps_service is not None and district_locations:
+            durations, distances = maps_service.get_distance_matrix(addresses, addresses)
+            matrix = TravelMatrix(district, addresses, durations.astype(np.float32), distances.astype(np.float32))
+        elif district_locations and all(self._has_coordinates(loc) for loc in district_locations):
+            durations, distances = travel_estimator.matrices(
+                [loc["latitude"] for loc in district_locations],
+                [loc["longitude"] for loc in district_locations]
+            )
+            matrix = TravelMatrix(district, addresses, durations.astype(np.float32), distances.astype(np.float32))
+        else:
+            matrix = TravelMatrix.build(district, district_locations, self.get_travel_info)
+        matrix.fingerprint = TravelMatrix.compute_fingerprint(self._matrix_keys(district_locations))
+        if save:
+            matrix.save(TravelMatrix.path_for(settings.TRAVEL_MATRIX_DIR, district))
+        self._travel_matrices[district] = matrix
+        return matrix
+
+    @staticmethod
+    def _has_coordinates(location: Dict) -> bool:
+        return location.get("latitude") is not None and location.get("longitude") is not None
+
+    def _matrix_keys(self, district_locations: List[Dict]) -> List[str]:
+        """저장된 이동 행렬 지문용 키 (좌표가 바뀌어도 행렬을 다시 계산)"""
+        return [
+            f"{loc['address']}@{loc['latitude']},{loc['longitude']}" if self._has_coordinates(loc) else loc["address"]
+            for loc in district_locations
+        ]
+
     def _calculate_time_weight(self, time: datetime) -> float:
         """시간대별 가중치 계산"""
         hour = time.hour
@@ -260,46 +496,230 @@ class ScheduleOptimizer:
         }
         return duration_map.get(location_type, 30)
 
-    def reoptimize_schedule(self, user: User, current_schedule: List[Dict], 
-                           delay_minutes: int, current_location: str) -> List[Dict]:
-        """실시간 일정 재최적화"""
-        # 현재 시간과 위치를 기준으로 남은 일정 재계산
-        current_time = datetime.now() + timedelta(minutes=delay_minutes)
+    def _get_score_arrays(self, district: str) -> Dict[str, np.ndarray]:
+        """지역구 장소별 고정 점수(우선순위*10 + 노출도*0.1)와 일정 시간 배열
+
+        name_ids 는 장소 이름 번호이다 (같은 장소가 여러 유형으로 등록되면 같은 번호).
+        """
+        if district not in self._score_arrays:
+            district_locations = self.locations.get(district, [])
+            names = np.array([loc["name"] for loc in district_locations], dtype=object)
+            self._score_arrays[district] = {
+                "static_scores": np.array(
+                    [loc["priority"] * 10 + loc["exposure"] * 0.1 for loc in district_locations], dtype=float
+                ),
+                "durations": np.array(
+                    [self._calculate_schedule_duration(loc["type"]) for loc in district_locations], dtype=float
+                ),
+                "name_ids": np.unique(names, return_inverse=True)[1].astype(int),
+            }
+        return self._score_arrays[district]
+
+    def reoptimize_schedule(self, user: User, current_schedule: List, delay_minutes: int,
+                           current_location: Optional[str] = None, now: Optional[datetime] = None) -> List[Dict]:
+        """실시간 일정 재최적화 (기존 계획에서 출발하는 증분 수리)
+
+        current_schedule 은 Schedule ORM 객체 또는 일정 딕셔너리 목록이다.
+        이미 시작한 일정은 그대로 두고, 남은 일정은 지연만큼 미룬 뒤 필요한 만큼만 제외/교체한다.
+        진행 중인 일정이 있으면 그 일정이 끝나고 휴식한 뒤부터 이어간다.
+        사용자가 직접 넣은(카탈로그에 없는) 일정은 제외하지 않는다.
+        """
+        now = now or datetime.now()
+        current_time = now + timedelta(minutes=delay_minutes)
+        district = self.locations.resolve(user.district) or user.district
+        district_locations = self.locations.get(district, [])
+        rules = self.activity_rules.get(user.activity_level, self.activity_rules["medium"])
         
-        # 현재 위치 이후의 일정만 재최적화
-        remaining_schedules = [s for s in current_schedule if s["start_time"] > current_time]
+        visits = sorted((self._to_repair_visit(district, s) for s in current_schedule),
+                        key=lambda v: v.planned_start)
+        completed = [v for v in visits if v.planned_start <= now]
+        remaining = [v for v in visits if v.planned_start > now]
+        completed_items = [dict(v.item) for v in completed]
+        if not remaining:
+            return completed_items
         
-        if not remaining_schedules:
-            return current_schedule
+        in_progress = [v for v in completed if v.item["end_time"] > now]
+        if in_progress:
+            current_time = max(current_time,
+                               max(v.item["end_time"] for v in in_progress) + timedelta(minutes=rules["break_time"]))
         
-        # 재최적화된 일정 생성
-        reoptimized = self.optimize_schedule(user, current_time.date(), remaining_schedules)
+        matrix = self.get_travel_matrix(district) if district_locations else None
         
-        # 기존 완료된 일정과 새로운 최적화된 일정 결합
-        completed_schedules = [s for s in current_schedule if s["start_time"] <= current_time]
-        return completed_schedules + reoptimized
-
-    def get_location_statistics(self, district: str) -> Dict:
-        """지역구별 장소 통계"""
-        locations = self.locations.get(district, [])
-        if not locations:
-            return {}
+        def travel(origin: RepairVisit, destination: RepairVisit) -> Tuple[float, float]:
+            if matrix is not None and origin.index is not None and destination.index is not None:
+                return float(matrix.durations[origin.index, destination.index]), \
+                    float(matrix.distances[origin.index, destination.index])
+            if origin.address == destination.address:
+                return 0.0, 0.0
+            travel_info = self.get_travel_info(origin.address, destination.address)
+            return travel_info.get("duration", 20), travel_info.get("distance", 3.0)
         
-        stats = {
-            "total_locations": len(locations),
-            "by_type": {},
-            "total_exposure": sum(loc["exposure"] for loc in locations)
-        }
+        # 현재 위치: 요청에 주어진 장소, 없으면 마지막으로 시작한 일정의 장소
+        origin = completed[-1] if completed else None
+        if current_location:
+            index = self._get_name_index(district).get(current_location)
+            origin = self._catalogue_visit(district, index) if index is not None else \
+                RepairVisit(current_location, current_location, 0, 0.0)
+        
+        repairer = ScheduleRepairer(
+            travel,
+            break_time=rules["break_time"],
+            max_distance=rules["max_distance"],
+            max_visits=max(0, rules["max_schedules"] - len(completed)),
+            day_end=current_time.replace(hour=18, minute=0, second=0, microsecond=0)
+        )
+        repaired, _ = repairer.repair(
+            origin, remaining, current_time,
+            self._repair_candidates(district, origin, rules["max_distance"]),
+            exclude=[v.name for v in completed]
+        )
+        # 고정 일정만으로 제약을 넘으면 제약을 무시하고 시각만 계산
+        timeline = repairer.timeline(origin, repaired, current_time) or \
+            repairer.timeline(origin, repaired, current_time, enforce=False)
+        
+        reoptimized = []
+        for visit, (visit_start, visit_end, travel_time, travel_distance) in zip(repaired, timeline):
+            item = dict(visit.item)
+            item.update({
+                "start_time": visit_start,
+                "end_time": visit_end,
+                "travel_time": int(round(travel_time)),
+                "travel_distance": travel_distance
+            })
+            reoptimized.append(item)
+        
+        # 기존 완료된 일정과 재최적화된 일정 결합
+        return completed_items + reoptimized
+
+    def _get_name_index(self, district: str) -> Dict[str, int]:
+        """장소 이름/주소 -> 카탈로그 순번"""
+        if district not in self._name_indexes:
+            index = {}
+            for i, loc in enumerate(self.locations.get(district, [])):
+                index.setdefault(loc["name"], i)
+                index.setdefault(loc["address"], i)
+            self._name_indexes[district] = index
+        return self._name_indexes[district]
+
+    def _catalogue_visit(self, district: str, index: int, planned_start: Optional[datetime] = None,
+                         title: Optional[str] = None) -> RepairVisit:
+        location = self.locations[district][index]
+        score_arrays = self._get_score_arrays(district)
+        return RepairVisit(
+            location["name"], location["address"], int(score_arrays["durations"][index]),
+            float(score_arrays["static_scores"][index]), index=index, planned_start=planned_start,
+            item={
+                "title": title or f"{location['name']} 방문",
+                "location": location["name"],
+                "address": location["address"],
+                "location_type": location["type"],
+                "priority": location["priority"],
+                "exposure": location["exposure"],
+                "travel_time": 0,
+                "travel_distance": 0
+            }
+        )
+
+    def _to_repair_visit(self, district: str, schedule) -> RepairVisit:
+        """Schedule ORM 객체 또는 일정 딕셔너리를 재최적화 방문으로 변환"""
+        if isinstance(schedule, dict):
+            title = schedule.get("title")
+            start_time = schedule["start_time"]
+            end_time = schedule["end_time"]
+            name = schedule.get("location") or title
+            address = schedule.get("address") or name
+        else:
+            title = schedule.title
+            start_time = schedule.start_time
+            end_time = schedule.end_time
+            location = schedule.location
+            name = location.name if location is not None else title
+            address = location.address if location is not None else name
+        if isinstance(start_time, str):
+            start_time = datetime.fromisoformat(start_time)
+        if isinstance(end_time, str):
+            end_time = datetime.fromisoformat(end_time)
         
-        for loc in locations:
-            # 타입별 통계
-            loc_type = loc["type"]
-            if loc_type not in stats["by_type"]:
-                stats["by_type"][loc_type] = {"count": 0, "total_exposure": 0}
-            stats["by_type"][loc_type]["count"] += 1
-            stats["by_type"][loc_type]["total_exposure"] += loc["exposure"]
+        index = self._get_name_index(district).get(name)
+        if index is not None:
+            visit = self._catalogue_visit(district, index, planned_start=start_time, title=title)
+        else:
+            visit = RepairVisit(name, address, 0, 0.0, planned_start=start_time, pinned=True, item={
+                "title": title or f"{name} 방문",
+                "location": name,
+                "address": address,
+                "location_type": "custom",
+                "priority": 0,
+                "exposure": 0,
+                "travel_time": 0,
+                "travel_distance": 0
+            })
+        # 기존 일정의 소요 시간 유지
+        visit.duration = int((end_time - start_time).total_seconds() // 60)
+        visit.item.update({"start_time": start_time, "end_time": end_time})
+        return visit
+
+    def _repair_candidates(self, district: str, origin: Optional[RepairVisit] = None,
+                           max_distance: Optional[float] = None, limit: int = 40) -> List[RepairVisit]:
+        """재최적화 시 빈 자리에 삽입할 점수 상위 후보 장소
+
+        현재 위치의 좌표를 알면 남은 이동 거리 예산 밖(직선 거리 기준)의 장소는 점수 계산과
+        이동 정보 조회 전에 공간 색인으로 제외한다. 좌표가 없는 장소는 제외하지 않는다.
+        """
+        static_scores = self._get_score_arrays(district)["static_scores"]
+        eligible = None
+        if origin is not None and origin.index is not None and max_distance is not None:
+            location = self.locations[district][origin.index]
+            if location.get("latitude") is not None and location.get("longitude") is not None:
+                spatial_index = self.get_spatial_index(district)
+                eligible = np.ones(len(static_scores), dtype=bool)
+                eligible[spatial_index.ids] = False
+                within, _ = spatial_index.radius(location["latitude"], location["longitude"], max_distance)
+                eligible[within] = True
         
-        return stats
+        candidates = np.arange(len(static_scores)) if eligible is None else np.flatnonzero(eligible)
+        order = candidates[np.argsort(-static_scores[candidates], kind="stable")[:limit]]
+        return [self._catalogue_visit(district, int(i)) for i in order]
+
+    def get_spatial_index(self, district: str) -> SpatialIndex:
+        """지역구 장소 좌표 공간 색인 (ids 는 카탈로그 순번)"""
+        if district not in self._spatial_indexes:
+            self._spatial_indexes[district] = SpatialIndex.from_locations(self.locations.get(district, []))
+        return self._spatial_indexes[district]
+
+    def nearby_locations(self, district: str, latitude: float, longitude: float, k: int = 10,
+                         radius_km: Optional[float] = None) -> List[Dict]:
+        """좌표에서 가까운 장소 k 개 (radius_km 가 있으면 그 반경 안에서만, 좌표가 없는 장소는 제외)"""
+        district = self.locations.resolve(district) or district
+        locations = self.locations.get(district, [])
+        if not locations:
+            return []
+        ids, distances = self.get_spatial_index(district).nearest(latitude, longitude, k, max_radius_km=radius_km)
+        return [dict(locations[i], distance_km=round(float(d), 3)) for i, d in zip(ids, distances)]
+
+    def _invalidate_statistics(self, district: str, locations: List[Dict]):
+        """카탈로그에서 다시 읽거나 새로 등록한 지역구의 통계 버리기 (다음 조회에서 다시 계산)"""
+        self._location_statistics.pop(district, None)
+
+    def location_statistics(self, district: str) -> Optional[MaterializedStatistics]:
+        """지역구 통계 (처음 조회하면 샤드를 읽어 계산, 장소가 없으면 None)
+
+        샤드를 디스크에서 읽을 수 있으므로 이벤트 루프가 아닌 스레드에서 호출한다.
+        """
+        district = self.locations.resolve(district) or district
+        materialized = self._location_statistics.get(district)
+        if materialized is None:
+            locations = self.locations.get(district)
+            if not locations:
+                return None
+            materialized = MaterializedStatistics(district, summarize_locations(locations), self.locations.version)
+            self._location_statistics[district] = materialized
+        return materialized
+
+    def get_location_statistics(self, district: str) -> Dict:
+        """지역구별 장소 통계"""
+        materialized = self.location_statistics(district)
+        return materialized.statistics if materialized is not None else {}
 
     def _calculate_time_weight_extended(self, time: datetime) -> float:
         """시간대별 가중치 계산 (05:00-22:00 범위)"""
@@ -318,22 +738,27 @@ class ScheduleOptimizer:
         else:  # 오후 10시 이후
             return 0.5
 
-    def suggest_schedules_for_empty_slots(self, user: User, empty_time_slots: List, current_week_start: str = None) -> List[Dict]:
-        """빈 시간대를 기반으로 AI 일정 제안 생성"""
+    def upcoming_time_slots(self, empty_time_slots: List, now: Optional[datetime] = None) -> List:
+        """제안 대상이 되는 시간대 (지금 + MIN_SLOT_LEAD_TIME 이후 시작)"""
+        earliest = (now or datetime.now()) + self.MIN_SLOT_LEAD_TIME
+        return [
+            slot for slot in empty_time_slots
+            if datetime.fromisoformat(slot.start if hasattr(slot, "start") else slot["start"]) >= earliest
+        ]
+
+    def suggest_schedules_for_empty_slots(self, user: User, empty_time_slots: List, current_week_start: str = None,
+                                          strategy: str = "assignment", time_budget_ms: Optional[int] = None) -> List[Dict]:
+        """빈 시간대를 기반으로 AI 일정 제안 생성 (strategy: assignment | greedy)
+
+        time_budget_ms 가 주어지면 탐욕 배정 결과를 먼저 확보하고, 예산이 남은 경우에만 최적 배정으로 교체한다.
+        """
+        started = time.perf_counter()
         if not empty_time_slots:
             return []
         
-        # 사용자 지역구의 장소들 가져오기
+        # 사용자 지역구의 장소들 가져오기 (선거구 이름은 카탈로그 색인으로 지역구에 매핑)
         user_district = user.district
-        
-        # 지역구 매핑 로직
-        if "군포시" in user_district:
-            location_district = "군포시"
-        elif "서대문구" in user_district:
-            location_district = "서대문구"
-        else:
-            location_district = user_district
-            
+        location_district = self.locations.resolve(user_district) or user_district
         district_locations = self.locations.get(location_district, [])
         print(f"지역구 '{user_district}' -> 매핑된 지역구 '{location_district}'의 총 장소 수: {len(district_locations)}")
         
@@ -346,7 +771,7 @@ class ScheduleOptimizer:
         
         # 현재 시간 기준으로 과거 시간대 완전 차단
         now = datetime.now()
-        current_time_plus_buffer = now + timedelta(hours=2)  # 2시간 여유 (준비 시간 확보)
+        current_time_plus_buffer = now + self.MIN_SLOT_LEAD_TIME
         print(f"현재 시간: {now}, 최소 허용 시간: {current_time_plus_buffer}")
         
         # 과거가 아닌 시간대만 필터링 (엄격한 검증)
@@ -391,122 +816,146 @@ class ScheduleOptimizer:
         
         print(f"날짜별 그룹: {list(time_groups.keys())}")
         
-        # 3-5일에 걸쳐 균등 분산 (하루 최대 1개)
-        max_per_day = 1  # 하루 최대 1개로 제한하여 균등 분산
-        target_days = min(5, len(time_groups))  # 최대 5일까지
-        total_suggestions = 0
-        suggestions = []
-        used_locations = set()  # 중복 방지를 위한 사용된 장소 추적
+        # 3-5일에 걸쳐 균등 분산 (하루 최대 1개, 최대 5일)
+        target_days = min(5, len(time_groups))
+        max_suggestions = min(rules["max_schedules"], target_days)
+        
+        if strategy == "greedy" or time_budget_ms is not None:
+            suggestions = self._suggest_greedy(location_district, district_locations, time_groups, max_suggestions)
+        if strategy != "greedy" and (time_budget_ms is None or (time.perf_counter() - started) * 1000 < time_budget_ms):
+            suggestions = self._suggest_by_assignment(location_district, district_locations, time_groups, max_suggestions)
+        
+        print(f"🎯 총 생성된 제안 수: {len(suggestions)}")
+        if suggestions:
+            print(f"📋 첫 번째 제안: {suggestions[0]}")
+        
+        return suggestions
+
+    def _slot_bounds(self, time_slot) -> Tuple[datetime, datetime]:
+        """빈 시간대의 (시작, 종료) 시각 (Pydantic 모델 또는 딕셔너리)"""
+        if hasattr(time_slot, 'start'):
+            slot_start_str = time_slot.start
+            slot_end_str = time_slot.end
+        else:
+            slot_start_str = time_slot["start"]
+            slot_end_str = time_slot["end"]
         
-        # 날짜순으로 정렬하여 순서대로 처리
-        sorted_days = sorted(time_groups.keys())
+        # 프론트엔드에서 보낸 한국 시간을 파싱
+        return datetime.fromisoformat(slot_start_str), datetime.fromisoformat(slot_end_str)
+
+    def _build_suggestion(self, location: Dict, slot_start: datetime, schedule_duration: int, score: float) -> Dict:
+        return {
+            "title": f"{location['name']} 방문",
+            "start_time": slot_start.strftime("%Y-%m-%dT%H:%M:%S"),  # 한국 시간 형식
+            "end_time": (slot_start + timedelta(minutes=schedule_duration)).strftime("%Y-%m-%dT%H:%M:%S"),
+            "location": location["name"],
+            "address": location["address"],
+            "location_type": location["type"],
+            "priority": location["priority"],
+            "exposure": location["exposure"],
+            "travel_time": 0,
+            "travel_distance": 0,
+            "description": f"{location['type']} 시설 방문으로 유권자 접촉 기회 확대",
+            "score": score,
+            "day": slot_start.strftime("%m월 %d일 (%A)")  # 날짜+요일 표시
+        }
+
+    def _suggest_greedy(self, district: str, district_locations: List[Dict], time_groups: Dict[str, List],
+                        max_suggestions: int) -> List[Dict]:
+        """날짜순으로 하루 1개씩 가장 점수가 높은 장소를 배정"""
+        # 장소별 고정 점수(우선순위 + 노출도)와 일정 시간은 지역구별로 미리 계산
+        score_arrays = self._get_score_arrays(district)
+        static_scores = score_arrays["static_scores"]
+        durations = score_arrays["durations"]
+        name_ids = score_arrays["name_ids"]
+        # 중복 방지를 위한 사용된 장소 마스크 (이름 단위, 같은 장소의 다른 유형 행도 함께 제외)
+        used = np.zeros(len(district_locations), dtype=bool)
+        suggestions = []
         
-        for day_key in sorted_days:
-            if total_suggestions >= rules["max_schedules"] or total_suggestions >= target_days:
+        for day_key in sorted(time_groups.keys()):
+            if len(suggestions) >= max_suggestions:
                 break
-                
-            day_slots = time_groups[day_key]
-            print(f"📅 {day_key} 처리 중...")
-            day_suggestions = []
-            day_used_locations = set()
             
             # 해당 날짜의 시간대를 시간순으로 정렬
-            sorted_slots = sorted(day_slots, key=lambda x: x.start if hasattr(x, 'start') else x["start"])
-            
-            # 하루에 최대 1개까지만 제안 (균등 분산)
-            for time_slot in sorted_slots:
-                if len(day_suggestions) >= max_per_day:
-                    break
-                    
-                # Pydantic 모델 또는 딕셔너리 모두 처리
-                if hasattr(time_slot, 'start'):
-                    slot_start_str = time_slot.start
-                    slot_end_str = time_slot.end
-                else:
-                    slot_start_str = time_slot["start"]
-                    slot_end_str = time_slot["end"]
-                
-                # 프론트엔드에서 보낸 한국 시간을 파싱
-                slot_start = datetime.fromisoformat(slot_start_str)
-                slot_end = datetime.fromisoformat(slot_end_str)
+            for slot_start, slot_end in sorted(self._slot_bounds(s) for s in time_groups[day_key]):
                 slot_duration = (slot_end - slot_start).total_seconds() / 60  # 분 단위
                 
-                print(f"  시간대: {slot_start.strftime('%H:%M')} - {slot_end.strftime('%H:%M')} (지속: {slot_duration}분)")
-                
-                # 시간대별 가중치 계산 (05:00-22:00 범위)
-                time_weight = self._calculate_time_weight_extended(slot_start)
-                
-                # 장소별 점수 계산 및 우선순위 큐 생성
-                location_scores = []
-                for idx, loc in enumerate(district_locations):
-                    # 이미 사용된 장소는 제외 (다양성 확보)
-                    if loc["name"] in used_locations or loc["name"] in day_used_locations:
-                        continue
-                        
-                    # 우선순위 점수 계산 (우선순위 + 노출도 + 시간대별 가중치)
-                    priority_score = loc["priority"] * 10
-                    exposure_score = loc["exposure"] * 0.1
-                    total_score = priority_score + exposure_score + time_weight
-                    
-                    # 음수 점수로 heapq 최대 힙 구현 (가장 높은 점수가 먼저 나오도록)
-                    # idx를 추가하여 동일한 점수일 때도 비교 가능하도록 함
-                    heapq.heappush(location_scores, (-total_score, idx, loc))
-                
-                # 상위 1개 장소만 선택 (균등 분산)
-                selected_locations = []
-                for _ in range(min(1, len(location_scores))):
-                    if not location_scores:
-                        break
-                        
-                    score, idx, location = heapq.heappop(location_scores)
-                    score = -score  # 음수에서 양수로 변환
-                    
-                    # 일정 시간 계산
-                    schedule_duration = self._calculate_schedule_duration(location["type"])
-                    
-                    # 시간 제약 확인 (빈 시간대에 맞는지)
-                    if schedule_duration <= slot_duration:
-                        # 이동 시간 고려하여 실제 일정 시간 계산
-                        travel_time = 0
-                        travel_distance = 0
-                        
-                        # 일정 제안 생성
-                        suggestion = {
-                            "title": f"{location['name']} 방문",
-                            "start_time": slot_start.strftime("%Y-%m-%dT%H:%M:%S"),  # 한국 시간 형식
-                            "end_time": (slot_start + timedelta(minutes=schedule_duration)).strftime("%Y-%m-%dT%H:%M:%S"),
-                            "location": location["name"],
-                            "address": location["address"],
-                            "location_type": location["type"],
-                            "priority": location["priority"],
-                            "exposure": location["exposure"],
-                            "travel_time": travel_time,
-                            "travel_distance": travel_distance,
-                            "description": f"{location['type']} 시설 방문으로 유권자 접촉 기회 확대",
-                            "score": score,
-                            "day": slot_start.strftime("%m월 %d일 (%A)")  # 날짜+요일 표시
-                        }
-                        
-                        selected_locations.append(suggestion)
-                        print(f"    ✅ 제안 생성: {location['name']} ({slot_start.strftime('%H:%M')})")
-                        break  # 한 시간대당 1개만 제안
-                
-                # 해당 시간대의 제안 추가
-                if selected_locations:
-                    best_suggestion = selected_locations[0]
-                    day_suggestions.append(best_suggestion)
-                    day_used_locations.add(best_suggestion["location"])  # 해당 날짜에서 사용된 장소 기록
-                    used_locations.add(best_suggestion["location"])  # 전체에서 사용된 장소 기록
-            
-            # 해당 날짜의 제안들을 suggestions에 추가
-            suggestions.extend(day_suggestions)
-            total_suggestions += len(day_suggestions)
-            print(f"  📊 {day_key}: {len(day_suggestions)}개 제안")
+                # 시간대별 가중치는 모든 장소에 동일하므로 고정 점수의 마스크 argmax로 선택
+                # (이미 사용된 장소와 빈 시간대보다 긴 일정은 제외)
+                available = ~used[name_ids] & (durations <= slot_duration)
+                if not available.any():
+                    continue
+                idx = int(np.argmax(np.where(available, static_scores, -np.inf)))
+                score = float(static_scores[idx]) + self._calculate_time_weight_extended(slot_start)
+                suggestions.append(self._build_suggestion(district_locations[idx], slot_start, int(durations[idx]), score))
+                used[name_ids[idx]] = True
+                break  # 하루 1개
         
-        print(f"🎯 총 생성된 제안 수: {len(suggestions)}")
-        if suggestions:
-            print(f"📋 첫 번째 제안: {suggestions[0]}")
+        return suggestions
+
+    def _suggest_by_assignment(self, district: str, district_locations: List[Dict], time_groups: Dict[str, List],
+                               max_suggestions: int) -> List[Dict]:
+        """주 전체를 날짜 × 장소 이분 매칭으로 한 번에 배정
+
+        날짜-장소 쌍의 가치는 그 날짜의 빈 시간대 중 일정이 들어가는 가장 좋은 시간대의 점수이다.
+        행(날짜)마다 서로 다른 열(장소)을 배정하므로 하루 1개, 장소 중복 없음 제약이 그대로 반영되고,
+        '건너뛰기' 열로 제안 수를 max_suggestions 로 제한한다.
+        같은 장소가 여러 유형으로 등록된 경우 열은 장소 이름 단위로 묶고, 날짜마다 가장 점수가 높은 행을 쓴다.
+        """
+        score_arrays = self._get_score_arrays(district)
+        static_scores = score_arrays["static_scores"]
+        durations = score_arrays["durations"]
+        name_ids = score_arrays["name_ids"]
+        num_names = int(name_ids.max()) + 1 if len(name_ids) else 0
+        max_suggestions = min(max_suggestions, num_names)
+        if max_suggestions <= 0:
+            return []
+        days = sorted(time_groups.keys())
+        
+        values = np.full((len(days), len(district_locations)), -np.inf)
+        best_slots = np.zeros((len(days), len(district_locations)), dtype=int)
+        day_slots = []
+        for d, day_key in enumerate(days):
+            slots = sorted(self._slot_bounds(s) for s in time_groups[day_key])
+            day_slots.append(slots)
+            lengths = np.array([(end - start).total_seconds() / 60 for start, end in slots])
+            weights = np.array([self._calculate_time_weight_extended(start) for start, _ in slots])
+            slot_values = np.where(
+                durations[None, :] <= lengths[:, None], static_scores[None, :] + weights[:, None], -np.inf
+            )
+            best_slots[d] = slot_values.argmax(axis=0)  # 동점이면 이른 시간대
+            values[d] = slot_values.max(axis=0)
         
-        # 전체 제안 수를 활동 강도에 맞게 조정
-        max_suggestions = min(rules["max_schedules"], len(suggestions))
-        return suggestions[:max_suggestions]
+        # 장소 이름별로 날짜마다 가장 점수가 높은 행만 남김 (동점이면 앞 행)
+        name_values = np.full((len(days), num_names), -np.inf)
+        name_rows = np.zeros((len(days), num_names), dtype=int)
+        for idx, name_id in enumerate(name_ids):
+            better = values[:, idx] > name_values[:, name_id]
+            name_values[better, name_id] = values[better, idx]
+            name_rows[better, name_id] = idx
+        values = name_values
+        
+        feasible = np.isfinite(values)
+        if not feasible.any():
+            return []
+        
+        # 건너뛰기 열은 어떤 실제 배정보다 가치가 높아 정확히 (날짜 수 - 제안 수)개가 사용되고,
+        # 배정 불가 쌍은 어떤 조합보다도 불리하도록 큰 음수를 준다
+        skip_value = float(values[feasible].max()) + 1.0
+        infeasible_value = -skip_value * 2 * (len(days) + 1)
+        matrix = np.hstack([
+            np.where(feasible, values, infeasible_value),
+            np.full((len(days), len(days) - max_suggestions), skip_value),
+        ])
+        rows, cols = linear_sum_assignment(matrix, maximize=True)
+        
+        suggestions = []
+        for d, name_id in zip(rows, cols):
+            if name_id >= num_names or not feasible[d, name_id]:
+                continue
+            idx = name_rows[d, name_id]
+            slot_start, _ = day_slots[d][best_slots[d, idx]]
+            suggestions.append(self._build_suggestion(
+                district_locations[idx], slot_start, int(durations[idx]), float(values[d, name_id])
+            ))
+        return suggestions
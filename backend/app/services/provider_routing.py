@@ -0,0 +1,221 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class ProviderUnavailable(Exception):
+    """제공자를 호출하지 않고 건너뜀 (호출 한도 등). 차단기에는 실패로 기록하지 않는다"""
+
+
+class CircuitBreaker:
+    """제공자별 차단기 (closed -> open -> half_open)
+
+    연속 실패가 기준에 이르면 reset_seconds 동안 요청을 보내지 않고, 그 뒤에는 시험 요청
+    하나만 허용해 성공하면 닫고 실패하면 다시 연다.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self.trips = 0
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self._clock() - self.opened_at >= self.reset_seconds:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def release(self) -> None:
+        """허용받고 호출하지 않은 경우 시험 요청 자리를 돌려줌"""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.trips += 1
+                self.state = self.OPEN
+                self.opened_at = self._clock()
+                self._probing = False
+
+
+class LatencyTracker:
+    """최근 응답 시간(초) 표본과 백분위수"""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            return float(np.percentile(list(self._samples), q))
+
+
+class ProviderHealth:
+    """제공자 이름별 차단기와 응답 시간 (프로세스 전역으로 공유)"""
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[str, LatencyTracker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        with self._lock:
+            if provider not in self._breakers:
+                self._breakers[provider] = CircuitBreaker(self.failure_threshold, self.reset_seconds, self._clock)
+            return self._breakers[provider]
+
+    def latency(self, provider: str) -> LatencyTracker:
+        with self._lock:
+            if provider not in self._latencies:
+                self._latencies[provider] = LatencyTracker()
+            return self._latencies[provider]
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            names = sorted(set(self._breakers) | set(self._latencies))
+        stats = {}
+        for name in names:
+            breaker = self.breaker(name)
+            latency = self.latency(name)
+            p50, p95 = latency.percentile(50), latency.percentile(95)
+            stats[name] = {
+                "state": breaker.state,
+                "consecutive_failures": breaker.failures,
+                "trips": breaker.trips,
+                "samples": len(latency),
+                "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            }
+        return stats
+
+
+class ProviderRouter:
+    """제공자 체인 호출 (지연 기반 순서, 차단기, 시도 제한 시간, 예비 요청)
+
+    다음 제공자는 현재 시도가 실패했을 때 바로, 또는 응답이 attempt_timeout 안에 오지 않을
+    때 시작한다. hedge 를 켜면 앞 제공자의 p95 응답 시간(최소 hedge_delay)이 지나도 응답이
+    없을 때 시작한다. 먼저 시작한 시도도 계속 유효하며 가장 먼저 성공한 응답을 쓴다.
+    전체 대기는 deadline 으로 제한되어 가장 느린 제공자에 묶이지 않는다.
+    """
+
+    MIN_HEDGE_SAMPLES = 20
+
+    def __init__(self, health: ProviderHealth, executor: Executor,
+                 attempt_timeout: float = 2.0, deadline: float = 4.0,
+                 hedge: bool = False, hedge_delay: float = 0.2):
+        self.health = health
+        self.executor = executor
+        self.attempt_timeout = attempt_timeout
+        self.deadline = deadline
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+
+    def order(self, providers: List[str]) -> List[str]:
+        """응답 시간 표본이 있는 제공자는 p50 이 빠른 순서, 표본이 없으면 설정 순서로 뒤에"""
+        def key(item):
+            index, name = item
+            p50 = self.health.latency(name).percentile(50)
+            return (0, p50, index) if p50 is not None else (1, 0.0, index)
+
+        return [name for _, name in sorted(enumerate(providers), key=key)]
+
+    def _launch_delay(self, provider: str) -> float:
+        if not self.hedge:
+            return self.attempt_timeout
+        latency = self.health.latency(provider)
+        p95 = latency.percentile(95) if len(latency) >= self.MIN_HEDGE_SAMPLES else None
+        return min(self.attempt_timeout, max(self.hedge_delay, p95 or 0.0))
+
+    def _attempt(self, provider: str, fetch: Callable[[], Optional[Dict]]) -> Optional[Dict]:
+        """제공자 한 번 호출. 실패(None/예외)나 attempt_timeout 초과는 차단기에 실패로 기록"""
+        started = time.monotonic()
+        try:
+            result = fetch()
+        except ProviderUnavailable:
+            self.health.breaker(provider).release()
+            return None
+        except Exception:
+            result = None
+        elapsed = time.monotonic() - started
+        breaker = self.health.breaker(provider)
+        if result is None or elapsed > self.attempt_timeout:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        if result is not None:
+            self.health.latency(provider).record(elapsed)
+        return result
+
+    def call(self, fetchers: Dict[str, Callable[[], Optional[Dict]]]) -> Optional[Tuple[str, Dict]]:
+        """(응답한 제공자, 결과). 모든 제공자가 실패하거나 제한 시간이 지나면 None"""
+        queue = self.order(list(fetchers))
+        deadline = time.monotonic() + self.deadline
+        pending: Dict[Future, str] = {}
+        next_launch = None
+
+        def launch():
+            while queue:
+                name = queue.pop(0)
+                if self.health.breaker(name).allow():
+                    pending[self.executor.submit(self._attempt, name, fetchers[name])] = name
+                    return time.monotonic() + self._launch_delay(name)
+            return None
+
+        next_launch = launch()
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            wake = deadline if next_launch is None else min(deadline, next_launch)
+            done, _ = wait(list(pending), timeout=max(0.0, wake - now), return_when=FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                result = future.result()
+                if result is not None:
+                    return name, result
+            if not pending or (next_launch is not None and time.monotonic() >= next_launch):
+                next_launch = launch()
+        return None
@@ -0,0 +1,129 @@
+import math
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+INTERACTIVE = "interactive"  # 사용자 요청 처리 중 조회
+BACKGROUND = "background"    # 사전 채우기 등 배치 작업
+
+PRIORITIES = (INTERACTIVE, BACKGROUND)
+
+
+class TokenBucket:
+    """초당 rate 개씩 최대 capacity 까지 채워지는 토큰 버킷 (잠금은 호출자 몫)
+
+    토큰은 음수가 되지 않는다. 비용과 남겨 둘 토큰의 합이 용량보다 큰 요청은 허용할 수 없으므로
+    호출자가 나눠서 요청해야 한다.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self, cost: float, reserve: float = 0.0) -> float:
+        """토큰을 꺼내면 0, 부족하면 reserve 를 남기고 꺼낼 수 있을 때까지 남은 초
+
+        cost + reserve 가 용량보다 크면 버킷이 가득 차도 꺼낼 수 없으므로 inf 를 돌려준다.
+        """
+        self._refill()
+        need = cost + reserve
+        if need > self.capacity:
+            return math.inf
+        if self.tokens >= need:
+            self.tokens -= cost
+            return 0.0
+        return (need - self.tokens) / self.rate
+
+
+class QuotaScheduler:
+    """제공자별 토큰 버킷과 우선순위 기반 호출 허가
+
+    비용 단위는 제공자의 과금 단위(경로 한 건 또는 행렬 원소 하나)이다. 대화형 요청이 기다리는
+    동안 백그라운드 요청은 토큰을 가져가지 않고, 백그라운드 요청은 버킷의 background_reserve
+    비율을 항상 남겨 둔다. 한 번에 허용할 수 있는 비용은 max_cost 까지이고, 이보다 큰 요청은
+    기다리지 않고 거절하므로 호출자가 max_cost 단위로 나눠 요청한다. 버킷이 설정되지 않은
+    제공자는 제한하지 않는다.
+    """
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None, burst_seconds: float = 2.0,
+                 background_reserve: float = 0.5, clock: Callable[[], float] = time.monotonic):
+        self.background_reserve = background_reserve
+        self._buckets = {
+            provider: TokenBucket(rate, max(1.0, rate * burst_seconds), clock)
+            for provider, rate in (rates or {}).items() if rate > 0
+        }
+        self._cond = threading.Condition()
+        self._waiting = {provider: {priority: 0 for priority in PRIORITIES} for provider in self._buckets}
+        self.granted = {provider: {priority: 0 for priority in PRIORITIES} for provider in self._buckets}
+        self.rejected = {provider: {priority: 0 for priority in PRIORITIES} for provider in self._buckets}
+
+    def _reserve(self, bucket: TokenBucket, priority: str) -> float:
+        return bucket.capacity * self.background_reserve if priority == BACKGROUND else 0.0
+
+    def max_cost(self, provider: str, priority: str = INTERACTIVE) -> Optional[float]:
+        """priority 요청 한 번에 허용할 수 있는 최대 비용 (제한하지 않는 제공자는 None)"""
+        bucket = self._buckets.get(provider)
+        if bucket is None:
+            return None
+        return bucket.capacity - self._reserve(bucket, priority)
+
+    def acquire(self, provider: str, cost: float = 1.0, priority: str = INTERACTIVE,
+                timeout: Optional[float] = None) -> bool:
+        """호출 허가. timeout 초 안에 토큰을 얻지 못하면 False (None 이면 얻을 때까지 대기)
+
+        비용이 max_cost 보다 크면 기다려도 얻을 수 없으므로 바로 False.
+        """
+        bucket = self._buckets.get(provider)
+        if bucket is None:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        reserve = self._reserve(bucket, priority)
+        waiting = self._waiting[provider]
+
+        with self._cond:
+            if cost + reserve > bucket.capacity:
+                self.rejected[provider][priority] += 1
+                return False
+            waiting[priority] += 1
+            try:
+                while True:
+                    if priority == BACKGROUND and waiting[INTERACTIVE]:
+                        wait = None  # 대화형 요청이 끝나면 깨어남
+                    else:
+                        wait = bucket.try_take(cost, reserve)
+                        if wait == 0.0:
+                            self.granted[provider][priority] += 1
+                            return True
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self.rejected[provider][priority] += 1
+                            return False
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            finally:
+                waiting[priority] -= 1
+                self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._cond:
+            stats = {}
+            for provider, bucket in self._buckets.items():
+                bucket._refill()
+                stats[provider] = {
+                    "rate": bucket.rate,
+                    "capacity": bucket.capacity,
+                    "tokens": round(bucket.tokens, 2),
+                    "granted": dict(self.granted[provider]),
+                    "rejected": dict(self.rejected[provider]),
+                    "waiting": dict(self._waiting[provider]),
+                }
+            return stats
@@ -0,0 +1,67 @@
+import hashlib
+import json
+import threading
+from collections import Counter
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from app.core.config import settings
+from app.services.cache import LRUTTLCache
+
+
+class ResultCache:
+    """사용자별 최적화/제안 응답 캐시
+
+    키의 첫 요소는 항상 사용자 id 이므로 일정이 바뀐 사용자의 항목만 골라 지울 수 있다.
+    계산 도중 무효화되면 끝난 결과가 옛 일정 기준일 수 있으므로, 계산 전에 받은
+    generation 이 그대로일 때만 저장한다.
+    """
+
+    def __init__(self, max_size: int = 1000, ttl_seconds: Optional[float] = 600):
+        self.memory = LRUTTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self._lock = threading.Lock()
+        self._generations: Counter = Counter()
+        self.invalidations = 0
+        self.stale_writes = 0
+
+    @staticmethod
+    def fingerprint(value: Any) -> str:
+        """JSON 으로 직렬화할 수 있는 입력의 지문 (순서가 같은 같은 입력이면 같은 값)"""
+        payload = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def generation(self, user_id: str) -> int:
+        with self._lock:
+            return self._generations[user_id]
+
+    def get(self, user_id: str, key: Tuple[Hashable, ...]) -> Any:
+        return self.memory.get((user_id,) + key)
+
+    def set(self, user_id: str, key: Tuple[Hashable, ...], value: Any, generation: int) -> bool:
+        """generation 이후 무효화가 없었을 때만 저장하고 저장 여부 반환"""
+        with self._lock:
+            if self._generations[user_id] != generation:
+                self.stale_writes += 1
+                return False
+            self.memory.set((user_id,) + key, value)
+            return True
+
+    def invalidate_user(self, user_id: str) -> int:
+        """사용자의 모든 항목 제거 (일정 생성/수정/삭제 후 호출)"""
+        with self._lock:
+            self._generations[user_id] += 1
+            self.invalidations += 1
+            return self.memory.invalidate(lambda key: key[0] == user_id)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.memory.stats()
+        with self._lock:
+            stats["invalidations"] = self.invalidations
+            stats["stale_writes"] = self.stale_writes
+        return stats
+
+
+# 프로세스 전역 최적화 응답 캐시
+result_cache = ResultCache(
+    max_size=settings.RESULT_CACHE_MAX_SIZE,
+    ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,473 @@
+import copy
+import random
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class RoutingProblem:
+    """시간창 오리엔티어링 문제 정의 (행렬 인덱스 기반)"""
+
+    def __init__(
+        self,
+        prizes: Sequence[float],
+        service_times: Sequence[int],
+        durations: np.ndarray,
+        distances: np.ndarray,
+        horizon: int,
+        break_time: int,
+        max_distance: float,
+        max_visits: int,
+        start_minute: int = 9 * 60,
+        hour_weights: Optional[Sequence[float]] = None,
+    ):
+        self.size = len(prizes)
+        self.prizes = [float(p) for p in prizes]
+        self.service_times = [int(s) for s in service_times]
+        # 핫 루프에서는 numpy 스칼라 인덱싱보다 중첩 리스트가 빠르다
+        self.durations = np.asarray(durations, dtype=float).tolist()
+        self.distances = np.asarray(distances, dtype=float).tolist()
+        self.horizon = horizon
+        self.break_time = break_time
+        self.max_distance = max_distance
+        self.max_visits = max_visits
+        self.start_minute = start_minute
+        self.hour_weights = list(hour_weights) if hour_weights is not None else [0.0] * 24
+        # 분 단위 가중치 테이블 (평가 루프에서 시간대 계산 생략)
+        last_hour = len(self.hour_weights) - 1
+        self.minute_weights = [
+            self.hour_weights[min(minute // 60, last_hour)]
+            for minute in range(start_minute, start_minute + horizon + 1)
+        ]
+
+    def with_rules(self, break_time: int, max_distance: float, max_visits: int) -> "RoutingProblem":
+        """이동 행렬을 공유하고 활동 규칙만 다른 문제 (팀원별 규칙 적용용)"""
+        problem = copy.copy(self)
+        problem.break_time = break_time
+        problem.max_distance = max_distance
+        problem.max_visits = max_visits
+        return problem
+
+    def evaluate(self, route: Sequence[int]) -> Optional[Tuple[float, float, float]]:
+        """경로의 (점수, 총 이동거리, 총 이동시간) 계산. 제약 위반 시 None"""
+        if len(route) > self.max_visits:
+            return None
+
+        durations = self.durations
+        distances = self.distances
+        minute_weights = self.minute_weights
+
+        elapsed = 0.0
+        distance = 0.0
+        travel = 0.0
+        score = 0.0
+        prev = -1
+        for k in route:
+            if prev >= 0:
+                distance += distances[prev][k]
+                if distance > self.max_distance:
+                    return None
+                leg = durations[prev][k]
+                travel += leg
+                elapsed += self.break_time + leg
+            if elapsed + self.service_times[k] > self.horizon:
+                return None
+            score += self.prizes[k] + minute_weights[int(elapsed)]
+            elapsed += self.service_times[k]
+            prev = k
+        return score, distance, travel
+
+    def timeline(self, route: Sequence[int]) -> List[Tuple[int, float, float, float]]:
+        """경로의 (장소, 시작 분, 이동시간, 이동거리) 목록"""
+        result = []
+        elapsed = 0.0
+        prev = -1
+        for k in route:
+            leg_time = 0.0
+            leg_distance = 0.0
+            if prev >= 0:
+                leg_time = self.durations[prev][k]
+                leg_distance = self.distances[prev][k]
+                elapsed += self.break_time + leg_time
+            result.append((k, elapsed, leg_time, leg_distance))
+            elapsed += self.service_times[k]
+            prev = k
+        return result
+
+
+class RoutingSolution:
+    """탐색 결과 경로"""
+
+    def __init__(self, route: List[int], score: float, distance: float, travel: float, iterations: int = 0):
+        self.route = route
+        self.score = score
+        self.distance = distance
+        self.travel = travel
+        self.iterations = iterations
+
+    def key(self) -> Tuple[float, float]:
+        # 점수가 같으면 이동시간이 짧은 경로를 선호
+        return (round(self.score, 6), -round(self.travel, 6))
+
+
+class OrienteeringSolver:
+    """삽입 기반 구성 + 지역 탐색(2-opt, or-opt, 삽입/교체/제거) + 반복 교란"""
+
+    def __init__(
+        self,
+        problem: RoutingProblem,
+        seed: int = 42,
+        time_budget_ms: int = 200,
+        max_iterations: int = 200,
+        max_stall: int = 15,
+        candidate_limit: Optional[int] = None,
+        candidates: Optional[Sequence[int]] = None,
+    ):
+        self.problem = problem
+        self.rng = random.Random(seed)
+        self.time_budget_ms = time_budget_ms
+        self.max_iterations = max_iterations
+        self.max_stall = max_stall
+
+        if candidates is not None:
+            self.candidates = [int(i) for i in candidates]
+        else:
+            # 방문 수 상한을 고려해 점수 상위 후보만 탐색 (수백 개 장소에서도 지연 시간 제한)
+            if candidate_limit is None:
+                candidate_limit = max(40, problem.max_visits * 10)
+            order = np.argsort(-np.asarray(problem.prizes, dtype=float), kind="stable")
+            self.candidates = [int(i) for i in order[:candidate_limit]]
+        self._deadline = 0.0
+
+    def solve(self, on_improvement: Optional[Callable[[RoutingSolution], None]] = None) -> RoutingSolution:
+        """시간 예산 내에서 찾은 최선의 경로 반환"""
+        return self.improve([], on_improvement)
+
+    def improve(self, route: List[int],
+                on_improvement: Optional[Callable[[RoutingSolution], None]] = None) -> RoutingSolution:
+        """주어진 경로에서 출발해 시간 예산 내에서 개선한 경로 반환"""
+        self._deadline = time.perf_counter() + self.time_budget_ms / 1000.0
+
+        current = self._construct(list(route))
+        current = self._local_search(current)
+        best = current
+        if on_improvement:
+            on_improvement(best)
+
+        iterations = 0
+        stall = 0
+        while iterations < self.max_iterations and stall < self.max_stall and not self._expired() and best.route:
+            iterations += 1
+            stall += 1
+            candidate = self._local_search(self._perturb(best))
+            if candidate.key() > best.key():
+                best = candidate
+                stall = 0
+                if on_improvement:
+                    on_improvement(best)
+
+        best.iterations = iterations
+        return best
+
+    def _expired(self) -> bool:
+        return time.perf_counter() >= self._deadline
+
+    def _solution(self, route: List[int]) -> Optional[RoutingSolution]:
+        evaluated = self.problem.evaluate(route)
+        if evaluated is None:
+            return None
+        score, distance, travel = evaluated
+        return RoutingSolution(route, score, distance, travel)
+
+    def _best_insertion(self, current: RoutingSolution) -> Optional[RoutingSolution]:
+        """미방문 후보 중 (점수 증가 / 이동시간 증가) 비율이 가장 좋은 삽입"""
+        problem = self.problem
+        route = current.route
+        if len(route) >= problem.max_visits:
+            return None
+
+        durations = problem.durations
+        distances = problem.distances
+        service_times = problem.service_times
+        # 시간/거리 여유분으로 O(1) 실행 가능성 판정 후에만 전체 평가
+        end = sum(service_times[k] for k in route) + current.travel + problem.break_time * max(0, len(route) - 1)
+        time_slack = problem.horizon - end
+        distance_slack = problem.max_distance - current.distance
+
+        visited = set(route)
+        best = None
+        best_ratio = None
+        for c in self.candidates:
+            if c in visited:
+                continue
+            for pos in range(len(route) + 1):
+                prev = route[pos - 1] if pos > 0 else -1
+                nxt = route[pos] if pos < len(route) else -1
+                added_time = service_times[c]
+                added_distance = 0.0
+                if prev >= 0:
+                    added_time += problem.break_time + durations[prev][c]
+                    added_distance += distances[prev][c]
+                if nxt >= 0:
+                    added_time += problem.break_time + durations[c][nxt]
+                    added_distance += distances[c][nxt]
+                if prev >= 0 and nxt >= 0:
+                    added_time -= problem.break_time + durations[prev][nxt]
+                    added_distance -= distances[prev][nxt]
+                if added_time > time_slack + 1e-9 or added_distance > distance_slack + 1e-9:
+                    continue
+                candidate = self._solution(route[:pos] + [c] + route[pos:])
+                if candidate is None:
+                    continue
+                gain = candidate.score - current.score
+                ratio = gain / (1.0 + max(0.0, candidate.travel - current.travel))
+                if best_ratio is None or ratio > best_ratio:
+                    best = candidate
+                    best_ratio = ratio
+        return best
+
+    def _construct(self, route: List[int]) -> RoutingSolution:
+        current = self._solution(route) or RoutingSolution([], 0.0, 0.0, 0.0)
+        while len(current.route) < self.problem.max_visits:
+            inserted = self._best_insertion(current)
+            if inserted is None:
+                break
+            current = inserted
+        return current
+
+    def _local_search(self, current: RoutingSolution) -> RoutingSolution:
+        improved = True
+        while improved and not self._expired():
+            improved = False
+            for move in (self._two_opt, self._or_opt, self._insert, self._replace, self._drop_and_refill):
+                candidate = move(current)
+                if candidate is not None and candidate.key() > current.key():
+                    current = candidate
+                    improved = True
+                    break
+        return current
+
+    def _two_opt(self, current: RoutingSolution) -> Optional[RoutingSolution]:
+        route = current.route
+        for i in range(len(route) - 1):
+            for j in range(i + 1, len(route)):
+                candidate = self._solution(route[:i] + route[i:j + 1][::-1] + route[j + 1:])
+                if candidate is not None and candidate.key() > current.key():
+                    return candidate
+        return None
+
+    def _or_opt(self, current: RoutingSolution) -> Optional[RoutingSolution]:
+        route = current.route
+        for length in (1, 2, 3):
+            for i in range(len(route) - length + 1):
+                segment = route[i:i + length]
+                rest = route[:i] + route[i + length:]
+                for pos in range(len(rest) + 1):
+                    if pos == i:
+                        continue
+                    candidate = self._solution(rest[:pos] + segment + rest[pos:])
+                    if candidate is not None and candidate.key() > current.key():
+                        return candidate
+        return None
+
+    def _insert(self, current: RoutingSolution) -> Optional[RoutingSolution]:
+        return self._best_insertion(current)
+
+    def _replace(self, current: RoutingSolution) -> Optional[RoutingSolution]:
+        route = current.route
+        visited = set(route)
+        best = None
+        for pos in range(len(route)):
+            if self._expired():
+                break
+            for c in self.candidates:
+                if c in visited:
+                    continue
+                candidate = self._solution(route[:pos] + [c] + route[pos + 1:])
+                if candidate is not None and candidate.key() > (best or current).key():
+                    best = candidate
+        return best
+
+    def _drop_and_refill(self, current: RoutingSolution) -> Optional[RoutingSolution]:
+        route = current.route
+        for pos in range(len(route)):
+            if self._expired():
+                break
+            candidate = self._construct(route[:pos] + route[pos + 1:])
+            if candidate.key() > current.key():
+                return candidate
+        return None
+
+    def _perturb(self, current: RoutingSolution) -> RoutingSolution:
+        """무작위로 1~2개 방문을 제거한 뒤 재구성"""
+        route = list(current.route)
+        for _ in range(min(len(route), self.rng.randint(1, 2))):
+            route.pop(self.rng.randrange(len(route)))
+        if len(route) > 2 and self.rng.random() < 0.5:
+            i, j = sorted(self.rng.sample(range(len(route)), 2))
+            route[i:j + 1] = route[i:j + 1][::-1]
+        return self._construct(route)
+
+
+def solve_routing_problem(problem: RoutingProblem, seed: int = 42, time_budget_ms: int = 200) -> List[int]:
+    """단일 경로 탐색 (프로세스 풀에서 실행할 수 있는 최상위 함수)"""
+    return OrienteeringSolver(problem, seed=seed, time_budget_ms=time_budget_ms).solve().route
+
+
+class TeamSolver:
+    """여러 경로(팀원)를 하나의 장소 카탈로그에서 함께 탐색하는 다중 경로 오리엔티어링
+
+    모든 경로가 같은 이동 행렬을 공유하고 장소는 팀 전체에서 한 번만 방문한다.
+    병렬 삽입(numpy 벡터화)으로 초기 해를 만든 뒤, 남은 시간 동안 경로별 지역 탐색과
+    경로 간 방문 이동으로 개선한다.
+    """
+
+    def __init__(self, problems: Sequence[RoutingProblem], seed: int = 42, time_budget_ms: int = 1000,
+                 pool_size: int = 40):
+        self.problems = list(problems)
+        self.seed = seed
+        self.time_budget_ms = time_budget_ms
+        self.pool_size = pool_size
+
+        base = self.problems[0]
+        self.prizes = np.asarray(base.prizes, dtype=float)
+        self.service_times = np.asarray(base.service_times, dtype=float)
+        self.durations = np.asarray(base.durations, dtype=float)
+        self.distances = np.asarray(base.distances, dtype=float)
+        self.order = [int(i) for i in np.argsort(-self.prizes, kind="stable")]
+        self._deadline = 0.0
+
+    def solve(self) -> List[RoutingSolution]:
+        """시간 예산 내에서 찾은 경로 목록 (problems 순서)"""
+        self._deadline = time.perf_counter() + self.time_budget_ms / 1000.0
+        routes = self._construct()
+        routes = self._improve_routes(routes)
+        routes = self._relocate(routes)
+        return [self._solution(r, route) for r, route in enumerate(routes)]
+
+    def _expired(self) -> bool:
+        return time.perf_counter() >= self._deadline
+
+    def _solution(self, r: int, route: List[int]) -> RoutingSolution:
+        evaluated = self.problems[r].evaluate(route)
+        score, distance, travel = evaluated if evaluated is not None else (0.0, 0.0, 0.0)
+        return RoutingSolution(list(route), score, distance, travel)
+
+    def _best_insertion(self, r: int, route: List[int], candidates: np.ndarray) -> Optional[Tuple[float, int, int]]:
+        """경로 r 에 대한 (비율, 장소, 위치) 최선 삽입을 벡터 연산으로 계산"""
+        problem = self.problems[r]
+        if len(route) >= problem.max_visits or len(candidates) == 0:
+            return None
+        evaluated = problem.evaluate(route)
+        if evaluated is None:
+            return None
+        _, distance, travel = evaluated
+        end = self.service_times[route].sum() + travel + problem.break_time * max(0, len(route) - 1)
+        time_slack = problem.horizon - end
+        distance_slack = problem.max_distance - distance
+
+        seq = np.asarray(route, dtype=int)
+        prev = np.concatenate(([-1], seq))
+        nxt = np.concatenate((seq, [-1]))
+        has_prev = (prev >= 0)[:, None]
+        has_next = (nxt >= 0)[:, None]
+        prev_idx = np.maximum(prev, 0)
+        next_idx = np.maximum(nxt, 0)
+        brk = problem.break_time
+
+        added_time = (
+            self.service_times[candidates][None, :]
+            + np.where(has_prev, brk + self.durations[prev_idx][:, candidates], 0.0)
+            + np.where(has_next, brk + self.durations[candidates][:, next_idx].T, 0.0)
+            - np.where(has_prev & has_next, brk + self.durations[prev_idx, next_idx][:, None], 0.0)
+        )
+        added_distance = (
+            np.where(has_prev, self.distances[prev_idx][:, candidates], 0.0)
+            + np.where(has_next, self.distances[candidates][:, next_idx].T, 0.0)
+            - np.where(has_prev & has_next, self.distances[prev_idx, next_idx][:, None], 0.0)
+        )
+        feasible = (added_time <= time_slack + 1e-9) & (added_distance <= distance_slack + 1e-9)
+        if not feasible.any():
+            return None
+        ratio = np.where(feasible, self.prizes[candidates][None, :] / (1.0 + added_time), -np.inf)
+        pos, col = np.unravel_index(int(np.argmax(ratio)), ratio.shape)
+        return float(ratio[pos, col]), int(candidates[col]), int(pos)
+
+    def _construct(self) -> List[List[int]]:
+        """모든 경로에 대해 비율이 가장 좋은 삽입을 반복하는 병렬 삽입"""
+        routes = [[] for _ in self.problems]
+        assigned = np.zeros(len(self.prizes), dtype=bool)
+        limit = max(self.pool_size, sum(p.max_visits for p in self.problems) * 3)
+        pool = np.array(self.order[:limit], dtype=int)
+
+        best = [self._best_insertion(r, routes[r], pool) for r in range(len(routes))]
+        while not self._expired():
+            options = [(b[0], r) for r, b in enumerate(best) if b is not None]
+            if not options:
+                break
+            _, r = max(options)
+            _, c, pos = best[r]
+            routes[r].insert(pos, c)
+            assigned[c] = True
+            pool = pool[~assigned[pool]]
+            for other, b in enumerate(best):
+                if other == r or (b is not None and b[1] == c):
+                    best[other] = self._best_insertion(other, routes[other], pool)
+        return routes
+
+    def _unassigned_pool(self, routes: List[List[int]]) -> List[int]:
+        assigned = set(i for route in routes for i in route)
+        return [i for i in self.order if i not in assigned][:self.pool_size]
+
+    def _improve_routes(self, routes: List[List[int]]) -> List[List[int]]:
+        """경로마다 (자기 방문 + 미배정 상위 후보) 안에서 지역 탐색"""
+        for r in range(len(routes)):
+            remaining_ms = (self._deadline - time.perf_counter()) * 1000
+            if remaining_ms <= 0:
+                break
+            candidates = list(routes[r]) + self._unassigned_pool(routes)
+            solver = OrienteeringSolver(
+                self.problems[r],
+                seed=self.seed + r,
+                time_budget_ms=int(remaining_ms / (len(routes) - r)),
+                max_iterations=20,
+                max_stall=5,
+                candidates=candidates,
+            )
+            routes[r] = solver.improve(routes[r]).route
+        return routes
+
+    def _relocate(self, routes: List[List[int]]) -> List[List[int]]:
+        """경로 A 의 방문을 경로 B 로 옮기고 A 를 미배정 후보로 다시 채워 총점이 오르면 채택"""
+        improved = True
+        while improved and not self._expired():
+            improved = False
+            for a in range(len(routes)):
+                for pos, visit in enumerate(routes[a]):
+                    if self._expired():
+                        return routes
+                    for b in range(len(routes)):
+                        if a == b:
+                            continue
+                        moved = self._best_insertion(b, routes[b], np.array([visit]))
+                        if moved is None:
+                            continue
+                        new_b = routes[b][:moved[2]] + [visit] + routes[b][moved[2]:]
+                        new_a = routes[a][:pos] + routes[a][pos + 1:]
+                        pool = np.array(self._unassigned_pool(routes), dtype=int)
+                        refill = self._best_insertion(a, new_a, pool)
+                        if refill is None:
+                            continue
+                        new_a = new_a[:refill[2]] + [refill[1]] + new_a[refill[2]:]
+                        before = self._solution(a, routes[a]).score + self._solution(b, routes[b]).score
+                        after = self._solution(a, new_a).score + self._solution(b, new_b).score
+                        if after > before + 1e-9:
+                            routes[a], routes[b] = new_a, new_b
+                            improved = True
+                            break
+                    if improved:
+                        break
+                if improved:
+                    break
+        return routes
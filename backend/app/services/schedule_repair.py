@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class RepairVisit:
+    """재최적화 대상 방문 (기존 일정 또는 새로 삽입할 후보 장소)"""
+
+    def __init__(self, name: str, address: str, duration: int, prize: float,
+                 index: Optional[int] = None, planned_start: Optional[datetime] = None,
+                 item: Optional[Dict] = None, pinned: bool = False):
+        self.name = name
+        self.address = address
+        self.duration = duration
+        self.prize = prize
+        self.index = index  # 지역구 카탈로그 순번 (행렬 조회용, 카탈로그에 없으면 None)
+        self.planned_start = planned_start  # 기존 일정의 시작 시각 (이보다 일찍 시작하지 않음)
+        self.item = item or {}
+        self.pinned = pinned  # 사용자가 직접 넣은 일정 등 제외하면 안 되는 방문
+
+
+class ScheduleRepairer:
+    """지연 발생 시 기존 계획에서 출발하는 증분 재최적화
+
+    남은 방문의 시각을 뒤로 미루고, 종료 시각이나 이동 거리 제약을 넘으면 가장 적은 수의
+    방문만 제외한 뒤, 비용이 작은 삽입으로 빈 자리를 다른 후보 장소로 채운다.
+    고정(pinned) 방문은 제외하지 않는다.
+    """
+
+    def __init__(self, travel: Callable[[Optional[RepairVisit], RepairVisit], Tuple[float, float]],
+                 break_time: int, max_distance: float, max_visits: int, day_end: datetime):
+        self.travel = travel
+        self.break_time = break_time
+        self.max_distance = max_distance
+        self.max_visits = max_visits
+        self.day_end = day_end
+
+    def timeline(self, origin: Optional[RepairVisit], visits: Sequence[RepairVisit], start: datetime,
+                 enforce: bool = True) -> Optional[List[Tuple[datetime, datetime, float, float]]]:
+        """방문별 (시작, 종료, 이동시간, 이동거리). 제약 위반 시 None (enforce=False 면 제약 무시)"""
+        result = []
+        current_time = start
+        distance = 0.0
+        prev = origin
+        for i, visit in enumerate(visits):
+            travel_time, travel_distance = self.travel(prev, visit) if prev is not None else (0.0, 0.0)
+            distance += travel_distance
+            if enforce and distance > self.max_distance:
+                return None
+            earliest = current_time + timedelta(minutes=travel_time + (self.break_time if i > 0 else 0))
+            visit_start = max(earliest, visit.planned_start) if visit.planned_start else earliest
+            visit_end = visit_start + timedelta(minutes=visit.duration)
+            if enforce and visit_end > self.day_end:
+                return None
+            result.append((visit_start, visit_end, travel_time, travel_distance))
+            current_time = visit_end
+            prev = visit
+        return result
+
+    def repair(self, origin: Optional[RepairVisit], visits: List[RepairVisit], start: datetime,
+               candidates: Sequence[RepairVisit], max_new_visits: Optional[int] = None,
+               exclude: Iterable[str] = ()) -> Tuple[List[RepairVisit], List[RepairVisit]]:
+        """(재최적화된 방문 목록, 제외된 기존 방문 목록)
+
+        exclude 는 후보로 다시 넣지 않을 장소 이름 (이미 마쳤거나 진행 중인 방문).
+        고정 방문만 남아 제약을 만족할 수 없으면 더 제외하지 않고 그대로 돌려준다.
+        """
+        visits = list(visits)
+        dropped = []
+
+        # 1. 실행 가능해질 때까지 방문을 하나씩 제외 (남는 점수가 가장 큰 제외를 선택)
+        while visits and self.timeline(origin, visits, start) is None:
+            best_pos = None
+            best_key = None
+            for pos in range(len(visits)):
+                if visits[pos].pinned:
+                    continue
+                remaining = visits[:pos] + visits[pos + 1:]
+                feasible = self.timeline(origin, remaining, start) is not None
+                key = (feasible, sum(v.prize for v in remaining))
+                if best_key is None or key > best_key:
+                    best_key = key
+                    best_pos = pos
+            if best_pos is None:
+                break
+            dropped.append(visits.pop(best_pos))
+
+        # 2. 남는 시간에 후보 장소를 비용이 작은 순서로 삽입
+        limit = self.max_visits if max_new_visits is None else min(self.max_visits, len(visits) + max_new_visits)
+        used = {v.name for v in visits} | {v.name for v in dropped} | set(exclude)
+        pool = [c for c in candidates if c.name not in used]
+        while len(visits) < limit and pool:
+            best = None
+            best_ratio = None
+            for c in pool:
+                for pos in range(len(visits) + 1):
+                    trial = visits[:pos] + [c] + visits[pos:]
+                    timeline = self.timeline(origin, trial, start)
+                    if timeline is None:
+                        continue
+                    ratio = c.prize / (1.0 + timeline[pos][2] + c.duration)
+                    if best_ratio is None or ratio > best_ratio:
+                        best = (c, pos)
+                        best_ratio = ratio
+            if best is None:
+                break
+            c, pos = best
+            visits.insert(pos, c)
+            pool.remove(c)
+
+        return visits, dropped
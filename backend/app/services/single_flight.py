@@ -0,0 +1,76 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """같은 키의 동시 호출을 하나의 실행으로 합치는 진행 중 요청 표
+
+    먼저 들어온 호출(리더)만 함수를 실행하고, 실행이 끝나기 전에 같은 키로 들어온 호출은
+    그 결과(또는 예외)를 함께 받는다. 스레드 호출(do)과 asyncio 호출(do_async)이 같은 표를
+    공유하므로 동기 엔드포인트와 비동기 엔드포인트 사이에서도 합쳐진다.
+    결과는 저장하지 않으며, 실행이 끝난 키는 표에서 바로 빠진다 (캐시는 호출자 몫).
+    asyncio 호출자 하나가 취소되어도 공유 실행과 다른 호출자에게는 영향이 없다.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.shared = 0
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        """(진행 중 호출, 리더 여부)"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.shared += 1
+                return call, False
+            call = Future()
+            self._calls[key] = call
+            self.executions += 1
+            return call, True
+
+    def _run(self, key: Hashable, call: Future, fn: Callable[[], Any]) -> Any:
+        try:
+            result = fn()
+        except BaseException as e:
+            if not call.cancelled():
+                call.set_exception(e)
+            raise
+        else:
+            if not call.cancelled():
+                call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """fn() 결과. 같은 키가 진행 중이면 실행하지 않고 그 결과를 기다림"""
+        call, leader = self._join(key)
+        if leader:
+            return self._run(key, call, fn)
+        return call.result()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """do 의 asyncio 버전. 리더는 동기 함수 fn 을 기본 실행기 스레드에서 실행"""
+        call, leader = self._join(key)
+        if leader:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._run, key, call, fn)
+        # 이 호출자가 취소되어도 공유 Future 는 취소하지 않음
+        return await asyncio.shield(asyncio.wrap_future(call))
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "shared": self.shared,  # 합쳐져 절약된 상위 호출 수
+                "in_flight": len(self._calls),
+            }
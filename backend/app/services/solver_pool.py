@@ -0,0 +1,133 @@
+import asyncio
+import math
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from app.core.config import settings
+
+
+class AdmissionRejected(Exception):
+    """최적화 작업 입장 거절 (status_code: 429 사용자 한도, 503 대기열 가득 참)"""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class SolverPool:
+    """최적화 작업 전용 스레드 풀과 입장 제어
+
+    이벤트 루프 대신 크기가 고정된 풀에서 실행하고, 실행 중 + 대기 작업이 max_workers + max_queue 에
+    이르거나 사용자별 동시 작업이 per_user_limit 에 이르면 대기열에 넣지 않고 바로 거절한다.
+    Retry-After 는 최근 평균 실행 시간과 현재 대기 작업 수로 추정한다.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 8, per_user_limit: int = 1,
+                 retry_after_seconds: int = 2):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.per_user_limit = max(1, per_user_limit)
+        self.retry_after_seconds = retry_after_seconds
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._per_user: Counter = Counter()
+        self._in_system = 0
+        self._running = 0
+        self.admitted = 0
+        self.completed = 0
+        self.rejected_busy = 0
+        self.rejected_user = 0
+        self._wait_total = 0.0
+        self._service_total = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="solver")
+            return self._executor
+
+    def _retry_after(self) -> int:
+        if self.completed:
+            mean_service = self._service_total / self.completed
+            return max(1, math.ceil(mean_service * (self._in_system / self.max_workers)))
+        return self.retry_after_seconds
+
+    def _admit(self, user_id: Hashable) -> None:
+        with self._lock:
+            if self._per_user[user_id] >= self.per_user_limit:
+                self.rejected_user += 1
+                raise AdmissionRejected(429, "이미 처리 중인 최적화 요청이 있습니다. 잠시 후 다시 시도해 주세요",
+                                        self._retry_after())
+            if self._in_system >= self.max_workers + self.max_queue:
+                self.rejected_busy += 1
+                raise AdmissionRejected(503, "최적화 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해 주세요",
+                                        self._retry_after())
+            self._per_user[user_id] += 1
+            self._in_system += 1
+            self.admitted += 1
+
+    def _release(self, user_id: Hashable, future: Future) -> None:
+        # 실행을 마쳤거나 시작 전에 취소된 경우 모두 호출됨
+        with self._lock:
+            self._per_user[user_id] -= 1
+            if self._per_user[user_id] <= 0:
+                del self._per_user[user_id]
+            self._in_system -= 1
+
+    def _execute(self, enqueued_at: float, fn: Callable[[], Any]) -> Any:
+        started = time.monotonic()
+        with self._lock:
+            self._running += 1
+            self._wait_total += started - enqueued_at
+        try:
+            return fn()
+        finally:
+            with self._lock:
+                self._running -= 1
+                self.completed += 1
+                self._service_total += time.monotonic() - started
+
+    def submit(self, user_id: Hashable, fn: Callable[[], Any]) -> Future:
+        """입장 확인 후 풀에 제출. 거절되면 AdmissionRejected"""
+        self._admit(user_id)
+        try:
+            future = self._get_executor().submit(self._execute, time.monotonic(), fn)
+        except BaseException:
+            self._release(user_id, None)
+            raise
+        future.add_done_callback(lambda f: self._release(user_id, f))
+        return future
+
+    async def run(self, user_id: Hashable, fn: Callable[[], Any]) -> Any:
+        """submit 의 asyncio 버전 (요청이 취소되면 아직 시작하지 않은 작업도 취소)"""
+        return await asyncio.wrap_future(self.submit(user_id, fn))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "per_user_limit": self.per_user_limit,
+                "running": self._running,
+                "queued": self._in_system - self._running,
+                "admitted": self.admitted,
+                "completed": self.completed,
+                "rejected_busy": self.rejected_busy,
+                "rejected_user": self.rejected_user,
+                "avg_wait_ms": round(self._wait_total / self.completed * 1000, 1) if self.completed else None,
+                "avg_service_ms": round(self._service_total / self.completed * 1000, 1) if self.completed else None,
+            }
+
+
+# 프로세스 전역 최적화 작업 풀
+solver_pool = SolverPool(
+    max_workers=settings.SOLVER_MAX_WORKERS,
+    max_queue=settings.SOLVER_MAX_QUEUE,
+    per_user_limit=settings.SOLVER_PER_USER_LIMIT,
+    retry_after_seconds=settings.SOLVER_RETRY_AFTER_SECONDS
+)
@@ -0,0 +1,132 @@
+import math
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 위도 1도 / 경도 1도(적도) 당 거리 (km)
+KM_PER_DEG_LAT = 110.574
+KM_PER_DEG_LNG = 111.320
+
+
+class SpatialIndex:
+    """위경도 좌표 격자 색인 (반경 검색, k-최근접 검색)
+
+    지역구 범위에서는 중심 위도 기준 등장방형 투영으로 평면(km) 좌표를 만들고, 균일 격자의
+    셀 순서로 점을 정렬해 셀마다 연속 구간(CSR)으로 저장한다. 같은 격자 행의 셀들은 연속이므로
+    질의 한 번에 격자 행 수만큼만 배열을 잘라 거리 계산을 벡터 연산으로 처리한다.
+    ids 는 점마다 붙는 값(보통 카탈로그 순번)이다.
+    """
+
+    MAX_CELLS = 1 << 20
+
+    def __init__(self, latitudes: Sequence[float], longitudes: Sequence[float],
+                 ids: Optional[Sequence[int]] = None, points_per_cell: float = 4.0):
+        lat = np.asarray(latitudes, dtype=float)
+        lng = np.asarray(longitudes, dtype=float)
+        self.size = len(lat)
+        ids = np.arange(self.size) if ids is None else np.asarray(ids)
+
+        self.lat0 = float(lat.mean()) if self.size else 0.0
+        self.lng0 = float(lng.mean()) if self.size else 0.0
+        self.kx = KM_PER_DEG_LNG * math.cos(math.radians(self.lat0))
+        x, y = self._project(lat, lng)
+
+        self.x_min = float(x.min()) if self.size else 0.0
+        self.y_min = float(y.min()) if self.size else 0.0
+        width = (float(x.max()) - self.x_min) if self.size else 0.0
+        height = (float(y.max()) - self.y_min) if self.size else 0.0
+
+        # 셀당 평균 points_per_cell 개가 되도록 셀 크기 결정
+        area = max(width * height, 1e-6)
+        cell = math.sqrt(area * points_per_cell / max(self.size, 1))
+        cell = max(cell, width / 1024, height / 1024, 0.01)
+        while (width / cell + 1) * (height / cell + 1) > self.MAX_CELLS:
+            cell *= 2
+        self.cell = cell
+        self.nx = int(width // cell) + 1
+        self.ny = int(height // cell) + 1
+
+        cx = np.minimum(((x - self.x_min) // cell).astype(np.int64), self.nx - 1)
+        cy = np.minimum(((y - self.y_min) // cell).astype(np.int64), self.ny - 1)
+        keys = cx * self.ny + cy
+        order = np.argsort(keys, kind="stable")
+        self.x = x[order]
+        self.y = y[order]
+        self.ids = ids[order]
+        counts = np.bincount(keys, minlength=self.nx * self.ny)
+        self.offsets = np.concatenate(([0], np.cumsum(counts)))
+
+    def _project(self, lat, lng):
+        return (np.asarray(lng) - self.lng0) * self.kx, (np.asarray(lat) - self.lat0) * KM_PER_DEG_LAT
+
+    def _gather(self, lat: float, lng: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """반경 안의 점 (정렬 전 위치, 거리 km)"""
+        px, py = self._project(lat, lng)
+        px, py = float(px), float(py)
+        cx0 = max(int((px - radius_km - self.x_min) // self.cell), 0)
+        cx1 = min(int((px + radius_km - self.x_min) // self.cell), self.nx - 1)
+        cy0 = max(int((py - radius_km - self.y_min) // self.cell), 0)
+        cy1 = min(int((py + radius_km - self.y_min) // self.cell), self.ny - 1)
+        if cx0 > cx1 or cy0 > cy1:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        # 격자 행마다 cy0..cy1 셀은 연속 구간
+        rows = np.arange(cx0, cx1 + 1) * self.ny
+        starts = self.offsets[rows + cy0]
+        ends = self.offsets[rows + cy1 + 1]
+        if len(rows) == 1:
+            selected = np.arange(starts[0], ends[0])
+        else:
+            selected = np.concatenate([np.arange(s, e) for s, e in zip(starts, ends)])
+
+        distances = np.hypot(self.x[selected] - px, self.y[selected] - py)
+        inside = distances <= radius_km
+        return selected[inside], distances[inside]
+
+    def radius(self, lat: float, lng: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """반경 안의 점 (ids, 거리 km) 을 가까운 순으로"""
+        if self.size == 0 or radius_km < 0:
+            return np.empty(0, dtype=self.ids.dtype), np.empty(0)
+        selected, distances = self._gather(lat, lng, radius_km)
+        order = np.argsort(distances, kind="stable")
+        return self.ids[selected[order]], distances[order]
+
+    def nearest(self, lat: float, lng: float, k: int,
+                max_radius_km: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """가까운 k 개 점 (ids, 거리 km). max_radius_km 가 있으면 그 안에서만"""
+        if self.size == 0 or k <= 0:
+            return np.empty(0, dtype=self.ids.dtype), np.empty(0)
+        k = min(k, self.size)
+        px, py = self._project(lat, lng)
+        # 질의점에서 격자 끝까지의 최대 거리 (이 반경이면 모든 점 포함)
+        reach = math.hypot(max(abs(float(px) - self.x_min), abs(float(px) - self.x_min - self.nx * self.cell)),
+                           max(abs(float(py) - self.y_min), abs(float(py) - self.y_min - self.ny * self.cell)))
+        limit = reach if max_radius_km is None else min(reach, max_radius_km)
+
+        # 격자까지의 거리에 셀 크기의 절반부터 두 배씩 늘린 여유를 더해 확장
+        # (밀집 지역이나 격자 밖 질의에서 후보가 한꺼번에 늘지 않도록)
+        gap = math.hypot(max(0.0, self.x_min - float(px), float(px) - self.x_min - self.nx * self.cell),
+                         max(0.0, self.y_min - float(py), float(py) - self.y_min - self.ny * self.cell))
+        extra = self.cell / 2
+        while True:
+            radius = min(gap + extra, limit)
+            selected, distances = self._gather(lat, lng, radius)
+            if len(selected) >= k or radius >= limit:
+                break
+            extra *= 2
+
+        if len(selected) > k:
+            top = np.argpartition(distances, k - 1)[:k]
+            selected, distances = selected[top], distances[top]
+        order = np.argsort(distances, kind="stable")
+        return self.ids[selected[order]], distances[order]
+
+    @classmethod
+    def from_locations(cls, locations: List[dict]) -> "SpatialIndex":
+        """좌표가 있는 장소만 색인 (ids 는 장소 목록의 순번)"""
+        rows = [(i, loc["latitude"], loc["longitude"]) for i, loc in enumerate(locations)
+                if loc.get("latitude") is not None and loc.get("longitude") is not None]
+        if not rows:
+            return cls([], [], np.empty(0, dtype=np.int64))
+        ids, lat, lng = zip(*rows)
+        return cls(lat, lng, np.asarray(ids, dtype=np.int64))
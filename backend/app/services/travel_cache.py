@@ -0,0 +1,165 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from app.core.config import settings
+from app.services.cache import LRUTTLCache
+
+
+class TravelCache:
+    """프로세스 전역 이동 정보 캐시
+
+    메모리(LRU + TTL) 계층과 선택적 SQLite 영구 계층으로 구성된다. 영구 계층을 켜면
+    유료 지도 API 응답이 재시작이나 머신 자동 중지 후에도 유지된다.
+    항상 복사본을 반환하므로 호출자가 결과를 수정해도 캐시에 영향이 없다.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: Optional[float] = 86400,
+                 db_path: Optional[str] = None, persist_ttl_seconds: Optional[float] = None):
+        self.memory = LRUTTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self.db_path = db_path or None
+        self.persist_ttl_seconds = persist_ttl_seconds
+        self.persistent_hits = 0
+        self.persistent_writes = 0
+        self._conn = None
+        self._lock = threading.Lock()
+        if self.db_path:
+            self._open()
+
+    @staticmethod
+    def make_key(origin: str, destination: str, mode: str, provider: str) -> Tuple[str, str, str, str]:
+        return (provider, mode, origin, destination)
+
+    def _open(self) -> None:
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS travel_cache (
+                provider TEXT NOT NULL,
+                mode TEXT NOT NULL,
+                origin TEXT NOT NULL,
+                destination TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (provider, mode, origin, destination)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, origin: str, destination: str, mode: str, provider: str) -> Optional[Dict]:
+        key = self.make_key(origin, destination, mode, provider)
+        value = self.memory.get(key)
+        if value is None and self._conn is not None:
+            value = self._load(key)
+            if value is not None:
+                self.persistent_hits += 1
+                self.memory.set(key, value)
+        return dict(value) if value is not None else None
+
+    def set(self, origin: str, destination: str, mode: str, provider: str, info: Dict,
+            persist: bool = True) -> None:
+        """persist=False 면 메모리 계층에만 저장 (대체값/임시값은 영구 계층에 남기지 않음)"""
+        key = self.make_key(origin, destination, mode, provider)
+        value = dict(info)
+        self.memory.set(key, value)
+        if persist and self._conn is not None:
+            self._store(key, value)
+
+    def _load(self, key: Tuple[str, str, str, str]) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, created_at FROM travel_cache "
+                "WHERE provider = ? AND mode = ? AND origin = ? AND destination = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+            payload, created_at = row
+            if self.persist_ttl_seconds is not None and created_at + self.persist_ttl_seconds <= time.time():
+                self._conn.execute(
+                    "DELETE FROM travel_cache "
+                    "WHERE provider = ? AND mode = ? AND origin = ? AND destination = ?",
+                    key,
+                )
+                self._conn.commit()
+                return None
+            return json.loads(payload)
+
+    def _store(self, key: Tuple[str, str, str, str], value: Dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO travel_cache "
+                "(provider, mode, origin, destination, payload, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                key + (json.dumps(value, ensure_ascii=False), time.time()),
+            )
+            self._conn.commit()
+            self.persistent_writes += 1
+
+    def entries(self, providers: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, str, str, str, Dict]]:
+        """캐시된 (제공자, 이동수단, 출발지, 도착지, 이동 정보) 목록 (메모리 + 영구 계층, 중복 제외)"""
+        providers = set(providers) if providers is not None else None
+        seen = set()
+        for key, value in self.memory.items():
+            if providers is None or key[0] in providers:
+                seen.add(key)
+                yield key + (dict(value),)
+        if self._conn is not None:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT provider, mode, origin, destination, payload FROM travel_cache"
+                ).fetchall()
+            for provider, mode, origin, destination, payload in rows:
+                key = (provider, mode, origin, destination)
+                if key not in seen and (providers is None or provider in providers):
+                    yield key + (json.loads(payload),)
+
+    def invalidate(self, provider: Optional[str] = None, mode: Optional[str] = None) -> int:
+        """제공자/이동수단 단위 무효화 (둘 다 생략 시 전체). 메모리 계층 제거 수 반환"""
+        def matches(key):
+            return (provider is None or key[0] == provider) and (mode is None or key[1] == mode)
+
+        removed = self.memory.invalidate(matches)
+        if self._conn is not None:
+            conditions = []
+            params = []
+            if provider is not None:
+                conditions.append("provider = ?")
+                params.append(provider)
+            if mode is not None:
+                conditions.append("mode = ?")
+                params.append(mode)
+            where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+            with self._lock:
+                self._conn.execute(f"DELETE FROM travel_cache{where}", params)
+                self._conn.commit()
+        return removed
+
+    def stats(self) -> Dict:
+        stats = self.memory.stats()
+        stats["persistent"] = self._conn is not None
+        if self._conn is not None:
+            with self._lock:
+                stats["persistent_size"] = self._conn.execute("SELECT COUNT(*) FROM travel_cache").fetchone()[0]
+            stats["persistent_hits"] = self.persistent_hits
+            stats["persistent_writes"] = self.persistent_writes
+        return stats
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+travel_cache = TravelCache(
+    max_size=settings.TRAVEL_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TRAVEL_CACHE_TTL_SECONDS,
+    db_path=settings.TRAVEL_CACHE_DB_PATH,
+    persist_ttl_seconds=settings.TRAVEL_CACHE_PERSIST_TTL_SECONDS,
+)
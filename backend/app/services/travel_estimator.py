@@ -0,0 +1,156 @@
+import json
+import math
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_matrix(latitudes: Iterable[float], longitudes: Iterable[float],
+                     to_latitudes: Optional[Iterable[float]] = None,
+                     to_longitudes: Optional[Iterable[float]] = None) -> np.ndarray:
+    """출발지 x 도착지 대권 거리 행렬 (km). 도착지를 생략하면 출발지 간 정방 행렬"""
+    lat1 = np.radians(np.asarray(latitudes, dtype=float))[:, None]
+    lng1 = np.radians(np.asarray(longitudes, dtype=float))[:, None]
+    lat2 = lat1.T if to_latitudes is None else np.radians(np.asarray(to_latitudes, dtype=float))[None, :]
+    lng2 = lng1.T if to_longitudes is None else np.radians(np.asarray(to_longitudes, dtype=float))[None, :]
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """두 좌표 간 대권 거리 (km, 단일 쌍용)"""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    a = math.sin((p2 - p1) / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, a)))
+
+
+class TravelModel:
+    """이동수단별 직선 거리 -> 실제 경로 거리/시간 모델
+
+    경로 거리 = 직선 거리 x 우회 계수, 이동 시간(분) = 고정 시간 + 경로 거리 / 속도
+    """
+
+    def __init__(self, speed_kmh: float, detour: float, overhead_min: float = 0.0):
+        self.speed_kmh = speed_kmh
+        self.detour = detour
+        self.overhead_min = overhead_min
+
+    def to_dict(self) -> Dict:
+        return {"speed_kmh": self.speed_kmh, "detour": self.detour, "overhead_min": self.overhead_min}
+
+
+# 도시 내 이동 기본값 (실측 응답으로 보정 전)
+DEFAULT_MODELS = {
+    "transit": TravelModel(speed_kmh=18.0, detour=1.35, overhead_min=8.0),  # 대기/환승 포함
+    "walking": TravelModel(speed_kmh=4.5, detour=1.25, overhead_min=0.0),
+    "driving": TravelModel(speed_kmh=24.0, detour=1.4, overhead_min=3.0),  # 주차 포함
+}
+
+
+class TravelEstimator:
+    """좌표 기반 이동 거리/시간 추정 (네트워크 호출 없음)
+
+    좌표 배열 전체의 쌍별 행렬을 numpy 한 번의 호출로 계산한다. 모델 계수는 캐시된
+    실제 지도 API 응답으로 보정할 수 있다.
+    """
+
+    MIN_CALIBRATION_SAMPLES = 5
+
+    def __init__(self, models: Optional[Dict[str, TravelModel]] = None):
+        source = models or DEFAULT_MODELS
+        self.models = {mode: TravelModel(**model.to_dict()) for mode, model in source.items()}
+
+    def model(self, mode: str) -> TravelModel:
+        return self.models.get(mode) or self.models["transit"]
+
+    def matrices(self, latitudes: Iterable[float], longitudes: Iterable[float],
+                 mode: str = "transit") -> Tuple[np.ndarray, np.ndarray]:
+        """(이동시간 분, 경로 거리 km) 정방 행렬. 같은 좌표끼리는 0"""
+        model = self.model(mode)
+        distances = haversine_matrix(latitudes, longitudes) * model.detour
+        durations = model.overhead_min + distances / model.speed_kmh * 60.0
+        durations[distances == 0] = 0.0
+        return durations, distances
+
+    def estimate(self, origin: Tuple[float, float], destination: Tuple[float, float],
+                 mode: str = "transit") -> Dict:
+        """두 좌표 간 이동 정보 (지도 API 응답과 같은 형식)"""
+        model = self.model(mode)
+        distance = haversine_km(origin[0], origin[1], destination[0], destination[1]) * model.detour
+        duration = model.overhead_min + distance / model.speed_kmh * 60.0 if distance > 0 else 0.0
+        return {
+            "duration": int(round(duration)),
+            "distance": round(distance, 2),
+            "transport_mode": mode,
+            "service": "estimate"
+        }
+
+    def calibrate(self, mode: str, samples: List[Tuple[float, float, float]]) -> bool:
+        """(직선 거리 km, 실제 경로 거리 km, 실제 이동시간 분) 표본으로 모델 보정
+
+        우회 계수는 원점을 지나는 최소제곱, 속도와 고정 시간은 경로 거리에 대한 이동시간의
+        선형 회귀로 구한다. 표본이 부족하거나 값이 비정상이면 기존 모델을 유지한다.
+        """
+        data = np.asarray([s for s in samples if s[0] > 0 and s[1] > 0 and s[2] > 0], dtype=float)
+        if len(data) < self.MIN_CALIBRATION_SAMPLES:
+            return False
+        straight, distance, duration = data[:, 0], data[:, 1], data[:, 2]
+
+        detour = float((straight * distance).sum() / (straight ** 2).sum())
+        slope, intercept = np.polyfit(distance, duration, 1) if np.ptp(distance) > 0 else (0.0, 0.0)
+        if slope <= 0:
+            # 거리와 시간의 관계가 보이지 않으면 평균 속도만 사용
+            slope, intercept = float(duration.sum() / distance.sum()), 0.0
+        if not (1.0 <= detour <= 3.0):
+            return False
+        self.models[mode] = TravelModel(
+            speed_kmh=60.0 / slope,
+            detour=detour,
+            overhead_min=max(0.0, float(intercept))
+        )
+        return True
+
+    def calibrate_from_cache(self, travel_cache, coordinates_for, providers: Iterable[str]) -> Dict[str, int]:
+        """이동 정보 캐시의 실제 응답으로 이동수단별 보정. 이동수단별 사용 표본 수 반환
+
+        coordinates_for(주소) 는 (위도, 경도) 또는 None 을 돌려준다 (예: geocode_cache.get).
+        """
+        samples: Dict[str, List[Tuple[float, float, float]]] = {}
+        for _, mode, origin, destination, info in travel_cache.entries(providers):
+            start = coordinates_for(origin)
+            end = coordinates_for(destination)
+            if start is None or end is None:
+                continue
+            straight = haversine_km(start[0], start[1], end[0], end[1])
+            samples.setdefault(mode, []).append((straight, float(info["distance"]), float(info["duration"])))
+
+        used = {}
+        for mode, mode_samples in samples.items():
+            if self.calibrate(mode, mode_samples):
+                used[mode] = len(mode_samples)
+        return used
+
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({mode: model.to_dict() for mode, model in self.models.items()}, f, indent=2)
+
+    @classmethod
+    def load(cls, path: Optional[str]) -> "TravelEstimator":
+        """보정된 모델 파일이 있으면 읽고, 없으면 기본 모델"""
+        models = dict(DEFAULT_MODELS)
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                models.update({mode: TravelModel(**values) for mode, values in json.load(f).items()})
+        return cls(models)
+
+
+# 프로세스 전역 이동 추정기 (app.cli.calibrate_travel 로 보정한 모델 사용)
+travel_estimator = TravelEstimator.load(settings.TRAVEL_MODEL_PATH)
@@ -0,0 +1,99 @@
+import hashlib
+import os
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+
+class TravelMatrix:
+    """지역구 장소 간 이동시간(분)/거리(km) 밀집 행렬
+
+    장소 id는 지역구 카탈로그 내 순번이며, 최적화 루프에서는 문자열 키 조회 대신
+    배열 인덱싱으로 이동 정보를 조회한다.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, district: str, addresses: List[str], durations: np.ndarray, distances: np.ndarray):
+        self.district = district
+        self.addresses = list(addresses)
+        self.durations = durations
+        self.distances = distances
+        self.fingerprint = self.compute_fingerprint(self.addresses)
+
+    @property
+    def size(self) -> int:
+        return len(self.addresses)
+
+    @staticmethod
+    def compute_fingerprint(addresses: List[str]) -> str:
+        """카탈로그 주소 목록 해시 (카탈로그 변경 시 저장된 행렬 무효화)"""
+        digest = hashlib.sha256("\n".join(addresses).encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    @classmethod
+    def build(cls, district: str, locations: List[Dict],
+              travel_info: Callable[[str, str], Dict]) -> "TravelMatrix":
+        """장소 쌍마다 이동 정보를 한 번씩 조회해 행렬 생성"""
+        addresses = [loc["address"] for loc in locations]
+        size = len(addresses)
+        durations = np.zeros((size, size), dtype=np.float32)
+        distances = np.zeros((size, size), dtype=np.float32)
+
+        # 같은 주소 쌍은 한 번만 조회
+        resolved = {}
+        for i, origin in enumerate(addresses):
+            for j, destination in enumerate(addresses):
+                if i == j or origin == destination:
+                    continue
+                key = (origin, destination)
+                if key not in resolved:
+                    info = travel_info(origin, destination)
+                    resolved[key] = (info.get("duration", 20), info.get("distance", 3.0))
+                durations[i, j], distances[i, j] = resolved[key]
+
+        return cls(district, addresses, durations, distances)
+
+    def duration(self, i: int, j: int) -> float:
+        return float(self.durations[i, j])
+
+    def distance(self, i: int, j: int) -> float:
+        return float(self.distances[i, j])
+
+    def save(self, path: str) -> None:
+        """npz 형식으로 저장 (오프라인 재생성용)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # np.savez는 확장자를 자동으로 붙이므로 파일 객체로 저장
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                format_version=np.array(self.FORMAT_VERSION),
+                district=np.array(self.district),
+                addresses=np.array(self.addresses),
+                fingerprint=np.array(self.fingerprint),
+                durations=self.durations,
+                distances=self.distances,
+            )
+
+    @classmethod
+    def load(cls, path: str, expected_fingerprint: Optional[str] = None) -> Optional["TravelMatrix"]:
+        """저장된 행렬 로드. 파일이 없거나 카탈로그와 맞지 않으면 None"""
+        if not os.path.exists(path):
+            return None
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["format_version"]) != cls.FORMAT_VERSION:
+                return None
+            if expected_fingerprint is not None and str(data["fingerprint"]) != expected_fingerprint:
+                return None
+            return cls(
+                str(data["district"]),
+                [str(a) for a in data["addresses"]],
+                data["durations"],
+                data["distances"],
+            )
+
+    @staticmethod
+    def path_for(directory: str, district: str) -> str:
+        return os.path.join(directory, f"{district}.npz")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+일정 목록 조회 벤치마크 (일정 10만 건, (user_id, start_time, id) 인덱스 유무 비교)
+실행: python3 -m benchmarks.bench_schedule_listing
+"""
+
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.api.v1.schedule import list_user_schedules
+from app.db.session import Base
+from app.models.schedule import Schedule
+from app.models.user import User
+
+TOTAL_SCHEDULES = 100_000
+USERS = 50
+HEAVY_USER_SHARE = 0.2  # 긴 캠페인 일정을 가진 사용자 한 명의 비중
+PAGE_SIZE = 50
+
+def populate(engine, rng):
+    users = [f"user-{i}" for i in range(USERS)]
+    base = datetime(2024, 1, 1, 6)
+    rows = []
+    for i in range(TOTAL_SCHEDULES):
+        user_id = users[0] if rng.random() < HEAVY_USER_SHARE else rng.choice(users[1:])
+        start = base + timedelta(days=rng.randint(0, 365), minutes=30 * rng.randint(0, 30))
+        rows.append({
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "title": f"일정{i}",
+            "start_time": start,
+            "end_time": start + timedelta(minutes=60),
+            "user_id": user_id,
+            "location_id": "loc",
+        })
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {"id": user_id, "email": f"{user_id}@example.com", "name": user_id} for user_id in users
+        ])
+        conn.execute(Schedule.__table__.insert(), rows)
+    return users[0]
+
+def measure(fn, repeat=5):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings), len(result)
+
+def run_queries(factory, user_id):
+    db = factory()
+    try:
+        week_start = datetime(2024, 6, 3)
+        middle = list_user_schedules(db, user_id, limit=TOTAL_SCHEDULES // 20)[-1]
+        cases = [
+            ("전체 조회", lambda: list_user_schedules(db, user_id)),
+            ("한 주 기간", lambda: list_user_schedules(db, user_id, week_start, week_start + timedelta(days=7))),
+            ("첫 페이지", lambda: list_user_schedules(db, user_id, limit=PAGE_SIZE)),
+            ("중간 페이지", lambda: list_user_schedules(db, user_id, after=(middle.start_time, middle.id),
+                                                     limit=PAGE_SIZE)),
+        ]
+        results = []
+        for name, fn in cases:
+            db.expunge_all()
+            results.append((name,) + measure(fn))
+        return results
+    finally:
+        db.close()
+
+def main():
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine)
+        heavy_user = populate(engine, rng)
+
+        indexed = run_queries(factory, heavy_user)
+        for index in Schedule.__table__.indexes:
+            index.drop(bind=engine)
+        unindexed = run_queries(factory, heavy_user)
+        engine.dispose()
+
+    print(f"=== 일정 목록 조회 벤치마크 (전체 {TOTAL_SCHEDULES}건, 사용자 {USERS}명) ===")
+    print(f"{'조회':>10} {'건수':>8} {'인덱스 없음(ms)':>16} {'인덱스(ms)':>12}")
+    for (name, without_ms, count), (_, with_ms, _) in zip(unindexed, indexed):
+        print(f"{name:>10} {count:>8} {without_ms:>16.2f} {with_ms:>12.2f}")
+
+if __name__ == "__main__":
+    main()
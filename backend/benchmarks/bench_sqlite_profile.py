@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+SQLite 저장소 프로필 벤치마크 (동시 읽기/쓰기 처리량, default vs production)
+실행: python3 -m benchmarks.bench_sqlite_profile
+"""
+
+import os
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from app.api.v1.schedule import list_user_schedules
+from app.db.session import Base, create_sqlite_engine
+from app.models.schedule import Location, Schedule
+from app.models.user import User
+
+WRITERS = 4
+READERS = 8
+DURATION_SECONDS = 3.0
+SEED_SCHEDULES = 5000
+
+def seed(factory):
+    db = factory()
+    db.add(User(id="bench", email="bench@example.com", name="벤치"))
+    db.add(Location(id="loc", name="벤치역", address="벤치시 벤치로 1", district="벤치시"))
+    base = datetime(2024, 1, 1, 6)
+    db.add_all(
+        Schedule(title=f"일정{i}", start_time=base + timedelta(minutes=30 * i),
+                 end_time=base + timedelta(minutes=30 * i + 20), user_id="bench", location_id="loc")
+        for i in range(SEED_SCHEDULES)
+    )
+    db.commit()
+    db.close()
+
+def run(profile):
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_sqlite_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}", profile)
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        seed(factory)
+
+        counts = {"writes": 0, "reads": 0, "locked": 0}
+        lock = threading.Lock()
+        deadline = time.monotonic() + DURATION_SECONDS
+
+        def writer():
+            # 요청마다 일정 하나를 만들고 커밋하는 쓰기 요청
+            while time.monotonic() < deadline:
+                db = factory()
+                try:
+                    start = datetime(2025, 1, 1) + timedelta(minutes=uuid.uuid4().int % 100000)
+                    db.add(Schedule(title="새 일정", start_time=start, end_time=start + timedelta(minutes=30),
+                                    user_id="bench", location_id="loc"))
+                    db.commit()
+                    key = "writes"
+                except OperationalError:
+                    db.rollback()
+                    key = "locked"
+                finally:
+                    db.close()
+                with lock:
+                    counts[key] += 1
+
+        def reader():
+            # 주간 달력 한 페이지를 읽는 요청
+            week_start = datetime(2024, 2, 5)
+            while time.monotonic() < deadline:
+                db = factory()
+                try:
+                    list_user_schedules(db, "bench", week_start, week_start + timedelta(days=7), limit=50)
+                    key = "reads"
+                except OperationalError:
+                    key = "locked"
+                finally:
+                    db.close()
+                with lock:
+                    counts[key] += 1
+
+        threads = [threading.Thread(target=writer) for _ in range(WRITERS)] + \
+            [threading.Thread(target=reader) for _ in range(READERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+    return {key: value / DURATION_SECONDS for key, value in counts.items()}
+
+def main():
+    print(f"=== SQLite 프로필 벤치마크 (쓰기 {WRITERS}개, 읽기 {READERS}개 스레드, {DURATION_SECONDS}초) ===")
+    print(f"{'프로필':>12} {'쓰기/s':>10} {'읽기/s':>10} {'잠김 오류/s':>12}")
+    for profile in ("default", "production"):
+        result = run(profile)
+        print(f"{profile:>12} {result['writes']:>10.1f} {result['reads']:>10.1f} {result['locked']:>12.1f}")
+
+if __name__ == "__main__":
+    main()
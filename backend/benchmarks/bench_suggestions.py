@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+빈 시간대 일정 제안 벤치마크 (탐욕 배정 vs 이분 매칭 배정)
+실행: python3 -m benchmarks.bench_suggestions
+"""
+
+import contextlib
+import io
+import random
+import time
+from datetime import datetime, timedelta
+from app.services.optimization import ScheduleOptimizer
+
+TYPES = ["government", "transport", "public", "commercial", "education"]
+
+class BenchUser:
+    def __init__(self):
+        self.district = "벤치구"
+        self.activity_level = "hard"
+
+def make_catalogue(size, rng):
+    return [
+        {
+            "name": f"장소{i}",
+            "address": f"벤치시 벤치구 벤치로 {i}",
+            "type": rng.choice(TYPES),
+            "priority": rng.randint(1, 5),
+            "exposure": rng.randint(20, 300),
+        }
+        for i in range(size)
+    ]
+
+def make_slots(count, rng):
+    base = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    slots = []
+    for i in range(count):
+        start = base + timedelta(days=i % 7, hours=rng.randint(6, 20), minutes=rng.choice([0, 30]))
+        end = start + timedelta(minutes=rng.choice([15, 30, 45, 60, 90, 120]))
+        slots.append({"start": start.isoformat(), "end": end.isoformat(), "day": start.strftime("%A")})
+    return slots
+
+def measure(optimizer, user, slots, strategy, repeat=5):
+    timings = []
+    suggestions = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            suggestions = optimizer.suggest_schedules_for_empty_slots(user, slots, strategy=strategy)
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings), sum(s["score"] for s in suggestions)
+
+def main():
+    rng = random.Random(42)
+    optimizer = ScheduleOptimizer()
+    user = BenchUser()
+
+    print("=== 일정 제안 벤치마크 ===")
+    print(f"{'장소 수':>8} {'시간대 수':>8} {'탐욕(ms)':>10} {'매칭(ms)':>10} {'탐욕 점수':>10} {'매칭 점수':>10}")
+    for catalogue_size in (40, 500, 5000):
+        optimizer.locations[user.district] = make_catalogue(catalogue_size, rng)
+        optimizer._score_arrays.pop(user.district, None)
+        for slot_count in (7, 35, 119, 500):
+            slots = make_slots(slot_count, rng)
+            greedy_ms, greedy_score = measure(optimizer, user, slots, "greedy")
+            assign_ms, assign_score = measure(optimizer, user, slots, "assignment")
+            print(f"{catalogue_size:>8} {slot_count:>8} {greedy_ms:>10.2f} {assign_ms:>10.2f} "
+                  f"{greedy_score:>10.1f} {assign_score:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app.db.session import Base, create_app_engine, get_db
+
+class FakeUser:
+    """User ORM 객체 대신 최적화와 API 에 넘기는 사용자 (DB 에 저장하지 않음)"""
+
+    def __init__(self, user_id="test-user", district="군포시", activity_level="medium"):
+        self.id = user_id
+        self.email = f"{user_id}@example.com"
+        self.district = district
+        self.activity_level = activity_level
+
+@pytest.fixture
+def make_user():
+    """FakeUser(user_id, district, activity_level) 생성 함수"""
+    return FakeUser
+
+@pytest.fixture
+def override_dependency():
+    """app.dependency_overrides 에 의존성 교체 등록 (테스트가 끝나면 원래대로)"""
+    from app.main import app
+
+    previous = dict(app.dependency_overrides)
+
+    def override(dependency, replacement):
+        app.dependency_overrides[dependency] = replacement
+
+    yield override
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(previous)
+
+@pytest.fixture
+def db_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'test.db'}"
+
+@pytest.fixture
+def db_engine(db_url):
+    """테이블을 만든 임시 SQLite 파일 엔진"""
+    engine = create_app_engine(db_url)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def session_factory(db_engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
+
+@pytest.fixture
+def override_db(session_factory, override_dependency):
+    """API 의 get_db 를 임시 SQLite 세션으로 교체"""
+    def get_test_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    override_dependency(get_db, get_test_db)
+    return session_factory
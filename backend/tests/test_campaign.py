@@ -0,0 +1,98 @@
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.v1.auth import get_current_user
+from app.services import optimization as optimization_service
+from app.services.optimization import ScheduleOptimizer
+
+def _last_visits(plan):
+    visits = {}
+    for day_index, day in enumerate(plan["days"]):
+        for item in day["schedule"]:
+            visits.setdefault(item["location"], set()).add(day_index)
+    return visits
+
+def test_campaign_respects_revisit_gap(make_user):
+    """같은 장소를 재방문 간격 안에 다시 방문하지 않음"""
+    plan = ScheduleOptimizer().plan_campaign(make_user(), datetime(2024, 3, 1), datetime(2024, 3, 30), revisit_gap_days=7)
+
+    assert len(plan["days"]) == 30
+    assert all(day["schedule"] for day in plan["days"])
+    for days in _last_visits(plan).values():
+        ordered = sorted(days)
+        assert all(b - a >= 7 for a, b in zip(ordered, ordered[1:]))
+
+def test_campaign_covers_high_priority_locations(make_user):
+    """우선순위 기준 이상의 장소는 기간 중 최소 1회 방문"""
+    optimizer = ScheduleOptimizer()
+    plan = optimizer.plan_campaign(make_user(), datetime(2024, 3, 1), datetime(2024, 3, 10), high_priority_threshold=4)
+
+    visited = _last_visits(plan)
+    high_priority = {loc["name"] for loc in optimizer.locations["군포시"] if loc["priority"] >= 4}
+    assert plan["uncovered_locations"] == []
+    assert high_priority <= set(visited)
+
+def test_short_campaign_does_not_lose_to_single_day(make_user):
+    """재방문 간격보다 짧은 캠페인도 모든 장소를 후보로 써서 하루 계획보다 못하지 않음"""
+    optimizer = ScheduleOptimizer()
+    user = make_user(activity_level="hard")
+    single = optimizer.optimize_schedule(user, datetime(2024, 1, 15))
+    one_day = optimizer.plan_campaign(user, datetime(2024, 1, 15), datetime(2024, 1, 15), revisit_gap_days=7)
+    two_days = optimizer.plan_campaign(user, datetime(2024, 1, 15), datetime(2024, 1, 16), revisit_gap_days=7)
+
+    single_exposure = sum(item["exposure"] for item in single)
+    assert len(one_day["days"][0]["schedule"]) == len(single)
+    assert one_day["days"][0]["estimated_exposure"] >= single_exposure
+    assert len(two_days["days"][0]["schedule"]) == len(single)
+    assert sum(day["estimated_exposure"] for day in two_days["days"]) > single_exposure
+    assert len(_last_visits(two_days)) == sum(len(day["schedule"]) for day in two_days["days"])
+
+def test_campaign_endpoint_rejects_reversed_range(make_user, override_dependency):
+    """종료일이 시작일보다 앞서면 400"""
+    override_dependency(get_current_user, lambda: make_user())
+    response = TestClient(app).post("/api/v1/optimize-campaign", json={
+        "start_date": "2024-03-10T00:00:00",
+        "end_date": "2024-03-01T00:00:00"
+    })
+    assert response.status_code == 400
+
+def test_process_pool_is_created_once_with_spawn(monkeypatch):
+    """동시에 처음 사용해도 풀은 하나만, fork 대신 spawn, 기본 프로세스 수는 동시 최적화 작업 수 이하"""
+    created = []
+    class _Pool:
+        def __init__(self, max_workers, mp_context):
+            created.append((max_workers, mp_context.get_start_method()))
+    monkeypatch.setattr(optimization_service, "ProcessPoolExecutor", _Pool)
+    monkeypatch.setattr(optimization_service, "_process_pool", None)
+    monkeypatch.setattr(optimization_service.settings, "CAMPAIGN_MAX_WORKERS", 0)
+
+    pools = []
+    threads = [threading.Thread(target=lambda: pools.append(optimization_service._get_process_pool())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1 and len({id(pool) for pool in pools}) == 1
+    workers, method = created[0]
+    assert method == "spawn"
+    assert 1 <= workers <= optimization_service.settings.SOLVER_MAX_WORKERS
+
+def test_broken_process_pool_is_replaced(make_user, monkeypatch):
+    """작업 프로세스가 죽은 풀은 버리고 이번 요청은 순차 실행으로 완료"""
+    class _BrokenPool:
+        shut_down = False
+        def map(self, *args):
+            raise BrokenProcessPool("작업 프로세스 종료")
+        def shutdown(self, wait=True):
+            self.shut_down = True
+    broken = _BrokenPool()
+    monkeypatch.setattr(optimization_service, "_process_pool", broken)
+    monkeypatch.setattr(optimization_service.settings, "CAMPAIGN_MAX_WORKERS", 2)
+
+    plan = ScheduleOptimizer().plan_campaign(make_user(), datetime(2024, 3, 1), datetime(2024, 3, 3), time_budget_ms=20)
+
+    assert len(plan["days"]) == 3 and all(day["schedule"] for day in plan["days"])
+    assert broken.shut_down and optimization_service._process_pool is None
@@ -0,0 +1,136 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import selectinload, sessionmaker
+from app.core.config import settings
+from app.main import app
+from app.api.v1.auth import get_current_user
+from app.db.session import (
+    Base, async_database_url, create_app_engine, create_async_app_engine, create_sqlite_engine, database_url,
+    get_async_db
+)
+from app.models.schedule import Location, Schedule
+from app.models.user import User
+
+def _pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+def test_production_profile_applies_pragmas_on_connect(tmp_path):
+    """production 프로필은 연결마다 WAL, synchronous=NORMAL 등을 적용"""
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'prod.db'}", "production")
+    try:
+        assert _pragma(engine, "journal_mode") == "wal"
+        assert _pragma(engine, "synchronous") == 1  # NORMAL
+        assert _pragma(engine, "busy_timeout") == settings.SQLITE_BUSY_TIMEOUT_MS
+        assert _pragma(engine, "cache_size") == -settings.SQLITE_CACHE_SIZE_KB
+        assert _pragma(engine, "mmap_size") == settings.SQLITE_MMAP_SIZE_BYTES
+        assert engine.pool.size() == settings.DB_POOL_SIZE
+    finally:
+        engine.dispose()
+
+def test_default_profile_keeps_sqlite_defaults(tmp_path):
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'dev.db'}")
+    try:
+        assert _pragma(engine, "journal_mode") == "delete"
+    finally:
+        engine.dispose()
+    with pytest.raises(ValueError):
+        create_sqlite_engine(f"sqlite:///{tmp_path / 'x.db'}", "fast")
+
+def test_database_url_prefers_database_url(monkeypatch):
+    """DATABASE_URL 이 있으면 SQLITE_URL 대신 사용, postgres:// 는 postgresql:// 로"""
+    monkeypatch.setattr(settings, "DATABASE_URL", "postgres://user:pw@db:5432/app")
+    assert database_url() == "postgresql://user:pw@db:5432/app"
+    assert async_database_url(database_url()) == "postgresql+asyncpg://user:pw@db:5432/app"
+    monkeypatch.setattr(settings, "DATABASE_URL", None)
+    assert database_url() == settings.SQLITE_URL
+    assert async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    with pytest.raises(ValueError):
+        async_database_url("mysql://user@db/app")
+
+def test_server_database_gets_pre_ping_pool():
+    """PostgreSQL 엔진은 풀 크기, 초과 연결, pre-ping, 재연결 주기 설정 (생성만 하고 연결하지 않음)"""
+    engine = create_app_engine("postgresql://user:pw@localhost:5432/app")
+    try:
+        assert engine.dialect.name == "postgresql"
+        assert engine.pool.size() == settings.DB_POOL_SIZE
+        assert engine.pool._pre_ping is settings.DB_POOL_PRE_PING is True
+        assert engine.pool._recycle == settings.DB_POOL_RECYCLE_SECONDS
+    finally:
+        engine.dispose()
+
+@pytest.mark.parametrize("backend", ["sqlite", "postgresql"])
+def test_sync_and_async_sessions_share_data(tmp_path, backend):
+    """동기 세션으로 쓴 일정을 비동기 세션으로 장소와 함께 조회 (PostgreSQL 은 TEST_POSTGRES_URL 지정 시)"""
+    url = f"sqlite:///{tmp_path / 'roundtrip.db'}" if backend == "sqlite" else os.environ.get("TEST_POSTGRES_URL")
+    if url is None:
+        pytest.skip("TEST_POSTGRES_URL 이 없어 PostgreSQL 테스트를 건너뜀")
+    engine = create_app_engine(url, "production")
+    Base.metadata.create_all(bind=engine)
+    try:
+        db = sessionmaker(bind=engine)()
+        db.add(Location(id="db-loc", name="군포역", address="경기도 군포시 군포로 1", district="군포시"))
+        db.add(Schedule(id="db-s", title="출근 인사", start_time=datetime(2024, 1, 15, 7),
+                        end_time=datetime(2024, 1, 15, 8), user_id=None, location_id="db-loc"))
+        db.commit()
+        db.close()
+
+        async def read():
+            async_engine = create_async_app_engine(url, "production")
+            try:
+                async with async_sessionmaker(async_engine)() as session:
+                    schedule = (await session.execute(
+                        select(Schedule).options(selectinload(Schedule.location)).where(Schedule.id == "db-s")
+                    )).scalar_one()
+                    journal = None
+                    if backend == "sqlite":
+                        journal = (await session.execute(text("PRAGMA journal_mode"))).scalar()
+                    return schedule.title, schedule.location.name, journal
+            finally:
+                await async_engine.dispose()
+
+        title, location_name, journal = asyncio.run(read())
+        assert (title, location_name) == ("출근 인사", "군포역")
+        assert journal in (None, "wal")
+    finally:
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+def test_async_route_reads_through_async_session(tmp_path):
+    """재최적화 라우트는 비동기 세션으로 오늘 일정을 조회"""
+    url = f"sqlite:///{tmp_path / 'route.db'}"
+    engine = create_app_engine(url)
+    Base.metadata.create_all(bind=engine)
+    now = datetime.now()
+    db = sessionmaker(bind=engine)()
+    db.add(Location(id="route-loc", name="군포시청", address="경기도 군포시 청백리길 6", district="군포시"))
+    db.add(Schedule(id="route-s", title="현장 방문", start_time=now.replace(second=0, microsecond=0),
+                    end_time=now + timedelta(hours=1), user_id="route-user", location_id="route-loc"))
+    db.commit()
+    db.close()
+    engine.dispose()
+
+    async_engine = create_async_app_engine(url)
+    async def override_async_db():
+        async with async_sessionmaker(async_engine, expire_on_commit=False)() as session:
+            yield session
+
+    previous = dict(app.dependency_overrides)
+    app.dependency_overrides[get_async_db] = override_async_db
+    app.dependency_overrides[get_current_user] = lambda: User(
+        id="route-user", email="route@example.com", district="군포시", activity_level="medium")
+    try:
+        with TestClient(app) as client:
+            response = client.post("/api/v1/reoptimize-schedule", json={"date": now.isoformat(), "delay_minutes": 10})
+    finally:
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(previous)
+        asyncio.run(async_engine.dispose())
+
+    assert response.status_code == 200
+    assert response.json()["schedule"][0]["title"] == "현장 방문"
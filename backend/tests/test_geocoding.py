@@ -0,0 +1,177 @@
+import httpx
+import pytest
+from app.cli.geocode import geocode_catalogue
+from app.services import maps_service as maps_module
+from app.services.geocoding import (BatchGeocoder, GeocodeCache, Geocoder, GoogleGeocoder, NaverGeocoder,
+                                    StubGeocoder, TmapGeocoder, normalize_address)
+from app.services.location_catalogue import LocationCatalogue
+from app.services.maps_service import MapsService
+from app.services.provider_routing import ProviderHealth, ProviderUnavailable
+from app.services.single_flight import SingleFlight
+from app.services.travel_cache import TravelCache
+
+TABLE = {
+    "경기도 군포시 청백리길 6": (37.3617, 126.9352),
+    "경기도 군포시 번영로 485": (37.3583, 126.9329),
+}
+
+def test_normalize_address_merges_spelling_variants():
+    """공백, 쉼표, 괄호 설명만 다른 주소는 같은 키"""
+    assert normalize_address("경기도  군포시, 청백리길 6 (군포시청)") == normalize_address("경기도 군포시 청백리길 6")
+    assert normalize_address("경기도 군포시 청백리길 6") != normalize_address("경기도 군포시 청백리길 7")
+
+def test_each_address_is_geocoded_once_across_runs(tmp_path):
+    """정규화 주소당 제공자 호출은 한 번, 캐시는 재시작 후에도 유지"""
+    path = str(tmp_path / "geocode.db")
+    stub = StubGeocoder(TABLE)
+    addresses = ["경기도 군포시 청백리길 6", "경기도 군포시  청백리길 6", "경기도 군포시 번영로 485", "없는 주소"]
+
+    first = BatchGeocoder(stub, GeocodeCache(path)).geocode_all(addresses)
+    second = BatchGeocoder(stub, GeocodeCache(path)).geocode_all(addresses)
+
+    assert stub.calls == 3
+    assert first == second
+    assert first["경기도 군포시  청백리길 6"] == TABLE["경기도 군포시 청백리길 6"]
+    assert first["없는 주소"] is None
+    assert GeocodeCache(path).stats() == {"entries": 3, "missing": 1}
+
+def test_provider_errors_are_not_cached(tmp_path):
+    """제공자 오류는 기록하지 않아 다음 실행에서 다시 조회"""
+    class _Failing(StubGeocoder):
+        def geocode(self, address):
+            self.calls += 1
+            raise TimeoutError()
+
+    cache = GeocodeCache(str(tmp_path / "geocode.db"))
+    batch = BatchGeocoder(_Failing(), cache)
+
+    assert batch.geocode_all(["경기도 군포시 청백리길 6"]) == {"경기도 군포시 청백리길 6": None}
+    assert batch.failures == 1
+    assert cache.lookup("경기도 군포시 청백리길 6") == (False, None)
+
+def test_geocoder_requires_geocode():
+    """제공자는 geocode 를 구현해야 생성할 수 있음"""
+    class _Incomplete(Geocoder):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        _Incomplete()
+
+def test_repeated_lookups_are_served_from_memory(tmp_path):
+    """한 번 읽은 주소(미발견 포함)는 SQLite 를 다시 조회하지 않음"""
+    cache = GeocodeCache(str(tmp_path / "geocode.db"))
+    BatchGeocoder(StubGeocoder(TABLE), cache).geocode_all(["경기도 군포시 청백리길 6", "없는 주소"])
+    reader = GeocodeCache(str(tmp_path / "geocode.db"))
+    first = (reader.get("경기도 군포시 청백리길 6"), reader.lookup("없는 주소"), reader.lookup("새 주소"))
+
+    def fail():
+        raise AssertionError("SQLite 를 다시 조회하면 안 됩니다")
+    reader._connection = fail
+
+    assert first == (TABLE["경기도 군포시 청백리길 6"], (True, None), (False, None))
+    assert (reader.get("경기도  군포시, 청백리길 6"), reader.lookup("없는 주소"), reader.lookup("새 주소")) == first
+
+def test_catalogue_shards_receive_coordinates(tmp_path):
+    """일괄 작업이 카탈로그 샤드에 좌표를 기록"""
+    directory = str(tmp_path / "catalogue")
+    LocationCatalogue.write(directory, {"군포시": [
+        {"name": "군포시청", "address": "경기도 군포시 청백리길 6", "type": "government", "priority": 5, "exposure": 80},
+        {"name": "미확인", "address": "없는 주소", "type": "market", "priority": 2, "exposure": 10},
+    ]}, {"군포시 제1선거구": "군포시"}, version="1")
+    batch = BatchGeocoder(StubGeocoder(TABLE), GeocodeCache(str(tmp_path / "geocode.db")))
+
+    assert geocode_catalogue(batch, directory, version="2") == 1
+
+    catalogue = LocationCatalogue(directory)
+    assert catalogue.version == "2"
+    assert catalogue.resolve("군포시 제1선거구") == "군포시"
+    assert (catalogue["군포시"][0]["latitude"], catalogue["군포시"][0]["longitude"]) == TABLE["경기도 군포시 청백리길 6"]
+    assert catalogue["군포시"][1]["latitude"] is None
+
+def test_catalogue_version_changes_with_coordinates_by_default(tmp_path):
+    """--version 없이 좌표를 채우면 기존 버전 + 좌표 해시로 버전이 바뀜"""
+    directory = str(tmp_path / "catalogue")
+    LocationCatalogue.write(directory, {"군포시": [
+        {"name": "군포시청", "address": "경기도 군포시 청백리길 6", "type": "government", "priority": 5, "exposure": 80},
+    ]}, {}, version="2024.1")
+    moved = {"경기도 군포시 청백리길 6": (37.0, 127.0)}
+
+    geocode_catalogue(BatchGeocoder(StubGeocoder(TABLE), GeocodeCache(str(tmp_path / "a.db"))), directory)
+    first = LocationCatalogue(directory).version
+    geocode_catalogue(BatchGeocoder(StubGeocoder(TABLE), GeocodeCache(str(tmp_path / "a.db"))), directory)
+    unchanged = LocationCatalogue(directory).version
+    geocode_catalogue(BatchGeocoder(StubGeocoder(moved), GeocodeCache(str(tmp_path / "b.db"))), directory)
+    second = LocationCatalogue(directory).version
+
+    assert first.startswith("2024.1+geo.") and unchanged == first
+    assert second.startswith("2024.1+geo.") and second != first
+
+def test_tmap_uses_cached_coordinates_only(tmp_path, monkeypatch):
+    """T Map 요청은 캐시된 좌표를 쓰고, 좌표가 없으면 호출하지 않음"""
+    cache = GeocodeCache(str(tmp_path / "geocode.db"))
+    BatchGeocoder(StubGeocoder(TABLE), cache).geocode_all(TABLE)
+    monkeypatch.setattr(maps_module, "geocode_cache", cache)
+    sent = []
+
+    class _Response:
+        def json(self):
+            return {"status": 0, "features": [{"properties": {"totalTime": 600, "totalDistance": 1200}}]}
+
+    class _Client:
+        def get(self, url, **kwargs):
+            sent.append(kwargs["params"])
+            return _Response()
+
+    service = MapsService()
+    service.tmap_api_key = "key"
+    service.http = _Client()
+
+    result = service._get_tmap_directions("경기도 군포시 청백리길 6", "경기도 군포시 번영로 485", "transit")
+    with pytest.raises(ProviderUnavailable):
+        service._get_tmap_directions("경기도 군포시 청백리길 6", "없는 주소", "transit")
+
+    assert result["service"] == "tmap" and result["duration"] == 10
+    assert sent == [{**sent[0], "startX": "126.9352", "startY": "37.3617", "endX": "126.9329", "endY": "37.3583"}]
+
+def test_missing_coordinates_do_not_trip_breaker(tmp_path, monkeypatch):
+    """좌표가 없어 T Map 을 건너뛴 조회는 차단기에 실패로 남지 않고 다음 제공자로 넘어감"""
+    monkeypatch.setattr(maps_module, "geocode_cache", GeocodeCache(str(tmp_path / "geocode.db")))
+    monkeypatch.setattr(maps_module, "travel_cache", TravelCache(max_size=100))
+    monkeypatch.setattr(maps_module, "directions_flight", SingleFlight())
+    monkeypatch.setattr(maps_module, "provider_health", ProviderHealth(failure_threshold=1))
+    service = MapsService()
+    service.default_service = "tmap"
+    service.provider_chain = ["google"]
+    service.tmap_api_key = "key"
+    service.google_api_key = "key"
+    service.http = None  # 호출되면 실패
+    service._get_google_directions = lambda o, d, m: {"duration": 9, "distance": 1.0, "service": "google"}
+
+    results = [service.get_directions("시청", f"역 {i}") for i in range(3)]
+
+    assert [r["service"] for r in results] == ["google"] * 3
+    assert maps_module.provider_health.stats()["tmap"]["state"] == "closed"
+
+def test_provider_geocoders_use_the_shared_client_and_configured_urls():
+    """제공자 지오코더는 주입된(공용) HTTP 클라이언트로 설정된 기본 주소를 제한 시간과 함께 호출"""
+    seen = []
+    def respond(request):
+        seen.append((request.url.host, request.url.path, request.extensions["timeout"]["read"]))
+        if request.url.host == "google.test":
+            return httpx.Response(200, json={"status": "OK", "results": [
+                {"geometry": {"location": {"lat": 37.36, "lng": 126.93}}}]})
+        if request.url.host == "naver.test":
+            return httpx.Response(200, json={"addresses": [{"y": "37.36", "x": "126.93"}]})
+        return httpx.Response(200, json={"coordinateInfo": {"coordinate": [{"newLat": "37.36", "newLon": "126.93"}]}})
+    http = httpx.Client(transport=httpx.MockTransport(respond))
+
+    geocoders = [
+        GoogleGeocoder("key", base_url="http://google.test", http=http, timeout=3.0),
+        NaverGeocoder("id", "secret", base_url="http://naver.test/", http=http, timeout=3.0),
+        TmapGeocoder("key", base_url="http://tmap.test", http=http, timeout=3.0),
+    ]
+
+    assert [g.geocode("경기도 군포시 청백리길 6") for g in geocoders] == [(37.36, 126.93)] * 3
+    assert seen == [("google.test", "/maps/api/geocode/json", 3.0),
+                    ("naver.test", "/map-geocode/v2/geocode", 3.0),
+                    ("tmap.test", "/tmap/geo/fullAddrGeo", 3.0)]
@@ -0,0 +1,213 @@
+import threading
+import time
+from datetime import datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.v1 import jobs as jobs_api
+from app.api.v1.auth import get_current_user
+from app.models.job import OptimizationJob
+from app.models.user import User
+from app.services.job_queue import FAILED, QUEUED, RUNNING, SUCCEEDED, JobQueueFull, JobRunner
+
+@pytest.fixture
+def sessions(session_factory):
+    db = session_factory()
+    db.add(User(id="job-user", email="job@example.com", name="작업", district="군포시", activity_level="medium"))
+    db.commit()
+    db.close()
+    return session_factory
+
+def _wait(factory, job_id, statuses=(SUCCEEDED, FAILED), timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        db = factory()
+        job = db.query(OptimizationJob).filter(OptimizationJob.id == job_id).first()
+        db.close()
+        if job.status in statuses:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"작업이 끝나지 않았습니다: {job.status}")
+
+def test_identical_submissions_share_one_job(sessions):
+    """같은 요청은 끝나기 전까지 같은 작업, 끝난 뒤(성공/실패)에는 새로 실행"""
+    calls = []
+    def handler(db, user, params, report):
+        calls.append(params)
+        if params.get("fail"):
+            raise ValueError("실패")
+        return {"district": user.district, "n": params["n"]}
+
+    runner = JobRunner(sessions, {"echo": handler})
+    db = sessions()
+    first, created = runner.submit(db, "job-user", "echo", {"n": 1})
+    again, created_again = runner.submit(db, "job-user", "echo", {"n": 1})
+    finished = _wait(sessions, first.id)
+    after, after_created = runner.submit(db, "job-user", "echo", {"n": 1})
+    _wait(sessions, after.id)
+
+    failed, _ = runner.submit(db, "job-user", "echo", {"n": 2, "fail": True})
+    assert _wait(sessions, failed.id).error == "실패"
+    retried, retried_created = runner.submit(db, "job-user", "echo", {"n": 2, "fail": True})
+    _wait(sessions, retried.id)
+
+    assert created and not created_again and again.id == first.id
+    assert after_created and after.id != first.id
+    assert finished.status == SUCCEEDED and finished.result == '{"district": "군포시", "n": 1}'
+    assert retried_created and retried.id != failed.id
+    assert len(calls) == 4
+    assert runner.get(db, first.id, "job-user").status == SUCCEEDED
+    db.close()
+
+def test_expired_results_are_purged(sessions):
+    """결과 보관 기간이 지나면 조회되지 않고 다음 제출 때 삭제"""
+    runner = JobRunner(sessions, {"echo": lambda db, user, params, report: params}, result_ttl_seconds=0.2)
+    db = sessions()
+    job_id = runner.submit(db, "job-user", "echo", {"n": 1})[0].id
+    _wait(sessions, job_id)
+    assert runner.get(db, job_id, "job-user") is not None
+    assert runner.get(db, job_id, "someone-else") is None
+
+    time.sleep(0.25)
+    assert runner.get(db, job_id, "job-user") is None
+    fresh, created = runner.submit(db, "job-user", "echo", {"n": 1})
+
+    assert created and fresh.id != job_id
+    assert db.query(OptimizationJob).filter(OptimizationJob.id == job_id).count() == 0
+    db.close()
+
+def test_pending_limit_and_restart_recovery(sessions):
+    """사용자별 대기 작업 수 제한, 재시작 후 끝나지 않은 작업 재실행"""
+    gate = threading.Event()
+    def blocking(db, user, params, report):
+        gate.wait(5)
+        return params
+
+    runner = JobRunner(sessions, {"block": blocking}, max_pending_per_user=2)
+    db = sessions()
+    jobs = [runner.submit(db, "job-user", "block", {"n": n})[0] for n in (1, 2)]
+    with pytest.raises(JobQueueFull):
+        runner.submit(db, "job-user", "block", {"n": 3})
+    gate.set()
+    for job in jobs:
+        _wait(sessions, job.id)
+
+    # 이전 프로세스가 실행 도중 종료된 작업
+    stale = OptimizationJob(user_id="job-user", kind="block", params='{"n": 9}', dedup_key="stale",
+                            status=RUNNING, created_at=datetime.now() - timedelta(minutes=5))
+    db.add(stale)
+    db.commit()
+    stale_id = stale.id
+    db.close()
+
+    restarted = JobRunner(sessions, {"block": blocking})
+    assert restarted.recover() == 1
+    assert restarted.recover() == 0
+    assert _wait(sessions, stale_id).result == '{"n": 9}'
+
+def test_job_api_returns_partial_and_final_plan(sessions, override_db, override_dependency, monkeypatch):
+    """제출하면 202 와 작업 id, 같은 요청은 같은 작업, 조회로 최종 일정 확인"""
+    runner = JobRunner(sessions, jobs_api.job_runner.handlers, progress_interval_seconds=0.0)
+    monkeypatch.setattr(jobs_api, "job_runner", runner)
+
+    def override_user():
+        db = sessions()
+        user = db.query(User).filter(User.id == "job-user").first()
+        db.close()
+        return user
+
+    override_dependency(get_current_user, override_user)
+    client = TestClient(app)
+    body = {"date": "2024-01-15T00:00:00", "include_existing": False, "time_budget_ms": 100}
+    submitted = client.post("/api/v1/jobs/optimize-schedule", json=body)
+    duplicate = client.post("/api/v1/jobs/optimize-schedule", json=body)
+    job_id = submitted.json()["id"]
+    _wait(sessions, job_id)
+    polled = client.get(f"/api/v1/jobs/{job_id}")
+    missing = client.get("/api/v1/jobs/unknown")
+    invalid = client.post("/api/v1/jobs/optimize-campaign", json={
+        "start_date": "2024-01-15T00:00:00", "end_date": "2024-01-01T00:00:00"})
+
+    assert submitted.status_code == 202 and submitted.headers["Location"] == f"/api/v1/jobs/{job_id}"
+    assert submitted.json()["status"] in (QUEUED, RUNNING, SUCCEEDED)
+    assert duplicate.status_code == 200 and duplicate.json()["id"] == job_id
+    result = polled.json()
+    assert result["status"] == SUCCEEDED and result["result"]["schedule"]
+    assert result["progress"]["schedule"] == result["result"]["schedule"]
+    assert missing.status_code == 404
+    assert invalid.status_code == 400
+
+def test_recovery_leaves_jobs_with_live_leases_alone(sessions):
+    """다른 프로세스가 하트비트를 남기며 실행 중인 작업은 다시 실행하지 않고, 임대가 만료된 작업만 다시 실행"""
+    db = sessions()
+    now = datetime.now()
+    live = OptimizationJob(user_id="job-user", kind="echo", params='{"n": 1}', dedup_key="live", status=RUNNING,
+                           worker_id="other:1:live", created_at=now - timedelta(minutes=5), heartbeat_at=now)
+    dead = OptimizationJob(user_id="job-user", kind="echo", params='{"n": 2}', dedup_key="dead", status=RUNNING,
+                           worker_id="other:2:dead", created_at=now - timedelta(minutes=5),
+                           heartbeat_at=now - timedelta(minutes=2))
+    db.add_all([live, dead])
+    db.commit()
+    live_id, dead_id = live.id, dead.id
+    db.close()
+
+    calls = []
+    runner = JobRunner(sessions, {"echo": lambda db, user, params, report: calls.append(params) or params},
+                       lease_seconds=60)
+    assert runner.recover() == 1
+    finished = _wait(sessions, dead_id)
+
+    db = sessions()
+    assert db.query(OptimizationJob).filter(OptimizationJob.id == live_id).first().status == RUNNING
+    db.close()
+    assert calls == [{"n": 2}] and finished.worker_id == runner.worker_id
+
+def test_queued_job_runs_once_across_processes(sessions):
+    """두 프로세스가 같은 대기 작업을 실행하려 해도 조건부 시작으로 한 번만 실행"""
+    calls = []
+    def handler(db, user, params, report):
+        calls.append(params)
+        return params
+
+    first = JobRunner(sessions, {"echo": handler})
+    second = JobRunner(sessions, {"echo": handler})
+    first._recovered = second._recovered = True
+    db = sessions()
+    job = OptimizationJob(user_id="job-user", kind="echo", params='{"n": 1}', dedup_key="once", status=QUEUED,
+                          created_at=datetime.now())
+    db.add(job)
+    db.commit()
+    job_id = job.id
+    db.close()
+
+    threads = [threading.Thread(target=runner._run, args=(job_id,)) for runner in (first, second, first, second)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [{"n": 1}]
+    assert _wait(sessions, job_id).status == SUCCEEDED
+
+def test_result_is_dropped_after_losing_the_lease(sessions):
+    """임대가 만료되어 다른 프로세스가 가져간 작업의 늦은 결과는 기록하지 않음"""
+    gate = threading.Event()
+    started = threading.Event()
+    def slow(db, user, params, report):
+        started.set()
+        gate.wait(5)
+        return {"from": "slow"}
+
+    runner = JobRunner(sessions, {"echo": slow}, lease_seconds=60)
+    db = sessions()
+    job_id = runner.submit(db, "job-user", "echo", {"n": 1})[0].id
+    started.wait(5)
+    # 다른 프로세스가 임대 만료로 보고 다시 가져감
+    db.query(OptimizationJob).filter(OptimizationJob.id == job_id).update({"worker_id": "other:1:new"})
+    db.commit()
+    gate.set()
+    time.sleep(0.2)
+
+    job = db.query(OptimizationJob).populate_existing().filter(OptimizationJob.id == job_id).first()
+    assert job.status == RUNNING and job.worker_id == "other:1:new" and job.result is None
+    db.close()
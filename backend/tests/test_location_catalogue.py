@@ -0,0 +1,71 @@
+import json
+import os
+import pytest
+from datetime import datetime
+from app.services.location_catalogue import LocationCatalogue
+from app.services.optimization import ScheduleOptimizer
+
+def _catalogue(tmp_path, districts=("가구", "나구", "다구")):
+    data = {
+        district: [{"name": f"{district} 장소{i}", "address": f"{district} 주소 {i}", "type": "market",
+                    "priority": 3, "exposure": 50} for i in range(3)]
+        for district in districts
+    }
+    LocationCatalogue.write(str(tmp_path), data, {"가구 제1선거구 (가동)": "가구"}, version="test")
+    return data
+
+def test_shards_load_lazily_and_roundtrip(tmp_path):
+    """샤드는 처음 조회할 때만 읽고 원본과 같은 장소 목록을 돌려줌"""
+    data = _catalogue(tmp_path)
+    catalogue = LocationCatalogue(str(tmp_path))
+
+    assert catalogue.loads == 0
+    assert [{k: loc[k] for k in data["나구"][0]} for loc in catalogue["나구"]] == data["나구"]
+    assert catalogue["나구"][0]["latitude"] is None
+    assert catalogue["나구"] is catalogue.get("나구")
+    assert catalogue.loads == 1
+    assert sorted(catalogue.keys()) == sorted(data)
+
+def test_resident_districts_are_capped_by_lru(tmp_path):
+    """상주 지역구 수를 넘으면 가장 오래 쓰지 않은 샤드부터 내림"""
+    _catalogue(tmp_path)
+    catalogue = LocationCatalogue(str(tmp_path), max_resident=2)
+    evicted = []
+    catalogue.add_evict_listener(evicted.append)
+
+    catalogue.get("가구")
+    catalogue.get("나구")
+    catalogue.get("가구")
+    catalogue.get("다구")
+
+    assert evicted == ["나구"]
+    assert catalogue.resident_districts() == ["가구", "다구"]
+
+def test_district_names_resolve_through_index(tmp_path):
+    """선거구 이름은 별칭 색인, 없으면 시/구 이름으로 지역구에 매핑"""
+    _catalogue(tmp_path)
+    catalogue = LocationCatalogue(str(tmp_path))
+
+    assert catalogue.resolve("가구 제1선거구 (가동)") == "가구"
+    assert catalogue.resolve("나구 제2선거구 (나동)") == "나구"
+    assert catalogue.resolve("라구") is None
+    assert catalogue.get("라구", []) == []
+
+def test_shard_version_mismatch_is_rejected(tmp_path):
+    """색인과 버전이 다른 샤드는 읽지 않음"""
+    _catalogue(tmp_path)
+    path = os.path.join(str(tmp_path), "가구.json")
+    with open(path, encoding="utf-8") as f:
+        shard = json.load(f)
+    shard["version"] = "old"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(shard, f, ensure_ascii=False)
+
+    with pytest.raises(ValueError):
+        LocationCatalogue(str(tmp_path)).get("가구")
+
+def test_optimizer_resolves_electoral_district(make_user):
+    """선거구 이름으로 가입한 사용자도 지역구 카탈로그로 최적화"""
+    user = make_user(district="군포시 제1선거구 (군포1동, 산본1동, 금정동)")
+
+    assert ScheduleOptimizer().optimize_schedule(user, datetime(2024, 1, 15), time_budget_ms=50)
@@ -0,0 +1,72 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.schemas.optimization import LocationStatistics
+from app.services import optimization as optimization_service
+from app.services.location_catalogue import LocationCatalogue
+from app.services.location_stats import location_zone, summarize_locations
+from app.services.optimization import ScheduleOptimizer
+
+def _locations():
+    return [
+        {"name": "시청", "address": "경기도 가시 청사로 1", "type": "government", "priority": 5, "exposure": 80},
+        {"name": "역", "address": "경기도 가시 역전로 10", "type": "transport", "priority": 4, "exposure": 100},
+        {"name": "시장", "address": "경기도 가시 역전로 22", "type": "commercial", "priority": 3, "exposure": 60},
+        {"name": "마트", "address": "경기도 가시 시장길 3", "type": "commercial", "priority": 3, "exposure": 20},
+        {"name": "상가", "address": "", "type": "commercial", "priority": 2, "exposure": 40, "zone": "중앙"},
+    ]
+
+def test_summary_has_percentiles_histogram_and_zones():
+    """유형별 노출도 백분위, 우선순위 분포, 권역(도로명) 합계"""
+    stats = summarize_locations(_locations())
+
+    assert LocationStatistics(**stats).total_locations == 5
+    assert stats["total_exposure"] == 300
+    assert stats["by_type"]["commercial"] == {"count": 3, "total_exposure": 120, "exposure_p50": 40.0, "exposure_p90": 56.0}
+    assert stats["priority_histogram"] == {"2": 1, "3": 2, "4": 1, "5": 1}
+    assert list(stats["by_zone"]) == ["역전로", "청사로", "중앙", "시장길"]
+    assert stats["by_zone"]["역전로"] == {"count": 2, "total_exposure": 160, "high_priority": 1}
+    assert location_zone({"address": "서울특별시 서대문구 충정로3가 18-57"}) == "충정로3가"
+
+def test_statistics_are_materialized_once_per_load(tmp_path, monkeypatch):
+    """통계는 처음 조회할 때 한 번 계산하고, 샤드가 내려가도 유지하며 등록한 장소가 바뀌면 다시 계산"""
+    calls = []
+    def counting(locations):
+        calls.append(len(locations))
+        return summarize_locations(locations)
+    monkeypatch.setattr(optimization_service, "summarize_locations", counting)
+
+    LocationCatalogue.write(str(tmp_path / "v1"), {"가시": _locations(), "나시": _locations()}, {}, version="v1")
+    LocationCatalogue.write(str(tmp_path / "v2"), {"가시": _locations()}, {}, version="v2")
+    optimizer = ScheduleOptimizer(LocationCatalogue(str(tmp_path / "v1"), max_resident=1))
+
+    first = optimizer.location_statistics("가시")
+    assert optimizer.location_statistics("가시 제1선거구") is first
+    optimizer.locations.get("나시")  # 가시 샤드는 내려감
+    assert optimizer.location_statistics("가시") is first
+    assert calls == [5]
+    optimizer.locations["가시"] = _locations()[:3]
+    assert optimizer.location_statistics("가시").statistics["total_locations"] == 3
+    assert calls == [5, 3]
+
+    updated = ScheduleOptimizer(LocationCatalogue(str(tmp_path / "v2"))).location_statistics("가시")
+    assert updated.body == first.body and updated.etag != first.etag
+    assert optimizer.location_statistics("없는시") is None
+
+def test_repeated_polls_get_not_modified(monkeypatch):
+    """ETag 가 같으면 집계 없이 304, 다르면 전체 통계"""
+    client = TestClient(app)
+    first = client.get("/api/v1/location-statistics/군포시")
+    etag = first.headers["ETag"]
+
+    def fail(locations):
+        raise AssertionError("다시 집계하면 안 됩니다")
+    monkeypatch.setattr(optimization_service, "summarize_locations", fail)
+    polled = client.get("/api/v1/location-statistics/군포시", headers={"If-None-Match": etag})
+    stale = client.get("/api/v1/location-statistics/군포시", headers={"If-None-Match": '"old"'})
+    unknown = client.get("/api/v1/location-statistics/없는시")
+
+    assert first.status_code == 200 and etag.startswith('"') and not etag.startswith("W/")
+    assert first.json()["district"] == "군포시" and first.json()["statistics"]["by_zone"]
+    assert polled.status_code == 304 and polled.content == b"" and polled.headers["ETag"] == etag
+    assert stale.status_code == 200 and stale.json() == first.json()
+    assert unknown.json() == {"district": "없는시", "statistics": {}}
@@ -0,0 +1,169 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import pytest
+from app.services import maps_service as maps_module
+from app.services.maps_service import MapsService
+from app.services.quota import QuotaScheduler
+from app.services.travel_cache import TravelCache
+
+def _minutes(origin, destination):
+    return 5 + (int(origin.split()[-1]) * 7 + int(destination.split()[-1]) * 3) % 40
+
+class _StubMatrixServer:
+    """Google Distance Matrix 형식으로 응답하는 로컬 HTTP 서버"""
+
+    def __init__(self, delay=0.05):
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self.ports = set()
+        lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def do_GET(self):
+                with lock:
+                    stub.active += 1
+                    stub.max_active = max(stub.max_active, stub.active)
+                    stub.ports.add(self.client_address[1])
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                origins = query["origins"][0].split("|")
+                destinations = query["destinations"][0].split("|")
+                stub.requests.append((len(origins), len(destinations)))
+                time.sleep(delay)
+                rows = [{"elements": [
+                    {"status": "OK", "duration": {"value": _minutes(o, d) * 60}, "distance": {"value": 1000 + _minutes(o, d) * 100}}
+                    if o != "주소 13" else {"status": "NOT_FOUND"}
+                    for d in destinations
+                ]} for o in origins]
+                body = json.dumps({"status": "OK", "rows": rows}).encode("utf-8")
+                with lock:
+                    stub.active -= 1
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    server = _StubMatrixServer()
+    monkeypatch.setattr(maps_module, "travel_cache", TravelCache(max_size=10000))
+    monkeypatch.setattr(maps_module, "quota_scheduler", QuotaScheduler())
+    yield server
+    server.close()
+
+def _service(url, concurrency=4):
+    service = MapsService()
+    service.default_service = "google"
+    service.google_api_key = "key"
+    service.google_base_url = url
+    service.matrix_concurrency = concurrency
+    return service
+
+def test_matrix_is_fetched_in_blocks_concurrently(stub_server):
+    """40x40 행렬을 블록 16번으로, 동시 실행 한도 안에서 조회"""
+    addresses = [f"주소 {i}" for i in range(40)]
+    service = _service(stub_server.url, concurrency=4)
+
+    started = time.perf_counter()
+    durations, distances = service.get_distance_matrix(addresses, addresses)
+    elapsed = time.perf_counter() - started
+
+    assert len(stub_server.requests) == 16
+    assert all(o * d <= 100 for o, d in stub_server.requests)
+    assert 1 < stub_server.max_active <= 4
+    assert len(stub_server.ports) <= 4  # 연결 재사용
+    assert elapsed < 16 * 0.05
+    assert durations[3, 8] == _minutes("주소 3", "주소 8")
+    assert distances[3, 8] == pytest.approx((1000 + _minutes("주소 3", "주소 8") * 100) / 1000)
+
+def test_fetched_pairs_are_cached(stub_server):
+    """조회한 쌍은 캐시되어 행렬과 단일 경로 조회 모두 다시 요청하지 않음"""
+    addresses = [f"주소 {i}" for i in range(4)]
+    service = _service(stub_server.url)
+
+    first, _ = service.get_distance_matrix(addresses, addresses)
+    second, _ = service.get_distance_matrix(addresses, addresses)
+    single = service.get_directions("주소 1", "주소 3")
+
+    assert len(stub_server.requests) == 1
+    assert (first == second).all()
+    assert single["service"] == "google" and single["duration"] == _minutes("주소 1", "주소 3")
+
+def test_failed_elements_fall_back(stub_server):
+    """실패한 칸은 대체값, 같은 주소는 0으로 채우고 캐시에 남기지 않음"""
+    addresses = [f"주소 {i}" for i in range(12, 16)]
+    service = _service(stub_server.url)
+
+    durations, _ = service.get_distance_matrix(addresses, addresses)
+
+    assert durations[0, 0] == 0
+    assert durations[0, 1] == _minutes("주소 12", "주소 13")
+    assert durations[1, 2] == service._get_fallback_directions("주소 13", "주소 14", "transit")["duration"]
+    assert maps_module.travel_cache.get("주소 13", "주소 14", "transit", "google") is None
+
+def _directions(provider, calls):
+    def fetch(origin, destination, mode):
+        calls.append((origin, destination, mode))
+        minutes = _minutes(origin, destination)
+        return {"duration": minutes, "distance": minutes / 10, "route": f"{origin} → {destination}",
+                "transport_mode": mode, "service": provider}
+    return fetch
+
+def test_provider_without_matrix_api_uses_directions(stub_server):
+    """행렬 API 가 없는 naver 는 쌍마다 경로 조회 (대체값으로 채우지 않음)"""
+    addresses = [f"주소 {i}" for i in range(3)]
+    service = MapsService()
+    service.default_service = "naver"
+    service.naver_client_id = "id"
+    service.provider_chain = []
+    calls = []
+    service._get_naver_directions = _directions("naver", calls)
+
+    durations, _ = service.get_distance_matrix(addresses, addresses)
+    service.get_distance_matrix(addresses, addresses)
+
+    assert len(calls) == 6 and service.fetched_elements == 6
+    assert durations[0, 0] == 0 and durations[1, 2] == _minutes("주소 1", "주소 2")
+    assert maps_module.travel_cache.get("주소 1", "주소 2", "transit", "naver")["service"] == "naver"
+
+def test_tmap_matrix_only_serves_supported_modes(stub_server):
+    """T Map 행렬은 자동차(driving) 조회에만 쓰고 그 이동수단으로 캐시, 다른 이동수단은 쌍마다 조회"""
+    addresses = [f"주소 {i}" for i in range(2)]
+    service = MapsService()
+    service.default_service = "tmap"
+    service.tmap_api_key = "key"
+    service.provider_chain = []
+    blocks, calls = [], []
+
+    def fetch_block(origins, destinations, mode):
+        blocks.append((mode, service.TMAP_MATRIX_MODES[mode]))
+        return {(0, 1): (7, 1.5), (1, 0): (8, 1.6)}
+    service._fetch_tmap_matrix_block = fetch_block
+    service._get_tmap_directions = _directions("tmap", calls)
+
+    driving, _ = service.get_distance_matrix(addresses, addresses, "driving")
+    transit, _ = service.get_distance_matrix(addresses, addresses, "transit")
+
+    assert blocks == [("driving", "car")]
+    assert driving[0, 1] == 7 and maps_module.travel_cache.get("주소 0", "주소 1", "driving", "tmap")["duration"] == 7
+    assert [mode for _, _, mode in calls] == ["transit", "transit"]
+    assert transit[0, 1] == _minutes("주소 0", "주소 1")
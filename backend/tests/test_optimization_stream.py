@@ -0,0 +1,52 @@
+import time
+import pytest
+from datetime import datetime
+from fastapi import WebSocketDisconnect
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.v1.auth import get_websocket_user
+from app.services.optimization import ScheduleOptimizer
+
+def test_improvements_are_monotone_and_final_is_best(make_user):
+    """개선 콜백의 목적 함수 값은 증가하고, 마지막 개선이 최종 결과"""
+    improvements = []
+    schedule = ScheduleOptimizer().optimize_schedule(
+        make_user(), datetime(2024, 1, 15), time_budget_ms=300,
+        on_improvement=lambda plan, objective: improvements.append((plan, objective))
+    )
+
+    objectives = [objective for _, objective in improvements]
+    assert objectives and objectives == sorted(objectives)
+    assert improvements[-1][0] == schedule
+
+def test_time_budget_bounds_latency(make_user):
+    """시간 예산이 끝나면 그때까지의 최선 일정을 반환"""
+    optimizer = ScheduleOptimizer()
+    optimizer.optimize_schedule(make_user(), datetime(2024, 1, 15), time_budget_ms=10)
+
+    started = time.perf_counter()
+    schedule = optimizer.optimize_schedule(make_user(), datetime(2024, 1, 15), time_budget_ms=20)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    assert schedule
+    assert elapsed_ms < 20 * 3
+
+def test_stream_sends_improvements_then_final(make_user, override_dependency):
+    """WebSocket 으로 개선 일정을 보내고 최종 일정으로 끝냄"""
+    override_dependency(get_websocket_user, lambda: make_user())
+    with TestClient(app).websocket_connect("/api/v1/optimize-schedule/stream?token=x") as websocket:
+        websocket.send_json({"date": "2024-01-15T00:00:00", "time_budget_ms": 100})
+        messages = []
+        while not messages or messages[-1]["type"] != "final":
+            messages.append(websocket.receive_json())
+
+    assert messages[0]["type"] == "improvement"
+    assert messages[0]["schedule"]
+    assert messages[-1]["objective"] == max(m["objective"] for m in messages)
+    assert messages[-1]["schedule"] == messages[-2]["schedule"]
+
+def test_stream_rejects_missing_token():
+    """토큰 없이 연결하면 거부"""
+    with pytest.raises(WebSocketDisconnect):
+        with TestClient(app).websocket_connect("/api/v1/optimize-schedule/stream") as websocket:
+            websocket.receive_json()
@@ -0,0 +1,171 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from app.services import maps_service as maps_module
+from app.services.maps_service import MapsService
+from app.services.provider_routing import CircuitBreaker, ProviderHealth, ProviderRouter
+from app.services.single_flight import SingleFlight
+from app.services.travel_cache import TravelCache
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class _StubDirectionsServer:
+    """Google/Naver 경로 API 형식으로 응답하는 로컬 HTTP 서버 (지연, 실패 주입)"""
+
+    def __init__(self, provider, minutes, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub.requests += 1
+                time.sleep(stub.delay)
+                if provider == "google":
+                    data = {"status": "OVER_QUERY_LIMIT", "routes": []} if stub.fail else {"status": "OK", "routes": [
+                        {"legs": [{"duration": {"value": minutes * 60}, "distance": {"value": 2500}}]}]}
+                else:
+                    data = {"code": 1} if stub.fail else {"code": 0, "route": {"trafast": [
+                        {"summary": {"duration": minutes * 60000, "distance": 2500}}]}}
+                body = json.dumps(data).encode("utf-8")
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except OSError:
+                    pass  # 제한 시간이 지나 클라이언트가 끊은 경우
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def stubs(monkeypatch):
+    monkeypatch.setattr(maps_module, "travel_cache", TravelCache(max_size=100))
+    monkeypatch.setattr(maps_module, "directions_flight", SingleFlight())
+    monkeypatch.setattr(maps_module, "provider_health", ProviderHealth(failure_threshold=3, reset_seconds=60))
+    google = _StubDirectionsServer("google", minutes=11)
+    naver = _StubDirectionsServer("naver", minutes=13)
+    yield google, naver
+    google.close()
+    naver.close()
+
+def _service(google, naver, attempt_timeout=0.3, deadline=0.6, hedge=False):
+    service = MapsService()
+    service.default_service = "google"
+    service.provider_chain = ["google", "naver"]
+    service.google_api_key = "key"
+    service.naver_client_id = "id"
+    service.naver_client_secret = "secret"
+    service.tmap_api_key = ""
+    service.google_base_url = google.url
+    service.naver_base_url = naver.url
+    service.attempt_timeout = attempt_timeout
+    service.request_deadline = deadline
+    service.hedge = hedge
+    service.hedge_delay = 0.05
+    return service
+
+def _timed(service, origin, destination):
+    started = time.perf_counter()
+    result = service.get_directions(origin, destination)
+    return result, time.perf_counter() - started
+
+def test_circuit_breaker_opens_and_probes_once():
+    """연속 실패로 열리고, 대기 후 시험 요청 하나만 허용"""
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=10, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    clock.now = 10
+    assert breaker.allow() and not breaker.allow()  # half_open 시험 요청은 하나
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+def test_slow_primary_fails_over_within_attempt_timeout(stubs):
+    """기본 제공자가 느리면 시도 제한 시간 뒤 다음 제공자 응답 사용"""
+    google, naver = stubs
+    google.delay = 2.0
+    service = _service(google, naver, attempt_timeout=0.2, deadline=0.6)
+
+    result, elapsed = _timed(service, "시청", "역")
+
+    assert result["service"] == "naver" and result["duration"] == 13
+    assert 0.2 <= elapsed < 0.6
+    assert maps_module.travel_cache.get("시청", "역", "transit", "naver") is not None
+
+def test_hedged_request_bounds_tail_latency(stubs):
+    """예비 요청을 켜면 제한 시간보다 훨씬 이른 시점에 다음 제공자로 응답"""
+    google, naver = stubs
+    google.delay = 0.5
+    service = _service(google, naver, attempt_timeout=2.0, deadline=3.0, hedge=True)
+
+    result, elapsed = _timed(service, "시청", "역")
+
+    assert result["service"] == "naver"
+    assert elapsed < 0.4
+    assert google.requests == 1 and naver.requests == 1
+
+def test_deadline_bounds_wait_when_every_provider_is_slow(stubs):
+    """모든 제공자가 느려도 전체 대기는 제한 시간 안에 끝나고 대체값 반환"""
+    google, naver = stubs
+    google.delay = naver.delay = 2.0
+    service = _service(google, naver, attempt_timeout=0.1, deadline=0.3)
+
+    result, elapsed = _timed(service, "시청", "역")
+
+    assert result["service"] == "fallback"
+    assert elapsed < 0.5
+
+def test_open_circuits_skip_failing_providers(stubs):
+    """실패가 이어진 제공자는 차단되어 대기 없이 바로 대체값 반환"""
+    google, naver = stubs
+    google.fail = naver.fail = True
+    service = _service(google, naver)
+
+    for i in range(3):
+        assert service.get_directions("시청", f"역 {i}")["service"] == "fallback"
+    result, elapsed = _timed(service, "시청", "역 3")
+
+    health = maps_module.provider_health.stats()
+    assert result["service"] == "fallback" and elapsed < 0.05
+    assert google.requests == naver.requests == 3
+    assert health["google"]["state"] == health["naver"]["state"] == "open"
+
+def test_providers_are_ordered_by_observed_latency():
+    """응답 시간 표본이 있는 제공자는 빠른 순서, 표본이 없으면 설정 순서로 뒤에"""
+    health = ProviderHealth()
+    router = ProviderRouter(health, executor=None)
+    for _ in range(5):
+        health.latency("google").record(0.4)
+        health.latency("naver").record(0.1)
+
+    assert router.order(["google", "naver", "tmap"]) == ["naver", "google", "tmap"]
+    assert router.order(["tmap", "google"]) == ["google", "tmap"]
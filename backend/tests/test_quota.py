@@ -0,0 +1,154 @@
+import threading
+import time
+from datetime import datetime
+import pytest
+from app.cli.prewarm_travel_cache import in_window, parse_window, prewarm_districts
+from app.services import maps_service as maps_module
+from app.services.location_catalogue import LocationCatalogue
+from app.services.maps_service import MapsService
+from app.services.optimization import ScheduleOptimizer
+from app.services.provider_routing import ProviderHealth
+from app.services.quota import BACKGROUND, INTERACTIVE, QuotaScheduler
+from app.services.single_flight import SingleFlight
+from app.services.travel_cache import TravelCache
+
+def test_bucket_limits_rate_after_burst():
+    """버킷 용량만큼은 바로, 이후에는 초당 한도 속도로 허용"""
+    scheduler = QuotaScheduler({"google": 20.0}, burst_seconds=0.1)  # 용량 2
+
+    started = time.perf_counter()
+    assert all(scheduler.acquire("google") for _ in range(6))
+    elapsed = time.perf_counter() - started
+
+    assert 0.15 <= elapsed < 0.4
+    assert scheduler.stats()["google"]["granted"][INTERACTIVE] == 6
+    assert scheduler.acquire("unlimited", cost=10 ** 6, timeout=0)
+
+def test_background_leaves_reserve_for_interactive():
+    """백그라운드는 버킷 절반을 남기고, 대화형 요청은 남은 토큰을 쓸 수 있음"""
+    scheduler = QuotaScheduler({"google": 10.0}, burst_seconds=1.0, background_reserve=0.5)  # 용량 10
+
+    background = [scheduler.acquire("google", priority=BACKGROUND, timeout=0) for _ in range(6)]
+    interactive = [scheduler.acquire("google", priority=INTERACTIVE, timeout=0) for _ in range(5)]
+
+    assert background == [True] * 5 + [False]
+    assert interactive == [True] * 5
+    assert scheduler.stats()["google"]["rejected"][BACKGROUND] == 1
+
+def test_interactive_waiter_is_served_before_background():
+    """빈 버킷에서 나중에 온 대화형 요청이 먼저 기다리던 백그라운드 요청보다 먼저 허용"""
+    scheduler = QuotaScheduler({"google": 10.0}, burst_seconds=0.1, background_reserve=0.0)  # 용량 1
+    assert scheduler.acquire("google")
+    order = []
+
+    def take(priority):
+        scheduler.acquire("google", priority=priority)
+        order.append(priority)
+
+    background = threading.Thread(target=take, args=(BACKGROUND,))
+    background.start()
+    time.sleep(0.02)
+    interactive = threading.Thread(target=take, args=(INTERACTIVE,))
+    interactive.start()
+    background.join(2)
+    interactive.join(2)
+
+    assert order == [INTERACTIVE, BACKGROUND]
+
+def test_oversized_cost_is_rejected_instead_of_taking_debt():
+    """한 번에 얻을 수 없는 비용은 바로 거절하고, 버킷은 음수가 되지 않음"""
+    scheduler = QuotaScheduler({"tmap": 5.0}, burst_seconds=2.0, background_reserve=0.5)  # 용량 10
+
+    assert scheduler.max_cost("tmap", BACKGROUND) == 5
+    assert scheduler.max_cost("tmap", INTERACTIVE) == 10
+    assert scheduler.max_cost("unlimited") is None
+    assert not scheduler.acquire("tmap", cost=900, priority=BACKGROUND)
+    assert scheduler.acquire("tmap", cost=5, priority=BACKGROUND, timeout=0)
+    assert scheduler.acquire("tmap", cost=5, priority=INTERACTIVE, timeout=0)
+    assert scheduler.stats()["tmap"]["tokens"] >= 0
+    assert scheduler.stats()["tmap"]["rejected"][BACKGROUND] == 1
+
+def test_background_matrix_block_leaves_room_for_interactive(monkeypatch):
+    """백그라운드 30x30 블록은 한도 안의 조각으로 나눠 조회하고, 직후 대화형 요청은 기다리지 않음"""
+    monkeypatch.setattr(maps_module, "travel_cache", TravelCache(max_size=10000))
+    monkeypatch.setattr(maps_module, "quota_scheduler", QuotaScheduler({"tmap": 2000.0}, burst_seconds=0.1))  # 용량 200
+    addresses = [f"주소 {i}" for i in range(30)]
+    sizes = []
+
+    def fetch_block(origins, destinations, mode):
+        sizes.append(len(origins) * len(destinations))
+        return {(i, j): (10.0, 2.0) for i in range(len(origins)) for j in range(len(destinations))}
+
+    background = MapsService(priority=BACKGROUND)
+    background.default_service = "tmap"
+    background.tmap_api_key = "key"
+    background._fetch_tmap_matrix_block = fetch_block
+    durations, _ = background.get_distance_matrix(addresses, addresses, "driving")
+
+    assert sum(sizes) == 900 and max(sizes) <= 100
+    assert durations[3, 8] == 10
+    assert maps_module.quota_scheduler.acquire("tmap", cost=1, priority=INTERACTIVE, timeout=0.05)
+
+def test_exhausted_quota_falls_back_without_tripping_breaker(monkeypatch):
+    """한도를 넘은 대화형 요청은 짧게 기다린 뒤 대체값으로, 차단기에는 실패로 남지 않음"""
+    monkeypatch.setattr(maps_module, "travel_cache", TravelCache(max_size=100))
+    monkeypatch.setattr(maps_module, "directions_flight", SingleFlight())
+    monkeypatch.setattr(maps_module, "provider_health", ProviderHealth(failure_threshold=1))
+    monkeypatch.setattr(maps_module, "quota_scheduler", QuotaScheduler({"google": 1.0}, burst_seconds=1.0))
+    service = MapsService()
+    service.default_service = "google"
+    service.provider_chain = ["google"]
+    service.google_api_key = "key"
+    service.rate_wait = 0.05
+    service._get_google_directions = lambda o, d, m: {"duration": 9, "distance": 1.0, "service": "google"}
+
+    first = service.get_directions("시청", "역")
+    second = service.get_directions("시청", "시장")
+
+    assert first["service"] == "google"
+    assert second["service"] == "fallback"
+    assert maps_module.provider_health.stats()["google"]["state"] == "closed"
+
+def test_prewarm_window_crosses_midnight():
+    window = parse_window("23:30-05:00")
+    assert in_window(window, datetime(2024, 3, 1, 23, 45))
+    assert in_window(window, datetime(2024, 3, 2, 4, 59))
+    assert not in_window(window, datetime(2024, 3, 2, 5, 0))
+    assert not in_window(parse_window("01:00-06:00"), datetime(2024, 3, 2, 12, 0))
+
+def test_prewarm_fills_cache_for_interactive_lookups(tmp_path, monkeypatch):
+    """사전 채우기 후 대화형 경로 조회는 제공자를 호출하지 않고 캐시에서 응답"""
+    cache = TravelCache(max_size=1000, db_path=str(tmp_path / "travel.db"))
+    monkeypatch.setattr(maps_module, "travel_cache", cache)
+    monkeypatch.setattr(maps_module, "directions_flight", SingleFlight())
+    monkeypatch.setattr(maps_module, "quota_scheduler", QuotaScheduler({"google": 1000.0}))
+    directory = str(tmp_path / "catalogue")
+    LocationCatalogue.write(directory, {
+        "가구": [{"name": f"장소{i}", "address": f"가구 {i}", "type": "market", "priority": 3, "exposure": 50} for i in range(12)],
+        "나구": [{"name": f"장소{i}", "address": f"나구 {i}", "type": "market", "priority": 3, "exposure": 50} for i in range(3)],
+    }, {}, version="1")
+    optimizer = ScheduleOptimizer(LocationCatalogue(directory))
+
+    def fetch_block(origins, destinations, mode):
+        return {(i, j): (10.0, 2.0) for i in range(len(origins)) for j in range(len(destinations))}
+
+    background = MapsService(priority=BACKGROUND)
+    background.default_service = "google"
+    background.google_api_key = "key"
+    background._fetch_google_matrix_block = fetch_block
+
+    first = prewarm_districts(optimizer, background, ["가구", "나구"], ["transit"])
+    second = prewarm_districts(optimizer, background, ["가구", "나구"], ["transit"])
+    stopped = prewarm_districts(optimizer, background, ["가구"], ["walking"], should_stop=lambda: True)
+
+    assert first == {"가구": 144, "나구": 9}
+    assert second == {"가구": 0, "나구": 0}
+    assert stopped == {}
+    assert maps_module.quota_scheduler.stats()["google"]["granted"][BACKGROUND] == 4 + 1
+
+    interactive = MapsService()
+    interactive.default_service = "google"
+    interactive.google_api_key = "key"
+    interactive._get_google_directions = lambda o, d, m: pytest.fail("캐시에 있어야 함")
+    assert interactive.get_directions("가구 3", "가구 11")["duration"] == 10
+    assert cache.stats()["persistent_size"] == 12 * 11 + 3 * 2
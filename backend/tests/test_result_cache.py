@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.v1 import optimization as optimization_api
+from app.api.v1 import schedule as schedule_api
+from app.api.v1.auth import get_current_user
+from app.models.user import User
+from app.services.result_cache import ResultCache
+
+def test_invalidation_is_per_user_and_drops_stale_writes():
+    """무효화는 해당 사용자 항목만 지우고, 계산 중 무효화된 결과는 저장하지 않음"""
+    cache = ResultCache(max_size=10, ttl_seconds=60)
+    for user_id in ("a", "b"):
+        cache.set(user_id, ("suggest", "w1"), user_id.upper(), cache.generation(user_id))
+
+    in_flight = cache.generation("a")
+    assert cache.invalidate_user("a") == 1
+    assert cache.set("a", ("suggest", "w1"), "stale", in_flight) is False
+
+    assert cache.get("a", ("suggest", "w1")) is None
+    assert cache.get("b", ("suggest", "w1")) == "B"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"], stats["stale_writes"]) == (1, 1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+@pytest.fixture
+def api(override_db, override_dependency, monkeypatch):
+    cache = ResultCache(max_size=10, ttl_seconds=60)
+    monkeypatch.setattr(optimization_api, "result_cache", cache)
+    monkeypatch.setattr(schedule_api, "result_cache", cache)
+
+    calls = []
+    def suggest(user, empty_time_slots, current_week_start=None, time_budget_ms=None):
+        calls.append(user.id)
+        return []
+    monkeypatch.setattr(optimization_api.optimizer, "suggest_schedules_for_empty_slots", suggest)
+
+    current = {"user": User(id="cache-a", email="a@example.com", name="가", district="군포시", activity_level="medium")}
+    override_dependency(get_current_user, lambda: current["user"])
+    return TestClient(app), cache, calls, current
+
+def _slot(start: datetime) -> dict:
+    return {"start": start.isoformat(timespec="minutes"), "end": (start + timedelta(hours=1)).isoformat(timespec="minutes"),
+            "day": "월"}
+
+def test_repeat_suggestions_hit_until_schedules_change(api):
+    """같은 입력의 반복 요청은 캐시에서, 일정 생성/수정/삭제 후에는 다시 계산"""
+    client, cache, calls, current = api
+    upcoming = _slot(datetime.now() + timedelta(days=1))
+    body = {"empty_time_slots": [upcoming], "current_week_start": "2030-01-07"}
+    # 이미 지난 시간대는 제안 대상이 아니므로 지문에 포함되지 않음
+    with_past = {"empty_time_slots": [_slot(datetime.now() - timedelta(hours=1)), upcoming],
+                 "current_week_start": "2030-01-07"}
+
+    assert client.post("/api/v1/suggest-schedules", json=body).status_code == 200
+    assert client.post("/api/v1/suggest-schedules", json=body).status_code == 200
+    assert client.post("/api/v1/suggest-schedules", json=with_past).status_code == 200
+    assert calls == ["cache-a"]
+
+    current["user"] = User(id="cache-b", email="b@example.com", name="나", district="군포시", activity_level="medium")
+    client.post("/api/v1/suggest-schedules", json=body)
+    current["user"] = User(id="cache-a", email="a@example.com", name="가", district="군포시", activity_level="medium")
+
+    location = client.post("/api/v1/locations", json={"name": "군포역", "address": "군포시 군포로", "district": "군포시"})
+    start = datetime.now() + timedelta(days=2)
+    created = client.post("/api/v1/schedules", json={
+        "title": "출근 인사", "start_time": start.isoformat(), "end_time": (start + timedelta(hours=1)).isoformat(),
+        "location_id": location.json()["id"]})
+    client.post("/api/v1/suggest-schedules", json=body)
+    client.put(f"/api/v1/schedules/{created.json()['id']}", json={"title": "퇴근 인사"})
+    client.post("/api/v1/suggest-schedules", json=body)
+    client.delete(f"/api/v1/schedules/{created.json()['id']}")
+    client.post("/api/v1/suggest-schedules", json=body)
+
+    assert calls == ["cache-a", "cache-b", "cache-a", "cache-a", "cache-a"]
+    # 다른 사용자의 항목은 그대로
+    current["user"] = User(id="cache-b", email="b@example.com", name="나", district="군포시", activity_level="medium")
+    client.post("/api/v1/suggest-schedules", json=body)
+    assert len(calls) == 5
+    assert cache.stats()["invalidations"] == 3
+
+def test_optimize_key_uses_the_full_request_time(api, monkeypatch):
+    """같은 날이라도 요청 시각이 다르면 (기존 일정 조회 범위가 달라) 다시 계산"""
+    client, _, _, _ = api
+    solved = []
+    def optimize(user, date, existing_schedules=None, time_budget_ms=None):
+        solved.append(date)
+        return []
+    monkeypatch.setattr(optimization_api.optimizer, "optimize_schedule", optimize)
+
+    for when in ("2024-01-15T09:00:00", "2024-01-15T15:00:00", "2024-01-15T09:00:00"):
+        client.post("/api/v1/optimize-schedule", json={"date": when, "include_existing": True})
+
+    assert solved == [datetime(2024, 1, 15, 9), datetime(2024, 1, 15, 15)]
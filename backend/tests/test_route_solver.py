@@ -0,0 +1,91 @@
+import time
+import numpy as np
+from datetime import datetime
+from app.services.optimization import ScheduleOptimizer
+from app.services.route_solver import RoutingProblem, OrienteeringSolver, TeamSolver
+
+def _random_problem(size, seed=0, max_visits=8):
+    rng = np.random.default_rng(seed)
+    points = rng.random((size, 2)) * 10
+    distances = np.sqrt(((points[:, None] - points[None]) ** 2).sum(-1))
+    return RoutingProblem(
+        prizes=rng.integers(10, 60, size),
+        service_times=rng.choice([15, 30, 45, 60, 90], size),
+        durations=distances * 4,
+        distances=distances,
+        horizon=540,
+        break_time=30,
+        max_distance=12,
+        max_visits=max_visits,
+        hour_weights=[2.0] * 24,
+    )
+
+def test_solution_respects_constraints():
+    """시간창, 거리, 방문 수 제약을 모두 만족"""
+    problem = _random_problem(120)
+    solution = OrienteeringSolver(problem, time_budget_ms=100).solve()
+
+    assert 0 < len(solution.route) <= problem.max_visits
+    assert len(set(solution.route)) == len(solution.route)
+    assert problem.evaluate(solution.route) is not None
+    assert solution.distance <= problem.max_distance
+
+def test_same_seed_is_deterministic():
+    """같은 시드와 반복 수에서는 같은 경로"""
+    problem = _random_problem(80)
+    first = OrienteeringSolver(problem, seed=7, time_budget_ms=10_000, max_iterations=20).solve()
+    second = OrienteeringSolver(problem, seed=7, time_budget_ms=10_000, max_iterations=20).solve()
+    assert first.route == second.route
+
+def test_time_budget_bounds_latency_on_large_district():
+    """수백 개 장소에서도 시간 예산 내 응답"""
+    problem = _random_problem(500)
+    started = time.perf_counter()
+    solution = OrienteeringSolver(problem, time_budget_ms=100).solve()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    assert solution.route
+    assert elapsed_ms < 100 * 3
+
+def test_optimize_schedule_fits_daily_window(make_user):
+    """09:00-18:00 범위와 휴식 시간을 지키는 일정 생성"""
+    optimizer = ScheduleOptimizer()
+    rules = optimizer.activity_rules["medium"]
+    schedule = optimizer.optimize_schedule(make_user(), datetime(2024, 1, 15))
+
+    assert 0 < len(schedule) <= rules["max_schedules"]
+    assert schedule[0]["start_time"] == datetime(2024, 1, 15, 9, 0)
+    assert schedule[-1]["end_time"] <= datetime(2024, 1, 15, 18, 0)
+    assert sum(s["travel_distance"] for s in schedule) <= rules["max_distance"]
+    for prev, nxt in zip(schedule, schedule[1:]):
+        gap = (nxt["start_time"] - prev["end_time"]).total_seconds() / 60
+        assert gap == rules["break_time"] + nxt["travel_time"]
+
+def test_team_routes_share_catalogue_without_duplicates():
+    """20개 경로 x 500개 장소를 시간 예산 내에 중복 방문 없이 배정"""
+    base = _random_problem(500)
+    rules = [(60, 5, 3), (45, 8, 6), (30, 12, 8)]
+    problems = [base.with_rules(*rules[i % 3]) for i in range(20)]
+
+    started = time.perf_counter()
+    solutions = TeamSolver(problems, time_budget_ms=500).solve()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    visits = [i for solution in solutions for i in solution.route]
+    assert len(visits) == len(set(visits))
+    assert all(solution.route for solution in solutions)
+    for problem, solution in zip(problems, solutions):
+        assert problem.evaluate(solution.route) is not None
+    assert elapsed_ms < 500 * 3
+
+def test_optimize_team_splits_top_locations(make_user):
+    """팀원들이 같은 상위 장소를 중복 배정받지 않음"""
+    optimizer = ScheduleOptimizer()
+    users = [make_user(level, activity_level=level) for level in ("medium", "easy", "hard")]
+    schedules = optimizer.optimize_team(users, datetime(2024, 1, 15), time_budget_ms=200)
+
+    assert len(schedules) == 3
+    names = [item["location"] + item["location_type"] for schedule in schedules for item in schedule]
+    assert len(names) == len(set(names))
+    for user, schedule in zip(users, schedules):
+        assert 0 < len(schedule) <= optimizer.activity_rules[user.activity_level]["max_schedules"]
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.api.v1.auth import get_current_user
+from app.api.v1.schedule import list_user_schedules
+from app.models.schedule import Location, Schedule
+from app.models.user import User
+
+@pytest.fixture
+def listing(db_engine, override_db, override_dependency):
+    db = override_db()
+    db.add(Location(id="loc", name="군포역", address="경기도 군포시 군포로 1", district="군포시"))
+    base = datetime(2024, 1, 15, 9)
+    # 같은 시작 시각이 섞여 있어도 id 로 순서가 정해짐
+    for i in range(7):
+        start = base + timedelta(days=i // 2)
+        db.add(Schedule(id=f"s{i}", title=f"일정{i}", start_time=start, end_time=start + timedelta(hours=1),
+                        user_id="list-user", location_id="loc"))
+    db.add(Schedule(id="other", title="남의 일정", start_time=base, end_time=base + timedelta(hours=1),
+                    user_id="someone-else", location_id="loc"))
+    db.commit()
+    db.close()
+    override_dependency(get_current_user, lambda: User(id="list-user", email="list@example.com"))
+    return TestClient(app), db_engine
+
+def _ids(response):
+    return [item["id"] for item in response.json()]
+
+def test_keyset_pages_cover_all_schedules_in_order(listing):
+    """limit 단위로 이어 읽으면 빠짐과 중복 없이 시작 시각 순"""
+    client, _ = listing
+
+    pages, cursor = [], None
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/schedules", params=params)
+        pages.append(_ids(response))
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert pages == [["s0", "s1", "s2"], ["s3", "s4", "s5"], ["s6"]]
+    assert _ids(client.get("/api/v1/schedules")) == [f"s{i}" for i in range(7)]
+    assert client.get("/api/v1/schedules", params={"cursor": "not-a-cursor"}).status_code == 400
+
+def test_date_range_filters_start_time(listing):
+    """from 이상 to 미만에 시작하는 일정만"""
+    client, _ = listing
+    response = client.get("/api/v1/schedules", params={"from": "2024-01-16T00:00:00", "to": "2024-01-17T00:00:00"})
+    assert _ids(response) == ["s2", "s3"]
+
+def test_listing_queries_use_composite_index(listing):
+    """기간 조회와 키셋 조회 모두 (user_id, start_time, id) 인덱스 사용"""
+    _, engine = listing
+    with engine.connect() as conn:
+        plan = conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM schedules WHERE user_id = 'list-user' "
+            "AND (start_time, id) > ('2024-01-16 09:00:00.000000', 's2') ORDER BY start_time, id"
+        )).fetchall()
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_schedules_user_start" in details and "TEMP B-TREE" not in details
+
+def test_listing_issues_constant_number_of_statements(listing):
+    """일정 수와 관계없이 일정 조회 1번 + 장소 조회 1번, 같은 장소는 같은 객체"""
+    client, engine = listing
+    statements = []
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        assert len(client.get("/api/v1/schedules").json()) == 7
+        few = len(statements)
+
+        db = sessionmaker(bind=engine)()
+        for i in range(4):
+            db.add(Location(id=f"loc{i}", name=f"장소{i}", address=f"주소{i}", district="군포시"))
+        base = datetime(2024, 2, 1, 9)
+        for i in range(40):
+            db.add(Schedule(id=f"m{i:02d}", title=f"추가{i}", start_time=base + timedelta(hours=i),
+                            end_time=base + timedelta(hours=i, minutes=30), user_id="list-user", location_id=f"loc{i % 4}"))
+        db.commit()
+        statements.clear()
+        assert len(client.get("/api/v1/schedules").json()) == 47
+        many = len(statements)
+
+        rows = list_user_schedules(db, "list-user", start=base)
+        db.close()
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert few == many == 2
+    assert rows[0].location is rows[4].location and rows[0].location is not rows[1].location
@@ -0,0 +1,109 @@
+import time
+from datetime import datetime, timedelta
+from app.services.optimization import ScheduleOptimizer
+from app.services.schedule_repair import RepairVisit, ScheduleRepairer
+
+class _Location:
+    def __init__(self, name, address):
+        self.name = name
+        self.address = address
+
+class _Schedule:
+    """Schedule ORM 객체와 같은 속성만 가진 테스트용 객체"""
+    def __init__(self, item):
+        self.title = item["title"]
+        self.start_time = item["start_time"]
+        self.end_time = item["end_time"]
+        self.location = _Location(item["location"], item["address"])
+
+def _plan(optimizer, user):
+    return optimizer.optimize_schedule(user, datetime(2024, 1, 15))
+
+def test_repairer_drops_fewest_visits():
+    """종료 시각을 넘는 만큼만 방문을 제외"""
+    day = datetime(2024, 1, 15)
+    visits = [RepairVisit(f"v{i}", f"a{i}", 60, 10 + i, planned_start=day.replace(hour=10 + 2 * i)) for i in range(4)]
+    repairer = ScheduleRepairer(lambda a, b: (10.0, 1.0), break_time=30, max_distance=100,
+                                max_visits=4, day_end=day.replace(hour=18))
+
+    repaired, dropped = repairer.repair(None, visits, day.replace(hour=13), [])
+
+    assert len(dropped) == 1
+    assert [v.name for v in repaired] == ["v1", "v2", "v3"]
+    assert repairer.timeline(None, repaired, day.replace(hour=13)) is not None
+
+def test_small_delay_keeps_plan_and_shifts_times(make_user):
+    """짧은 지연은 기존 방문을 유지한 채 시각만 미룸"""
+    optimizer = ScheduleOptimizer()
+    user = make_user()
+    plan = _plan(optimizer, user)
+    now = plan[1]["start_time"] - timedelta(minutes=10)
+
+    repaired = optimizer.reoptimize_schedule(user, plan, 20, now=now)
+
+    kept = [s["location"] for s in repaired]
+    assert all(s["location"] in kept for s in plan)
+    assert repaired[0] == plan[0]
+    assert repaired[1]["start_time"] >= now + timedelta(minutes=20)
+    assert repaired[-1]["end_time"] <= datetime(2024, 1, 15, 18, 0)
+
+def test_long_delay_drops_visits_within_day(make_user):
+    """긴 지연은 남은 방문 일부를 제외해 18:00 안에 마침"""
+    optimizer = ScheduleOptimizer()
+    user = make_user()
+    plan = _plan(optimizer, user)
+    now = plan[1]["start_time"] - timedelta(minutes=10)
+
+    repaired = optimizer.reoptimize_schedule(user, plan, 300, now=now)
+
+    assert 1 < len(repaired) < len(plan)
+    assert repaired[-1]["end_time"] <= datetime(2024, 1, 15, 18, 0)
+    for prev, nxt in zip(repaired[1:], repaired[2:]):
+        assert nxt["start_time"] >= prev["end_time"]
+
+def test_reoptimize_accepts_orm_objects_quickly(make_user):
+    """ORM 일정 객체를 받아 수 ms 안에 재최적화"""
+    optimizer = ScheduleOptimizer()
+    user = make_user()
+    plan = _plan(optimizer, user)
+    schedules = [_Schedule(item) for item in plan]
+    now = plan[2]["start_time"] - timedelta(minutes=5)
+    optimizer.reoptimize_schedule(user, schedules, 30, now=now)
+
+    started = time.perf_counter()
+    repaired = optimizer.reoptimize_schedule(user, schedules, 30, current_location=plan[1]["location"], now=now)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    assert [s["location"] for s in repaired[:2]] == [s["location"] for s in plan[:2]]
+    assert elapsed_ms < 50
+
+def test_delay_during_visit_continues_after_it(make_user):
+    """진행 중에 지연이 생기면 그 방문을 다시 넣지 않고, 끝나고 휴식한 뒤부터 이어감"""
+    optimizer = ScheduleOptimizer()
+    user = make_user()
+    plan = _plan(optimizer, user)
+    now = plan[0]["start_time"] + timedelta(minutes=5)
+
+    repaired = optimizer.reoptimize_schedule(user, plan, 5, now=now)
+
+    assert repaired[0] == plan[0]
+    assert plan[0]["location"] not in [s["location"] for s in repaired[1:]]
+    break_time = optimizer.activity_rules["medium"]["break_time"]
+    assert repaired[1]["start_time"] >= plan[0]["end_time"] + timedelta(minutes=break_time)
+    for prev, nxt in zip(repaired, repaired[1:]):
+        assert nxt["start_time"] >= prev["end_time"]
+
+def test_user_entered_visits_are_pinned(make_user):
+    """카탈로그에 없는 사용자 일정은 긴 지연에도 제외하지 않음"""
+    optimizer = ScheduleOptimizer()
+    user = make_user()
+    plan = _plan(optimizer, user)
+    own = {"title": "후원회 면담", "location": "후원회 사무실", "address": "경기도 군포시 어딘가 1",
+           "start_time": plan[-1]["end_time"] + timedelta(minutes=30),
+           "end_time": plan[-1]["end_time"] + timedelta(minutes=90)}
+    now = plan[1]["start_time"] - timedelta(minutes=10)
+
+    repaired = optimizer.reoptimize_schedule(user, plan + [own], 300, now=now)
+
+    assert "후원회 사무실" in [s["location"] for s in repaired]
+    assert len(repaired) < len(plan) + 1
@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app.services import maps_service as maps_module
+from app.services.maps_service import MapsService
+from app.services.single_flight import SingleFlight
+from app.services.travel_cache import TravelCache
+
+class _SlowDirections:
+    """호출 수를 세는 느린 경로 조회"""
+
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, origin, destination, mode):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return {"duration": 17, "distance": 2.0, "route": f"{origin} → {destination}",
+                "transport_mode": mode, "service": "google"}
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(maps_module, "travel_cache", TravelCache(max_size=100))
+    monkeypatch.setattr(maps_module, "directions_flight", SingleFlight())
+    service = MapsService()
+    service.default_service = "google"
+    service.google_api_key = "key"
+    service._get_google_directions = _SlowDirections()
+    return service
+
+def test_concurrent_threads_share_one_fetch(service):
+    """같은 쌍을 동시에 조회한 스레드 8개가 상위 호출 한 번을 공유"""
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: service.get_directions("시청", "역", "transit"), range(8)))
+
+    assert service._get_google_directions.calls == 1
+    assert all(r["duration"] == 17 for r in results)
+    assert maps_module.directions_flight.stats() == {"executions": 1, "shared": 7, "in_flight": 0}
+
+    results[0]["duration"] = 999  # 호출자마다 별도 사본
+    assert results[1]["duration"] == 17
+
+def test_asyncio_and_thread_callers_share_one_fetch(service):
+    """asyncio 호출과 스레드 호출이 같은 진행 중 조회를 공유하고, 다른 쌍은 따로 조회"""
+    async def run():
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(
+            *(service.get_directions_async("시청", "역") for _ in range(5)),
+            loop.run_in_executor(None, service.get_directions, "시청", "역"),
+            service.get_directions_async("역", "시장"),
+        )
+
+    results = asyncio.run(run())
+
+    assert service._get_google_directions.calls == 2
+    assert [r["route"] for r in results] == ["시청 → 역"] * 6 + ["역 → 시장"]
+    assert maps_module.directions_flight.stats()["shared"] == 5
+
+def test_errors_reach_every_waiter_and_are_not_kept():
+    """실패는 기다리던 호출 모두에 전달되고, 다음 호출은 다시 실행"""
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def failing():
+        started.set()
+        time.sleep(0.05)
+        raise TimeoutError()
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, "k", failing)
+        started.wait()
+        follower = pool.submit(flight.do, "k", lambda: "unused")
+        for future in (leader, follower):
+            with pytest.raises(TimeoutError):
+                future.result()
+
+    assert flight.do("k", lambda: "ok") == "ok"
+    assert flight.stats() == {"executions": 2, "shared": 1, "in_flight": 0}
+
+def test_cancelled_async_follower_does_not_cancel_others():
+    """asyncio 호출자 하나가 취소되어도 리더와 다른 호출자는 결과를 받음"""
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return "value"
+
+    async def run():
+        leader = asyncio.create_task(flight.do_async("k", slow))
+        await asyncio.sleep(0.01)
+        cancelled = asyncio.create_task(flight.do_async("k", slow))
+        follower = asyncio.create_task(flight.do_async("k", slow))
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        await asyncio.sleep(0.01)
+        release.set()
+        return await asyncio.gather(leader, follower, cancelled, return_exceptions=True)
+
+    leader, follower, cancelled = asyncio.run(run())
+
+    assert leader == follower == "value"
+    assert isinstance(cancelled, asyncio.CancelledError)
+    assert flight.stats() == {"executions": 1, "shared": 2, "in_flight": 0}
@@ -0,0 +1,75 @@
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.v1 import optimization as optimization_api
+from app.api.v1.auth import get_current_user
+from app.services.solver_pool import AdmissionRejected, SolverPool
+
+@pytest.fixture
+def api(make_user, override_dependency, monkeypatch):
+    pool = SolverPool(max_workers=1, max_queue=0, per_user_limit=1, retry_after_seconds=3)
+    monkeypatch.setattr(optimization_api, "solver_pool", pool)
+    override_dependency(get_current_user, lambda: make_user("pool"))
+    with TestClient(app) as client:
+        yield client, pool
+
+def test_admission_limits_per_user_and_globally():
+    """사용자별 한도는 429, 전체 대기열이 가득 차면 503 으로 바로 거절"""
+    pool = SolverPool(max_workers=1, max_queue=1, per_user_limit=1, retry_after_seconds=5)
+    gate = threading.Event()
+    running = pool.submit("a", gate.wait)
+    queued = pool.submit("b", lambda: "b")
+
+    with pytest.raises(AdmissionRejected) as same_user:
+        pool.submit("a", lambda: None)
+    with pytest.raises(AdmissionRejected) as busy:
+        pool.submit("c", lambda: None)
+    stats = pool.stats()
+    gate.set()
+
+    assert (same_user.value.status_code, same_user.value.retry_after) == (429, 5)
+    assert busy.value.status_code == 503
+    assert (stats["running"], stats["queued"], stats["rejected_user"], stats["rejected_busy"]) == (1, 1, 1, 1)
+    assert running.result(1) and queued.result(1) == "b"
+    assert pool.submit("a", lambda: "again").result(1) == "again"
+    assert pool.stats()["queued"] == 0
+
+def test_slow_solve_does_not_block_event_loop(api, monkeypatch):
+    """최적화가 실행 중이어도 같은 워커의 다른 요청은 바로 응답"""
+    client, pool = api
+    def slow_optimize(**kwargs):
+        time.sleep(0.5)
+        return []
+    monkeypatch.setattr(optimization_api.optimizer, "optimize_schedule", slow_optimize)
+
+    responses = []
+    solve = threading.Thread(target=lambda: responses.append(client.post(
+        "/api/v1/optimize-schedule", json={"date": "2024-01-15T00:00:00", "include_existing": False})))
+    solve.start()
+    time.sleep(0.1)
+    started = time.perf_counter()
+    health = client.get("/health")
+    elapsed = time.perf_counter() - started
+    solve.join(2)
+
+    assert health.status_code == 200 and elapsed < 0.2
+    assert responses[0].status_code == 200
+
+def test_full_pool_returns_retry_after(api, make_user, override_dependency):
+    """실행 중인 작업이 있으면 같은 사용자의 요청은 429, 다른 사용자는 503 과 Retry-After"""
+    client, pool = api
+    gate = threading.Event()
+    pool.submit("pool", gate.wait)
+    try:
+        same_user = client.post("/api/v1/suggest-schedules", json={
+            "empty_time_slots": [], "current_week_start": "2024-01-15T00:00:00"})
+        override_dependency(get_current_user, lambda: make_user("other"))
+        other_user = client.post("/api/v1/optimize-team", json={"date": "2024-01-15T00:00:00"})
+    finally:
+        gate.set()
+
+    assert same_user.status_code == 429 and same_user.headers["Retry-After"] == "3"
+    assert other_user.status_code == 503 and other_user.headers["Retry-After"] == "3"
+    assert pool.stats()["rejected_user"] == pool.stats()["rejected_busy"] == 1
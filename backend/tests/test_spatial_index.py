@@ -0,0 +1,96 @@
+import time
+import numpy as np
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.v1.auth import get_current_user
+from app.api.v1.optimization import optimizer
+from app.services.optimization import ScheduleOptimizer
+from app.services.schedule_repair import RepairVisit
+from app.services.spatial_index import SpatialIndex
+
+def _points(size, seed=0):
+    rng = np.random.default_rng(seed)
+    lat = 37.3 + rng.random(size) * 0.2
+    lng = 126.9 + rng.random(size) * 0.25
+    # 일부는 한곳에 밀집
+    lat[:size // 4] = 37.36 + rng.normal(0, 0.003, size // 4)
+    lng[:size // 4] = 126.93 + rng.normal(0, 0.003, size // 4)
+    return lat, lng
+
+def _locations(lat, lng):
+    return [{"name": f"장소{i}", "address": f"주소 {i}", "type": "market", "priority": 3, "exposure": 50 + i % 7,
+             "latitude": float(a), "longitude": float(b)} for i, (a, b) in enumerate(zip(lat, lng))]
+
+def test_queries_match_brute_force():
+    """k-최근접, 반경 검색 결과가 전수 계산과 같음"""
+    lat, lng = _points(5000)
+    index = SpatialIndex(lat, lng)
+    x, y = index._project(lat, lng)
+    rng = np.random.default_rng(1)
+    for _ in range(100):
+        qlat, qlng = 37.25 + rng.random() * 0.3, 126.85 + rng.random() * 0.35
+        px, py = index._project(qlat, qlng)
+        distances = np.hypot(x - px, y - py)
+
+        _, nearest = index.nearest(qlat, qlng, 8)
+        assert np.allclose(nearest, np.sort(distances)[:8])
+        ids, _ = index.radius(qlat, qlng, 1.2)
+        assert set(ids) == set(np.flatnonzero(distances <= 1.2))
+
+def test_queries_are_sub_millisecond_at_10k():
+    """1만 개 장소에서 질의당 1ms 미만"""
+    lat, lng = _points(10000)
+    index = SpatialIndex(lat, lng)
+    queries = list(zip(lat[::100], lng[::100]))
+
+    started = time.perf_counter()
+    for qlat, qlng in queries:
+        index.nearest(qlat, qlng, 10)
+        index.radius(qlat, qlng, 0.5)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    assert elapsed_ms / len(queries) < 1.0
+
+def test_repair_candidates_are_pruned_by_distance_budget():
+    """현재 위치에서 남은 이동 거리 밖의 장소는 재최적화 후보에서 제외"""
+    optimizer = ScheduleOptimizer()
+    lat, lng = _points(400)
+    optimizer.locations["공간구"] = _locations(lat, lng)
+    optimizer.locations["공간구"].append({"name": "좌표없음", "address": "주소 x", "type": "market",
+                                       "priority": 5, "exposure": 500})
+    origin = RepairVisit("장소0", "주소 0", 0, 0.0, index=0)
+
+    candidates = optimizer._repair_candidates("공간구", origin, max_distance=1.0, limit=1000)
+
+    index = optimizer.get_spatial_index("공간구")
+    within, _ = index.radius(lat[0], lng[0], 1.0)
+    assert {c.index for c in candidates} == set(within.tolist()) | {400}
+    assert candidates[0].name == "좌표없음"
+
+def test_nearby_only_returns_geocoded_locations():
+    """좌표가 없는 장소는 지오코딩(app.cli.geocode) 전까지 주변 검색에 나오지 않음"""
+    optimizer = ScheduleOptimizer()
+    lat, lng = _points(20)
+    geocoded = _locations(lat, lng)[:3]
+    pending = [{k: v for k, v in loc.items() if k not in ("latitude", "longitude")}
+               for loc in _locations(lat, lng)[3:]]
+    optimizer.locations["미지오코딩구"] = pending
+    optimizer.locations["일부지오코딩구"] = geocoded + pending
+
+    nearby = optimizer.nearby_locations("일부지오코딩구", 37.36, 126.93, k=10)
+
+    assert optimizer.nearby_locations("미지오코딩구", 37.36, 126.93, k=10) == []
+    assert {loc["name"] for loc in nearby} == {"장소0", "장소1", "장소2"}
+
+def test_nearby_endpoint_returns_closest_locations(make_user, override_dependency):
+    """GET /locations/nearby 는 사용자 지역구의 가까운 장소를 거리 순으로 반환"""
+    lat, lng = _points(300)
+    optimizer.locations["공간구"] = _locations(lat, lng)
+    override_dependency(get_current_user, lambda: make_user(district="공간구"))
+    response = TestClient(app).get("/api/v1/locations/nearby",
+                                   params={"lat": 37.36, "lng": 126.93, "k": 5})
+
+    assert response.status_code == 200
+    distances = [loc["distance_km"] for loc in response.json()["locations"]]
+    assert len(distances) == 5
+    assert distances == sorted(distances)
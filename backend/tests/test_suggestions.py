@@ -0,0 +1,93 @@
+import pytest
+from datetime import datetime, timedelta
+from app.services.optimization import ScheduleOptimizer
+
+@pytest.fixture
+def user(make_user):
+    return make_user(district="군포시 제1선거구 (군포1동, 산본1동, 금정동)", activity_level="hard")
+
+def _slots(days=7, hours=(9, 13, 17), minutes=60):
+    base = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    slots = []
+    for d in range(days):
+        for h in hours:
+            start = base + timedelta(days=d, hours=h)
+            slots.append({
+                "start": start.isoformat(),
+                "end": (start + timedelta(minutes=minutes)).isoformat(),
+                "day": start.strftime("%A"),
+            })
+    return slots
+
+def test_suggestions_are_unique_and_one_per_day(user):
+    """장소 중복 없이 하루 1개씩 제안"""
+    suggestions = ScheduleOptimizer().suggest_schedules_for_empty_slots(user, _slots())
+
+    assert len(suggestions) == 5
+    assert len({s["location"] for s in suggestions}) == len(suggestions)
+    assert len({s["start_time"][:10] for s in suggestions}) == len(suggestions)
+
+def test_suggestions_fit_slot_length(user):
+    """빈 시간대보다 긴 일정은 제안하지 않음"""
+    suggestions = ScheduleOptimizer().suggest_schedules_for_empty_slots(user, _slots(minutes=30))
+
+    assert suggestions
+    for s in suggestions:
+        duration = datetime.fromisoformat(s["end_time"]) - datetime.fromisoformat(s["start_time"])
+        assert duration <= timedelta(minutes=30)
+
+def test_past_slots_are_ignored(user):
+    """현재 시각 + 2시간 이전의 시간대는 제외"""
+    past = datetime.now() - timedelta(hours=1)
+    slots = [{"start": past.isoformat(), "end": (past + timedelta(hours=2)).isoformat(), "day": "x"}]
+    assert ScheduleOptimizer().suggest_schedules_for_empty_slots(user, slots) == []
+
+def _duplicate_name_catalogue(optimizer, make_user):
+    # 같은 장소가 두 유형으로 등록된 카탈로그 (예: 군포시청소년수련관 public/government)
+    optimizer.locations["테스트구"] = [
+        {"name": "수련관", "address": "주소 1", "type": "public", "priority": 5, "exposure": 90},
+        {"name": "수련관", "address": "주소 1", "type": "government", "priority": 5, "exposure": 80},
+        {"name": "역", "address": "주소 2", "type": "transport", "priority": 2, "exposure": 10},
+    ]
+    return make_user(district="테스트구", activity_level="hard")
+
+def test_greedy_does_not_repeat_a_location_registered_twice(make_user):
+    """탐욕 배정은 같은 이름의 다른 행도 함께 사용 처리"""
+    optimizer = ScheduleOptimizer()
+    user = _duplicate_name_catalogue(optimizer, make_user)
+
+    greedy = optimizer.suggest_schedules_for_empty_slots(user, _slots(days=3), strategy="greedy")
+
+    assert [s["location"] for s in greedy] == ["수련관", "역"]
+
+def test_assignment_collapses_duplicate_names(make_user):
+    """최적 배정도 같은 이름의 장소는 한 번만, 점수가 높은 유형으로 제안"""
+    optimizer = ScheduleOptimizer()
+    user = _duplicate_name_catalogue(optimizer, make_user)
+
+    assigned = optimizer.suggest_schedules_for_empty_slots(user, _slots(days=3))
+
+    assert sorted(s["location"] for s in assigned) == ["수련관", "역"]
+    assert next(s for s in assigned if s["location"] == "수련관")["location_type"] == "public"
+
+def test_assignment_beats_greedy_when_slots_conflict(make_user):
+    """긴 시간대에 짧은 일정을 먼저 써버리는 탐욕 배정보다 총점이 높음"""
+    optimizer = ScheduleOptimizer()
+    optimizer.locations["테스트구"] = [
+        {"name": "역", "address": "주소 1", "type": "transport", "priority": 5, "exposure": 100},  # 15분
+        {"name": "학교", "address": "주소 2", "type": "education", "priority": 4, "exposure": 50},  # 90분
+    ]
+    base = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    slots = [
+        {"start": (base + timedelta(hours=10)).isoformat(), "end": (base + timedelta(hours=12)).isoformat(), "day": "1"},
+        {"start": (base + timedelta(days=1, hours=10)).isoformat(),
+         "end": (base + timedelta(days=1, hours=10, minutes=20)).isoformat(), "day": "2"},
+    ]
+    user = make_user(district="테스트구", activity_level="hard")
+
+    greedy = optimizer.suggest_schedules_for_empty_slots(user, slots, strategy="greedy")
+    assigned = optimizer.suggest_schedules_for_empty_slots(user, slots)
+
+    assert [s["location"] for s in greedy] == ["역"]
+    assert [s["location"] for s in assigned] == ["학교", "역"]
+    assert sum(s["score"] for s in assigned) > sum(s["score"] for s in greedy)
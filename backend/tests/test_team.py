@@ -0,0 +1,82 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.main import app
+from app.api.v1.auth import get_current_user
+from app.db.session import create_async_app_engine, get_async_db
+from app.models.user import User
+
+USERS = {
+    "leader": ("후보", "군포시"),
+    "member": ("봉사자", "군포시"),
+    "stranger": ("다른 사람", "군포시"),
+    "far": ("다른 지역", "서대문구"),
+}
+
+@pytest.fixture
+def team(db_url, override_db, override_dependency):
+    db = override_db()
+    for user_id, (name, district) in USERS.items():
+        db.add(User(id=user_id, email=f"{user_id}@example.com", name=name, district=district, activity_level="medium"))
+    db.commit()
+    db.close()
+    async_engine = create_async_app_engine(db_url)
+    current = {"id": "leader"}
+
+    async def override_async_db():
+        async with async_sessionmaker(async_engine, expire_on_commit=False)() as session:
+            yield session
+
+    def override_user():
+        session = override_db()
+        user = session.query(User).filter(User.id == current["id"]).first()
+        session.close()
+        return user
+
+    override_dependency(get_async_db, override_async_db)
+    override_dependency(get_current_user, override_user)
+    yield TestClient(app), current
+    asyncio.run(async_engine.dispose())
+
+def _optimize(client, member_ids):
+    return client.post("/api/v1/optimize-team", json={
+        "date": "2024-01-15T00:00:00", "member_ids": member_ids, "time_budget_ms": 50})
+
+def test_only_granted_members_can_be_planned(team):
+    """허용한 같은 지역구 팀원만 포함, 그 밖의 id 는 존재 여부와 관계없이 같은 403"""
+    client, current = team
+    for user_id in ("member", "far"):
+        current["id"] = user_id
+        assert client.put("/api/v1/team/leaders/leader").status_code == 200
+    current["id"] = "leader"
+
+    allowed = _optimize(client, ["member"])
+    rejected = [_optimize(client, [user_id]) for user_id in ("stranger", "far", "no-such-user")]
+
+    assert allowed.status_code == 200
+    assert [route["user_id"] for route in allowed.json()["routes"]] == ["leader", "member"]
+    assert {r.status_code for r in rejected} == {403}
+    assert len({r.json()["detail"] for r in rejected}) == 1
+    assert [m["id"] for m in client.get("/api/v1/team/members").json()] == ["far", "member"]
+
+def test_revoked_member_is_rejected(team):
+    """허용을 취소하면 더 이상 팀 최적화에 포함할 수 없음"""
+    client, current = team
+    current["id"] = "member"
+    client.put("/api/v1/team/leaders/leader")
+    client.delete("/api/v1/team/leaders/leader")
+    current["id"] = "leader"
+
+    assert _optimize(client, ["member"]).status_code == 403
+    assert client.get("/api/v1/team/members").json() == []
+
+def test_unknown_leader_is_not_granted(team):
+    """없는 사용자에게는 허용을 저장하지 않고 404"""
+    client, current = team
+    current["id"] = "member"
+
+    response = client.put("/api/v1/team/leaders/no-such-user")
+
+    assert response.status_code == 404
+    assert client.put("/api/v1/team/leaders/leader").status_code == 200
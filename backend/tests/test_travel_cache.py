@@ -0,0 +1,116 @@
+from app.services.cache import LRUTTLCache
+from app.services.travel_cache import TravelCache
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+INFO = {"duration": 12, "distance": 1.8, "service": "google"}
+
+def test_lru_and_ttl_eviction_counters():
+    """크기 초과 시 LRU 제거, TTL 경과 시 만료"""
+    clock = _Clock()
+    cache = LRUTTLCache(max_size=2, ttl_seconds=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # 가장 오래 사용되지 않은 b 제거
+
+    assert cache.get("b") is None
+    assert cache.evictions == 1
+
+    clock.now = 11
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["expirations"] == 1
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+def test_returns_copies():
+    """호출자가 결과를 수정해도 캐시 값은 유지"""
+    cache = TravelCache(max_size=10)
+    cache.set("A", "B", "transit", "google", INFO)
+    first = cache.get("A", "B", "transit", "google")
+    first["duration"] = 999
+
+    assert cache.get("A", "B", "transit", "google")["duration"] == 12
+
+def test_invalidate_by_provider_and_mode():
+    """제공자/이동수단 단위 무효화"""
+    cache = TravelCache(max_size=10)
+    cache.set("A", "B", "transit", "google", INFO)
+    cache.set("A", "B", "driving", "google", INFO)
+    cache.set("A", "B", "transit", "naver", INFO)
+
+    assert cache.invalidate(provider="google", mode="transit") == 1
+    assert cache.get("A", "B", "transit", "google") is None
+    assert cache.get("A", "B", "driving", "google") is not None
+    assert cache.invalidate(provider="naver") == 1
+    assert cache.get("A", "B", "transit", "naver") is None
+
+def test_persistent_tier_survives_restart(tmp_path):
+    """SQLite 계층에 저장된 응답은 새 프로세스에서도 조회"""
+    db_path = str(tmp_path / "travel_cache.db")
+    cache = TravelCache(max_size=10, db_path=db_path)
+    cache.set("A", "B", "transit", "google", INFO)
+    cache.close()
+
+    restarted = TravelCache(max_size=10, db_path=db_path)
+    assert restarted.get("A", "B", "transit", "google") == INFO
+    assert restarted.stats()["persistent_hits"] == 1
+
+    restarted.invalidate(provider="google")
+    restarted.memory.clear()
+    assert restarted.get("A", "B", "transit", "google") is None
+
+def test_fallback_values_stay_in_memory(tmp_path):
+    """persist=False 로 저장한 임시 응답은 영구 계층에 쓰지 않음"""
+    db_path = str(tmp_path / "travel_cache.db")
+    cache = TravelCache(max_size=10, db_path=db_path)
+    cache.set("A", "B", "transit", "mock", {"duration": 15, "distance": 2.5}, persist=False)
+    assert cache.get("A", "B", "transit", "mock") is not None
+    cache.close()
+
+    restarted = TravelCache(max_size=10, db_path=db_path)
+    assert restarted.get("A", "B", "transit", "mock") is None
+    assert restarted.stats()["persistent_writes"] == 0
+
+def test_cache_invalidation_requires_ops_token(monkeypatch):
+    """캐시 무효화는 OPS_TOKEN 과 같은 X-Ops-Token 이 있어야 함 (로그인 사용자만으로는 불가)"""
+    from fastapi.testclient import TestClient
+    from app.api.v1 import metrics as metrics_api
+    from app.core.config import settings
+    from app.main import app
+
+    cache = TravelCache(max_size=10)
+    cache.set("A", "B", "transit", "google", INFO)
+    monkeypatch.setattr(metrics_api, "travel_cache", cache)
+    client = TestClient(app)
+
+    monkeypatch.setattr(settings, "OPS_TOKEN", "")
+    disabled = client.delete("/api/v1/metrics/travel-cache", headers={"X-Ops-Token": ""})
+    monkeypatch.setattr(settings, "OPS_TOKEN", "ops-secret")
+    wrong = client.delete("/api/v1/metrics/travel-cache", headers={"X-Ops-Token": "guess"})
+    missing = client.delete("/api/v1/metrics/travel-cache")
+    assert (disabled.status_code, wrong.status_code, missing.status_code) == (403, 403, 403)
+    assert cache.get("A", "B", "transit", "google") == INFO
+
+    allowed = client.delete("/api/v1/metrics/travel-cache", headers={"X-Ops-Token": "ops-secret"})
+    assert allowed.status_code == 200 and allowed.json()["removed"] == 1
+
+def test_metrics_require_ops_token(monkeypatch):
+    """내부 상태 지표도 운영자 토큰이 있어야 조회 가능"""
+    from fastapi.testclient import TestClient
+    from app.core.config import settings
+    from app.main import app
+
+    client = TestClient(app)
+    monkeypatch.setattr(settings, "OPS_TOKEN", "ops-secret")
+
+    assert client.get("/api/v1/metrics").status_code == 403
+    assert client.get("/api/v1/metrics", headers={"X-Ops-Token": "guess"}).status_code == 403
+    allowed = client.get("/api/v1/metrics", headers={"X-Ops-Token": "ops-secret"})
+    assert allowed.status_code == 200 and "travel_cache" in allowed.json()
@@ -0,0 +1,127 @@
+import time
+import numpy as np
+from datetime import datetime
+from app.services import maps_service as maps_module
+from app.services.geocoding import BatchGeocoder, GeocodeCache, StubGeocoder
+from app.services.maps_service import MapsService
+from app.services.optimization import ScheduleOptimizer
+from app.services.travel_cache import TravelCache
+from app.services.travel_estimator import TravelEstimator, TravelModel, haversine_km, haversine_matrix
+
+def _coordinates(size, seed=0):
+    rng = np.random.default_rng(seed)
+    return 37.3 + rng.random(size) * 0.1, 126.9 + rng.random(size) * 0.1
+
+def test_haversine_matrix_matches_pairwise():
+    """행렬 계산이 단일 쌍 계산과 같고, 서울-부산 거리가 알려진 값과 비슷함"""
+    lat, lng = _coordinates(30)
+    matrix = haversine_matrix(lat, lng)
+
+    assert np.allclose(matrix, matrix.T)
+    assert np.allclose(np.diag(matrix), 0)
+    assert abs(matrix[3, 7] - haversine_km(lat[3], lng[3], lat[7], lng[7])) < 1e-9
+    assert 320 < haversine_km(37.5665, 126.9780, 35.1796, 129.0756) < 330
+
+def test_matrices_cost_microseconds_per_pair():
+    """1000 x 1000 쌍을 한 번의 호출로 쌍당 1마이크로초 미만에 계산"""
+    lat, lng = _coordinates(1000)
+    estimator = TravelEstimator()
+    estimator.matrices(lat[:10], lng[:10])
+
+    started = time.perf_counter()
+    durations, distances = estimator.matrices(lat, lng, "walking")
+    elapsed = time.perf_counter() - started
+
+    assert durations.shape == (1000, 1000)
+    assert elapsed / 1e6 < 1e-6
+    walking = estimator.models["walking"]
+    assert np.allclose(durations[1, 2], distances[1, 2] / walking.speed_kmh * 60)
+
+def test_calibration_recovers_model_from_cached_responses():
+    """캐시된 실제 응답으로 우회 계수, 속도, 고정 시간을 복원"""
+    lat, lng = _coordinates(8, seed=1)
+    coordinates = {f"주소 {i}": (lat[i], lng[i]) for i in range(8)}
+    truth = TravelModel(speed_kmh=20.0, detour=1.5, overhead_min=6.0)
+    cache = TravelCache(max_size=100)
+    for i in range(8):
+        for j in range(8):
+            if i != j:
+                distance = haversine_km(lat[i], lng[i], lat[j], lng[j]) * truth.detour
+                cache.set(f"주소 {i}", f"주소 {j}", "transit", "google",
+                          {"distance": distance, "duration": truth.overhead_min + distance / truth.speed_kmh * 60})
+    cache.set("주소 0", "주소 1", "transit", "mock", {"distance": 2.5, "duration": 15})
+
+    estimator = TravelEstimator()
+    used = estimator.calibrate_from_cache(cache, coordinates.get, ["google"])
+
+    model = estimator.models["transit"]
+    assert used == {"transit": 56}
+    assert abs(model.detour - 1.5) < 1e-6
+    assert abs(model.speed_kmh - 20.0) < 1e-6
+    assert abs(model.overhead_min - 6.0) < 1e-6
+
+def test_fallback_directions_use_geocoded_coordinates(tmp_path, monkeypatch):
+    """API 키가 없어도 좌표가 있으면 쌍마다 다른 추정값"""
+    cache = GeocodeCache(str(tmp_path / "geocode.db"))
+    table = {"가까운 곳": (37.3617, 126.9352), "옆 건물": (37.3620, 126.9360), "먼 곳": (37.4500, 127.0500)}
+    BatchGeocoder(StubGeocoder(table), cache).geocode_all(table)
+    monkeypatch.setattr(maps_module, "geocode_cache", cache)
+    service = MapsService()
+    service.default_service = "none"
+
+    near = service.get_directions("가까운 곳", "옆 건물")
+    far = service.get_directions("가까운 곳", "먼 곳")
+    unknown = service.get_directions("가까운 곳", "모르는 곳")
+
+    assert near["service"] == far["service"] == "estimate"
+    assert near["distance"] < far["distance"] and near["duration"] < far["duration"]
+    assert unknown["service"] == "fallback"
+
+def test_optimizer_matrix_uses_catalogue_coordinates(make_user):
+    """좌표가 있는 카탈로그는 이동 조회 없이 추정 행렬을 사용"""
+    optimizer = ScheduleOptimizer()
+    lat, lng = _coordinates(40, seed=2)
+    optimizer.locations["좌표구"] = [
+        {"name": f"장소{i}", "address": f"좌표구 주소 {i}", "type": "market", "priority": 3, "exposure": 60,
+         "latitude": float(lat[i]), "longitude": float(lng[i])} for i in range(40)
+    ]
+    optimizer.get_travel_info = None  # 호출되면 실패
+
+    matrix = optimizer.build_travel_matrix("좌표구")
+
+    assert len(set(np.round(matrix.distances[0, 1:], 3))) > 30
+    schedule = optimizer.optimize_schedule(make_user(district="좌표구"), datetime(2024, 1, 15), time_budget_ms=50)
+    assert sum(s["travel_distance"] for s in schedule) <= optimizer.activity_rules["medium"]["max_distance"]
+
+def test_matrix_without_coordinates_is_built_in_background():
+    """좌표가 없는 장소가 있으면 요청은 임시 추정 행렬로 바로 응답하고, 실제 행렬은 백그라운드에서 생성"""
+    import threading
+    optimizer = ScheduleOptimizer()
+    lat, lng = _coordinates(3, seed=3)
+    optimizer.locations["혼합구"] = [
+        {"name": f"장소{i}", "address": f"혼합구 주소 {i}", "type": "market", "priority": 3, "exposure": 60,
+         "latitude": float(lat[i]), "longitude": float(lng[i])} for i in range(3)
+    ] + [{"name": "장소3", "address": "혼합구 주소 3", "type": "market", "priority": 3, "exposure": 60}]
+    release = threading.Event()
+    callers = set()
+
+    def travel_info(origin, destination, mode="transit"):
+        callers.add(threading.current_thread().name)
+        release.wait(5)
+        return {"duration": 7, "distance": 1.5}
+    optimizer.get_travel_info = travel_info
+
+    interim = optimizer.get_travel_matrix("혼합구")
+    again = optimizer.get_travel_matrix("혼합구")
+
+    assert interim is not again  # 임시 행렬은 캐시하지 않음
+    assert interim.durations[0, 3] == ScheduleOptimizer.DEFAULT_TRAVEL_MINUTES and interim.durations[3, 3] == 0
+    assert 0 < interim.distances[0, 1] < 30
+
+    release.set()
+    optimizer._schedule_travel_matrix_build("혼합구").result(5)
+    built = optimizer.get_travel_matrix("혼합구")
+
+    assert built is optimizer.get_travel_matrix("혼합구")
+    assert built.durations[0, 3] == 7
+    assert callers and threading.current_thread().name not in callers
@@ -0,0 +1,48 @@
+import numpy as np
+from app.services.travel_matrix import TravelMatrix
+
+LOCATIONS = [
+    {"name": "A", "address": "주소 A"},
+    {"name": "B", "address": "주소 B"},
+    {"name": "B 별관", "address": "주소 B"},
+    {"name": "C", "address": "주소 C"},
+]
+
+def _travel_info(calls):
+    def lookup(origin, destination):
+        calls.append((origin, destination))
+        return {"duration": len(origin) + len(destination), "distance": 1.5}
+    return lookup
+
+def test_build_queries_each_address_pair_once():
+    """주소 쌍마다 이동 정보 1회 조회, 같은 주소는 0"""
+    calls = []
+    matrix = TravelMatrix.build("테스트구", LOCATIONS, _travel_info(calls))
+
+    assert len(calls) == len(set(calls)) == 6
+    assert matrix.durations.shape == (4, 4)
+    assert matrix.distance(1, 2) == 0
+    assert matrix.distance(0, 3) == 1.5
+    assert matrix.duration(1, 3) == matrix.duration(2, 3)
+
+def test_save_and_load_roundtrip(tmp_path):
+    """npz 저장 후 재계산 없이 로드"""
+    matrix = TravelMatrix.build("테스트구", LOCATIONS, _travel_info([]))
+    path = TravelMatrix.path_for(str(tmp_path), "테스트구")
+    matrix.save(path)
+
+    loaded = TravelMatrix.load(path, expected_fingerprint=matrix.fingerprint)
+    assert loaded is not None
+    assert loaded.addresses == matrix.addresses
+    np.testing.assert_array_equal(loaded.durations, matrix.durations)
+    np.testing.assert_array_equal(loaded.distances, matrix.distances)
+
+def test_load_rejects_stale_catalogue(tmp_path):
+    """카탈로그가 바뀌면 저장된 행렬을 사용하지 않음"""
+    matrix = TravelMatrix.build("테스트구", LOCATIONS, _travel_info([]))
+    path = TravelMatrix.path_for(str(tmp_path), "테스트구")
+    matrix.save(path)
+
+    stale = TravelMatrix.compute_fingerprint(["다른 주소"])
+    assert TravelMatrix.load(path, expected_fingerprint=stale) is None
+    assert TravelMatrix.load(str(tmp_path / "없음.npz")) is None